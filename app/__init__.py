@@ -1,32 +1,69 @@
+import time
+_import_started = time.perf_counter()
+
 from flask import Flask
 from app.routes import register_routes
+from app.cli import register_commands
 from app.errors.handlers import register_error_handlers
 from app.utils.logger import init_logger
-from app.config.database import init_db
-from flask_migrate import upgrade
+from app.utils.metrics import init_metrics
+from app.utils.startup import StartupTimer, report_startup
+from app.config.database import init_db, run_migrations
 from flask_cors import CORS
 import os
 
+# Reported with the first app built in this process
+_import_seconds = time.perf_counter() - _import_started
+
+
+def create_app(config_object="app.config.envVars.Config") -> Flask:
+    global _import_seconds
+    timer = StartupTimer()
+    if _import_seconds:
+        timer.record("imports", _import_seconds)
+        _import_seconds = 0.0
+
+    with timer.phase("config"):
+        app = Flask(__name__)
+        app.config.from_object(config_object)
+
+        # Enable CORS for all routes
+        CORS(app)
+
+        # Initialize database
+        init_db(app)
+
+    # Bring the schema to head (only if migrations folder exists). Skipped in
+    # gunicorn workers: the master, or a `flask preflight` release step, has
+    # already done it once for the whole deploy
+    if app.config.get("AUTO_MIGRATE", True) and not os.environ.get("GUNICORN_WORKER"):
+        with timer.phase("migrations"):
+            run_migrations(app)
 
-def create_app() -> Flask:
-    app = Flask(__name__)
-    app.config.from_object("app.config.envVars.Config")
+    with timer.phase("routes"):
+        register_routes(app)
+        register_error_handlers(app)
+        register_commands(app)
+        init_logger(app)
+        init_metrics(app)
 
-    # Enable CORS for all routes
-    CORS(app)
+    # Configure the fraud service; with PRELOAD_MODEL the model is loaded and
+    # warmed up front (shared by forked workers under --preload)
+    with timer.phase("fraud_model"):
+        from app.services.fraud_service import fraud_service
+        fraud_service.init_app(app)
 
-    # Initialize database
-    init_db(app)
+    # Build the sender -> receiver graph in one pass (also shared by forked workers)
+    if app.config.get("PRELOAD_GRAPH"):
+        with timer.phase("graph_index"):
+            fraud_service.preload_graph(app)
 
-    # Auto-upgrade database migrations on app start (only if migrations folder exists)
-    with app.app_context():
-        project_root = os.path.abspath(os.path.join(app.root_path, ".."))
-        migrations_dir = os.path.join(project_root, "migrations")
-        if os.path.isdir(migrations_dir):
-            upgrade()
+    with timer.phase("processing_queue"):
+        from app.services.processing_queue import processing_queue
+        processing_queue.init_app(app)
 
-    register_routes(app)
-    register_error_handlers(app)
-    init_logger(app)
+        from app.services.transaction_cache import transaction_cache
+        transaction_cache.init_app(app)
 
-    return app
\ No newline at end of file
+    report_startup(app, timer)
+    return app
@@ -0,0 +1,70 @@
+import sys
+import click
+from flask import Flask, current_app
+from app.config.database import run_migrations
+from datetime import datetime
+from app.services.archive import archive_transactions
+from app.services.export import EXPORT_FORMATS, export_transactions, transaction_filters
+from app.services.partitions import add_months, ensure_partitions, month_start
+
+
+def register_commands(app: Flask):
+    @app.cli.command("preflight")
+    def preflight_command():
+        """Apply pending migrations once for a deploy (safe to run from every instance)."""
+        if run_migrations(current_app._get_current_object()):
+            click.echo("Migrations applied.")
+        else:
+            click.echo("Schema already at head.")
+        click.echo(current_app.extensions['startup'].report())
+
+    @app.cli.command("export-transactions")
+    @click.option("--format", "fmt", type=click.Choice(list(EXPORT_FORMATS)), default="csv",
+                  help="csv uses the data/transactions.csv layout.")
+    @click.option("--output", "-o", type=click.Path(dir_okay=False), default=None,
+                  help="File to write (default: stdout).")
+    @click.option("--status", default=None, help="Only export transactions with this status.")
+    @click.option("--since", default=None, help="ISO 8601 lower bound on timestamp (inclusive).")
+    @click.option("--until", default=None, help="ISO 8601 upper bound on timestamp (exclusive).")
+    def export_transactions_command(fmt, output, status, since, until):
+        """Stream transactions to a file with a server-side cursor."""
+        args = {k: v for k, v in (('status', status), ('since', since), ('until', until)) if v}
+        try:
+            filters = transaction_filters(args)
+        except ValueError as e:
+            raise click.BadParameter(str(e))
+
+        batch_size = current_app.config['EXPORT_BATCH_SIZE']
+        out = open(output, 'w', newline='') if output else sys.stdout
+        try:
+            for chunk in export_transactions(fmt, filters, batch_size):
+                out.write(chunk)
+        finally:
+            if output:
+                out.close()
+
+    @app.cli.command("maintain-transactions")
+    @click.option("--months-ahead", type=int, default=None,
+                  help="Monthly partitions to keep ready (default: PARTITION_MONTHS_AHEAD).")
+    @click.option("--retention-months", type=int, default=None,
+                  help="Archive settled rows older than this many months (default: ARCHIVE_RETENTION_MONTHS).")
+    @click.option("--archive-dir", type=click.Path(file_okay=False), default=None,
+                  help="Where archive files go (default: ARCHIVE_DIR).")
+    @click.option("--no-archive", is_flag=True, help="Only create partitions.")
+    def maintain_transactions_command(months_ahead, retention_months, archive_dir, no_archive):
+        """Create upcoming partitions and archive old settled transactions (run e.g. daily)."""
+        config = current_app.config
+        months_ahead = config['PARTITION_MONTHS_AHEAD'] if months_ahead is None else months_ahead
+        for name in ensure_partitions(months_ahead):
+            click.echo(f"Created partition {name}")
+        if no_archive:
+            return
+
+        retention = config['ARCHIVE_RETENTION_MONTHS'] if retention_months is None else retention_months
+        cutoff = add_months(month_start(datetime.now()), -retention)
+        result = archive_transactions(archive_dir or config['ARCHIVE_DIR'], cutoff, config['EXPORT_BATCH_SIZE'])
+        for entry in result['archived']:
+            click.echo(f"Archived {entry['rows']} transactions from {entry['month']} to {entry['path']}")
+        for name in result['dropped_partitions']:
+            click.echo(f"Dropped empty partition {name}")
+        click.echo(f"Archived everything settled before {cutoff:%Y-%m-%d}.")
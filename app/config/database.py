@@ -1,11 +1,199 @@
+import os
+import time
+from contextlib import contextmanager
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
-from flask import Flask
+from flask import Flask, current_app, g, has_request_context, request
+from sqlalchemy import create_engine, event, exc, make_url, text
+from sqlalchemy.pool import QueuePool
+from app.utils.metrics import DB_POOL_CAPACITY, DB_POOL_CHECKED_OUT, DB_POOL_CHECKOUT_WAIT, DB_POOL_TIMEOUTS
 
 # Global database instance
 db = SQLAlchemy()
 migrate = Migrate()
 
+# pg_advisory_lock key shared by every process that may run migrations
+MIGRATION_LOCK_ID = 0x70617973  # "pays"
+
+# app.extensions key (and pool metrics label) of the optional read replica engine
+READ_BIND = "read"
+# Set on responses to writes; until it expires, that client's reads go to the primary
+READ_PRIMARY_COOKIE = "read_primary_until"
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
 def init_db(app: Flask):
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+        **engine_options(app.config, app.config.get("SQLALCHEMY_DATABASE_URI"), "primary"),
+        **app.config.get("SQLALCHEMY_ENGINE_OPTIONS", {}),
+    }
     db.init_app(app)
-    migrate.init_app(app, db)
\ No newline at end of file
+    migrate.init_app(app, db)
+
+    with app.app_context():
+        engines = [db.engine]
+    read_url = app.config.get("DATABASE_READ_URL")
+    if read_url:
+        # A plain engine rather than a Flask-SQLAlchemy bind: no model lives
+        # only on the replica, it just serves reads of the primary's tables
+        replica = create_engine(read_url, **engine_options(app.config, read_url, READ_BIND))
+        app.extensions[READ_BIND] = replica
+        engines.append(replica)
+        _init_read_your_writes(app)
+
+    timeout = app.config.get("DB_STATEMENT_TIMEOUT_MS", 0)
+    for engine in engines:
+        if timeout and engine.dialect.name == "postgresql":
+            event.listen(engine, "connect", _statement_timeout(timeout))
+
+def engine_options(config, url, bind: str) -> dict:
+    """
+    create_engine pool arguments from the DB_POOL_* settings.
+
+    In-memory SQLite keeps Flask-SQLAlchemy's single static connection, so
+    only pre-ping and recycle apply to it.
+    """
+    options = {
+        "pool_pre_ping": config.get("DB_POOL_PRE_PING", True),
+        "pool_recycle": config.get("DB_POOL_RECYCLE", -1),
+    }
+    if url is None or _in_memory_sqlite(url):
+        return options
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=config.get("DB_POOL_SIZE", 5),
+        max_overflow=config.get("DB_MAX_OVERFLOW", 10),
+        pool_timeout=config.get("DB_POOL_TIMEOUT", 30),
+        pool_logging_name=bind,  # the pool's metrics label
+    )
+    return options
+
+def _in_memory_sqlite(url) -> bool:
+    url = make_url(url)
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+def _statement_timeout(milliseconds: int):
+    # A SET on each new connection rather than a startup option, which
+    # PgBouncer rejects
+    def set_timeout(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"SET statement_timeout = {int(milliseconds)}")
+        cursor.close()
+    return set_timeout
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that reports checkout wait, timeouts and connections in use to Prometheus."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.bind = self.logging_name or "primary"
+        self._capacity = self.size() + max(self._max_overflow, 0)
+        self._counted_in = None  # pid whose capacity gauge includes this pool
+
+    def _do_get(self):
+        # Counted on first use in each process: gunicorn workers inherit the
+        # master's pool object, and each of them can open a full pool
+        if self._counted_in != os.getpid():
+            self._counted_in = os.getpid()
+            DB_POOL_CAPACITY.labels(self.bind).inc(self._capacity)
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            DB_POOL_TIMEOUTS.labels(self.bind).inc()
+            raise
+        finally:
+            DB_POOL_CHECKOUT_WAIT.labels(self.bind).observe(time.perf_counter() - started)
+        DB_POOL_CHECKED_OUT.labels(self.bind).inc()
+        return connection
+
+    def _do_return_conn(self, record):
+        DB_POOL_CHECKED_OUT.labels(self.bind).dec()
+        super()._do_return_conn(record)
+
+    def recreate(self):
+        # The replacement pool counts its own capacity
+        if self._counted_in == os.getpid():
+            DB_POOL_CAPACITY.labels(self.bind).dec(self._capacity)
+            self._counted_in = None
+        return super().recreate()
+
+def read_bind():
+    """
+    Engine for read-only queries.
+
+    The replica when DATABASE_READ_URL is set, except for a client that
+    wrote within the last READ_AFTER_WRITE_SECONDS (so it sees its own
+    writes despite replication lag) and outside requests.
+    """
+    replica = current_app.extensions.get(READ_BIND)
+    if replica is None or not has_request_context() or g.get("read_primary", True):
+        return db.engine
+    return replica
+
+def _init_read_your_writes(app: Flask):
+    @app.before_request
+    def choose_read_bind():
+        try:
+            until = float(request.cookies.get(READ_PRIMARY_COOKIE, 0))
+        except ValueError:
+            until = 0.0
+        g.read_primary = request.method not in SAFE_METHODS or until > time.time()
+
+    @app.after_request
+    def remember_write(response):
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            window = app.config.get("READ_AFTER_WRITE_SECONDS", 5)
+            response.set_cookie(READ_PRIMARY_COOKIE, f"{time.time() + window:.3f}",
+                                max_age=max(int(window), 1), httponly=True, samesite="Lax")
+        return response
+
+def migrations_dir(app: Flask) -> str:
+    return os.path.join(os.path.abspath(os.path.join(app.root_path, "..")), "migrations")
+
+def run_migrations(app: Flask) -> bool:
+    """
+    Upgrade the schema to head at most once, however many processes call this.
+
+    Checks the current revision first (one query), so an up-to-date database
+    costs almost nothing. Otherwise the upgrade runs under a PostgreSQL
+    advisory lock: concurrent callers (other instances of the same deploy)
+    wait, re-check, and find nothing left to do.
+
+    Returns:
+        bool: True if this call applied migrations
+    """
+    import flask_migrate
+
+    directory = migrations_dir(app)
+    if not os.path.isdir(directory):
+        return False
+    with app.app_context():
+        if _at_head(directory):
+            return False
+        with _migration_lock():
+            if _at_head(directory):
+                return False
+            flask_migrate.upgrade(directory)
+            return True
+
+def _at_head(directory: str) -> bool:
+    from alembic.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+
+    heads = set(ScriptDirectory.from_config(migrate.get_config(directory)).get_heads())
+    with db.engine.connect() as conn:
+        current = set(MigrationContext.configure(conn).get_current_heads())
+    return current == heads
+
+@contextmanager
+def _migration_lock():
+    if db.engine.dialect.name != "postgresql":
+        # SQLite and friends: single host, nothing to coordinate
+        yield
+        return
+    with db.engine.connect() as conn:
+        conn.execute(text("SELECT pg_advisory_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+        try:
+            yield
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": MIGRATION_LOCK_ID})
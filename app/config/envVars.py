@@ -12,4 +12,83 @@ class Config:
     # Database configuration
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    SQLALCHEMY_ECHO = os.getenv("SQLALCHEMY_ECHO", "False").lower() == "true"
\ No newline at end of file
+    SQLALCHEMY_ECHO = os.getenv("SQLALCHEMY_ECHO", "False").lower() == "true"
+    AUTO_MIGRATE = os.getenv("AUTO_MIGRATE", "True").lower() == "true"
+
+    # Connection pool, per process (in-memory SQLite keeps a single connection).
+    # Behind PgBouncer, keep workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) within its pool
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))  # seconds to wait for a connection
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))  # seconds; -1 never recycles
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "True").lower() == "true"
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 0))  # PostgreSQL; 0 = no limit
+
+    # Optional read replica for the GET routes. A client that wrote within
+    # READ_AFTER_WRITE_SECONDS keeps reading from the primary
+    DATABASE_READ_URL = os.getenv("DATABASE_READ_URL") or None
+    READ_AFTER_WRITE_SECONDS = float(os.getenv("READ_AFTER_WRITE_SECONDS", 5))
+
+    # Start-up: phase timings are logged, with a warning past these budgets
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    STARTUP_BUDGET_SECONDS = float(os.getenv("STARTUP_BUDGET_SECONDS", 10))
+    WORKER_BOOT_BUDGET_SECONDS = float(os.getenv("WORKER_BOOT_BUDGET_SECONDS", 1))
+
+    # Fraud model
+    PRELOAD_MODEL = os.getenv("PRELOAD_MODEL", "True").lower() == "true"
+    MODEL_MMAP_MODE = os.getenv("MODEL_MMAP_MODE") or None  # e.g. "r"
+    FRAUD_THRESHOLD = float(os.getenv("FRAUD_THRESHOLD", 0.5))  # flag when the fraud score >= threshold
+    SCORE_CACHE_SIZE = int(os.getenv("SCORE_CACHE_SIZE", 10000))
+    SCORE_CACHE_TTL = float(os.getenv("SCORE_CACHE_TTL", 300))  # seconds
+    # Per-call scoring budget. The model runs in a pool of FRAUD_SCORING_WORKERS
+    # threads, with at most FRAUD_SCORING_MAX_PENDING calls queued or running.
+    # Past the deadline, or on errors, decisions fall back to the rules. 0 = no limit
+    FRAUD_SCORING_DEADLINE_MS = float(os.getenv("FRAUD_SCORING_DEADLINE_MS", 250))
+    FRAUD_SCORING_WORKERS = int(os.getenv("FRAUD_SCORING_WORKERS", 2))
+    FRAUD_SCORING_MAX_PENDING = int(os.getenv("FRAUD_SCORING_MAX_PENDING", 32))
+
+    # Velocity features: "memory" keeps rolling windows in each process, "db"
+    # reads them from the transactions table when scoring, so every worker
+    # sees all traffic. gunicorn.conf.py picks "db" when it runs more than one worker
+    VELOCITY_SOURCE = os.getenv("VELOCITY_SOURCE", "memory")
+
+    # Sender -> receiver graph index (mule features, GET /graph). Bootstrapped
+    # at start-up with PRELOAD_GRAPH, else on first use, from the transactions
+    # table ("db") or a CSV in the data/transactions.csv layout. Off by default
+    # so CLI commands don't read the whole table; gunicorn.conf.py turns it on
+    PRELOAD_GRAPH = os.getenv("PRELOAD_GRAPH", "False").lower() == "true"
+    GRAPH_BOOTSTRAP_SOURCE = os.getenv("GRAPH_BOOTSTRAP_SOURCE", "db")
+
+    # Prometheus /metrics (set PROMETHEUS_MULTIPROC_DIR to aggregate across workers)
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "True").lower() == "true"
+
+    # Listing
+    LIST_PAGE_DEFAULT_SIZE = int(os.getenv("LIST_PAGE_DEFAULT_SIZE", 100))
+    LIST_PAGE_MAX_SIZE = int(os.getenv("LIST_PAGE_MAX_SIZE", 1000))
+
+    # GET /<id>: terminal (success/failed) responses are cached in-process and
+    # sent with a long, immutable Cache-Control; pending ones always hit the DB
+    TERMINAL_CACHE_SIZE = int(os.getenv("TERMINAL_CACHE_SIZE", 10000))
+    TERMINAL_CACHE_MAX_AGE = int(os.getenv("TERMINAL_CACHE_MAX_AGE", 86400))  # seconds
+    TERMINAL_CACHE_TTL = float(os.getenv("TERMINAL_CACHE_TTL", 3600))  # seconds; bounds how long archived rows are still served
+
+    # Export (rows fetched per server-side cursor batch)
+    EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 2000))
+
+    # Retention (flask maintain-transactions): monthly partitions are created
+    # this far ahead, and settled rows older than ARCHIVE_RETENTION_MONTHS are
+    # moved to gzip CSVs in ARCHIVE_DIR
+    PARTITION_MONTHS_AHEAD = int(os.getenv("PARTITION_MONTHS_AHEAD", 3))
+    ARCHIVE_RETENTION_MONTHS = int(os.getenv("ARCHIVE_RETENTION_MONTHS", 6))
+    ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", "data/archive")
+
+    # Batch processing
+    BATCH_PROCESS_MAX_SIZE = int(os.getenv("BATCH_PROCESS_MAX_SIZE", 1000))
+
+    # Async processing: /process returns 202 and a background queue settles in micro-batches
+    PROCESS_ASYNC = os.getenv("PROCESS_ASYNC", "False").lower() == "true"
+    PROCESS_QUEUE_BATCH_SIZE = int(os.getenv("PROCESS_QUEUE_BATCH_SIZE", 64))
+    PROCESS_QUEUE_MAX_WAIT_MS = int(os.getenv("PROCESS_QUEUE_MAX_WAIT_MS", 20))
+    PROCESS_QUEUE_WORKERS = int(os.getenv("PROCESS_QUEUE_WORKERS", 2))
+    PROCESS_QUEUE_MAX_DEPTH = int(os.getenv("PROCESS_QUEUE_MAX_DEPTH", 10000))  # per worker; beyond it /process returns 503
+    BULK_INSERT_CHUNK_SIZE = int(os.getenv("BULK_INSERT_CHUNK_SIZE", 5000))
\ No newline at end of file
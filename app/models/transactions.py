@@ -7,9 +7,15 @@ class TransactionStatus(Enum):
     FAILED = "failed"
     SUCCESS = "success"
 
+# No transition leaves these (see app.services.transitions)
+TERMINAL_STATUSES = frozenset({TransactionStatus.FAILED.value, TransactionStatus.SUCCESS.value})
+
 class Transaction(db.Model):
     __tablename__ = 'transactions'
 
+    # On PostgreSQL the table is partitioned by month and its primary key is
+    # (id, timestamp) (see app.services.partitions); id stays the ORM identity
+    # and transaction_ids keeps it unique across partitions
     id = db.Column(db.String(50), primary_key=True)  # Transaction ID
     amount = db.Column(db.Numeric(10, 2), nullable=False)  # Amount in rupees (supports up to 1 lakh)
     sender_upi_id = db.Column(db.String(100), nullable=False)
@@ -29,6 +35,12 @@ class Transaction(db.Model):
     __table_args__ = (
         db.CheckConstraint('amount > 0 AND amount <= 100000', name='amount_range'),  # 1 to 1 lakh
         db.CheckConstraint("status IN ('pending', 'failed', 'success')", name='status_check'),
+        # Keyset pagination (timestamp, id) and the listing filters
+        db.Index('ix_transactions_timestamp_id', 'timestamp', 'id'),
+        db.Index('ix_transactions_status_timestamp_id', 'status', 'timestamp', 'id'),
+        db.Index('ix_transactions_sender_timestamp_id', 'sender_upi_id', 'timestamp', 'id'),
+        db.Index('ix_transactions_receiver_timestamp_id', 'receiver_upi_id', 'timestamp', 'id'),
+        db.Index('ix_transactions_fraud_timestamp_id', 'fraud_flag', 'timestamp', 'id'),
     )
 
     def __repr__(self):
@@ -1,4 +1,8 @@
+from .graph import graph_bp
+from .metrics import metrics_bp
 from .transaction import transaction_bp
 
 def register_routes(app):
-    app.register_blueprint(transaction_bp)
\ No newline at end of file
+    app.register_blueprint(metrics_bp)
+    app.register_blueprint(graph_bp)
+    app.register_blueprint(transaction_bp)
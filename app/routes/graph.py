@@ -0,0 +1,31 @@
+from flask import Blueprint, abort, jsonify, request
+
+graph_bp = Blueprint('graph', __name__)
+
+def _loading():
+    # The index is bootstrapped in the scoring executor, never in the request thread
+    return jsonify({'error': 'Graph index is loading, retry later'}), 503, {'Retry-After': '5'}
+
+@graph_bp.route("/graph", methods=['GET'])
+def graph_stats():
+    """Size of this worker's sender -> receiver graph index."""
+    from app.services.fraud_service import fraud_service
+    if not fraud_service.features_ready():
+        return _loading()
+    return jsonify(fraud_service.graph.stats())
+
+@graph_bp.route("/graph/<path:upi_id>", methods=['GET'])
+def account_graph(upi_id):
+    """
+    Fan-in, fan-out and two-hop path count for one UPI ID.
+
+    ?counterparty=<upi_id> adds how many accounts the two have both
+    transacted with. 503 until the index has been bootstrapped.
+    """
+    from app.services.fraud_service import fraud_service
+    if not fraud_service.features_ready():
+        return _loading()
+    metrics = fraud_service.graph.account(upi_id, request.args.get('counterparty'))
+    if metrics is None:
+        abort(404)
+    return jsonify(metrics)
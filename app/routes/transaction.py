@@ -1,6 +1,18 @@
-from flask import Blueprint, request, jsonify
-from app.config.database import db
-from app.models.transactions import Transaction
+from flask import Blueprint, Response, abort, request, jsonify, current_app, stream_with_context, url_for
+from sqlalchemy import select, tuple_
+from app.config.database import db, read_bind
+from app.models.transactions import TERMINAL_STATUSES, Transaction
+from app.services.bulk_ingest import REQUIRED_FIELDS, ingest, parse_ndjson
+from app.services.export import EXPORT_FORMATS, export_transactions, transaction_filters
+from app.services.partitions import by_id
+from app.services.processing_queue import processing_queue
+from app.services.serialization import TRANSACTION_FIELDS, columns, json_response, parse_fields, project
+from app.services.settlement import SUCCESS_RATE, settle_transactions
+from app.services.transaction_cache import transaction_cache
+from app.services.transitions import (STATUSES, TransactionNotFound, TransitionError, can_transition,
+                                      current_status, load_for_transition, load_pending, transition,
+                                      update_pending)
+from app.utils.pagination import encode_cursor, decode_cursor
 import uuid
 from datetime import datetime
 import random
@@ -9,22 +21,80 @@ transaction_bp = Blueprint('transaction', __name__)
 
 @transaction_bp.route("/", methods=['GET'])
 def get_transactions():
-    """Get all transactions."""
-    transactions = Transaction.query.order_by(Transaction.timestamp.desc()).all()
-    return jsonify([t.to_dict() for t in transactions])
+    """
+    List transactions, newest first, one keyset page at a time.
+
+    Query params: limit, cursor (next_cursor from the previous page),
+    fields (comma-separated subset of the transaction keys),
+    status, fraud_flag, sender_upi_id, receiver_upi_id, since, until (ISO 8601).
+
+    Rows are read as plain projected columns and encoded straight to JSON;
+    no ORM objects are built for this read-only path. Reads go to the
+    replica when DATABASE_READ_URL is set (see read_bind).
+    """
+    args = request.args
+    try:
+        limit = args.get('limit', current_app.config['LIST_PAGE_DEFAULT_SIZE'], type=int)
+        max_size = current_app.config['LIST_PAGE_MAX_SIZE']
+        if limit is None or not 0 < limit <= max_size:
+            raise ValueError(f'limit must be between 1 and {max_size}')
+        fields = parse_fields(args.get('fields'))
+
+        # timestamp and id always come last: they build next_cursor
+        stmt = select(*columns(fields, 'timestamp', 'id')).where(*transaction_filters(args))
+        if 'cursor' in args:
+            stmt = stmt.where(
+                tuple_(Transaction.timestamp, Transaction.id) < tuple_(*decode_cursor(args['cursor']))
+            )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    # Fetch one extra row to know whether another page exists
+    rows = db.session.execute(stmt
+                              .order_by(Transaction.timestamp.desc(), Transaction.id.desc())
+                              .limit(limit + 1),
+                              bind_arguments={'bind': read_bind()}).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]._mapping
+        next_cursor = encode_cursor(last['timestamp'], last['id'])
+
+    return _conditional(json_response({
+        'transactions': project(rows, fields),
+        'next_cursor': next_cursor
+    }))
+
+@transaction_bp.route("/export", methods=['GET'])
+def export_transactions_stream():
+    """
+    Stream every matching transaction as NDJSON (default) or CSV.
+
+    CSV output uses the data/transactions.csv column layout so exports can
+    be fed straight to train_model. Accepts the same filters as GET /, and
+    ?fields= for NDJSON.
+    """
+    fmt = request.args.get('format', 'ndjson').lower()
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'error': f'format must be one of {", ".join(EXPORT_FORMATS)}'}), 400
+    if fmt == 'csv' and 'fields' in request.args:
+        return jsonify({'error': 'fields is only supported for ndjson; csv uses the training layout'}), 400
+    try:
+        filters = transaction_filters(request.args)
+        fields = parse_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    chunks = export_transactions(fmt, filters, current_app.config['EXPORT_BATCH_SIZE'], fields)
+    return Response(stream_with_context(chunks), mimetype=EXPORT_FORMATS[fmt])
 
 @transaction_bp.route("/", methods=['POST'])
 def create_transaction():
     """Create a new transaction."""
     data = request.get_json()
 
-    required_fields = [
-        'amount', 'sender_upi_id', 'receiver_upi_id',
-        'sender_name', 'receiver_name', 'sender_phone', 'receiver_phone'
-    ]
-
     # Validate required fields
-    for field in required_fields:
+    for field in REQUIRED_FIELDS:
         if field not in data:
             return jsonify({'error': f'{field} is required'}), 400
 
@@ -54,110 +124,229 @@ def create_transaction():
     try:
         db.session.add(transaction)
         db.session.commit()
-        return jsonify(transaction.to_dict()), 201
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': 'Failed to create transaction', 'details': str(e)}), 500
 
+    # Update sender/receiver velocity for fraud scoring
+    from app.services.fraud_service import fraud_service
+    fraud_service.record_transaction(transaction)
+
+    return jsonify(transaction.to_dict()), 201
+
+@transaction_bp.route("/bulk", methods=['POST'])
+def create_transactions_bulk():
+    """
+    Create many transactions from a JSON array or an NDJSON stream.
+
+    Rows are validated and inserted in chunks of BULK_INSERT_CHUNK_SIZE;
+    invalid rows are reported by index without aborting the rest.
+    """
+    chunk_size = current_app.config['BULK_INSERT_CHUNK_SIZE']
+
+    if request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+        # Stream the body line by line instead of buffering it
+        rows = parse_ndjson(request.stream)
+    else:
+        rows = request.get_json(silent=True)
+        if not isinstance(rows, list):
+            return jsonify({'error': 'Body must be a JSON array or NDJSON'}), 400
+
+    result = ingest(rows, chunk_size)
+    return jsonify(result), 201
+
 @transaction_bp.route("/<transaction_id>", methods=['GET'])
 def get_transaction(transaction_id):
-    """Get a specific transaction by ID."""
-    transaction = Transaction.query.get_or_404(transaction_id)
-    return jsonify(transaction.to_dict())
+    """
+    Get a specific transaction by ID.
+
+    Terminal transactions (success/failed) never change, so they are served
+    from transaction_cache with a long, immutable Cache-Control; pending
+    ones are read from the database (the replica, if configured) every
+    time. Both carry an ETag and answer If-None-Match with 304.
+    """
+    cached = transaction_cache.get(transaction_id)
+    if cached is not None:
+        body, etag = cached
+        return _conditional(current_app.response_class(body, mimetype='application/json'), etag, terminal=True)
+
+    stmt = select(*columns(TRANSACTION_FIELDS)).where(*by_id(transaction_id))
+    bind = read_bind()
+    row = db.session.execute(stmt, bind_arguments={'bind': bind}).first()
+    if row is None and bind is not db.engine:
+        # Possibly created moments ago by another client and not replicated yet
+        row = db.session.execute(stmt).first()
+    if row is None:
+        abort(404)
+    response = json_response(project([row], TRANSACTION_FIELDS)[0])
+    response.add_etag()
+    terminal = row.status in TERMINAL_STATUSES
+    if terminal:
+        transaction_cache.put(transaction_id, response.get_data(), response.get_etag()[0])
+    return _conditional(response, terminal=terminal)
+
+def _conditional(response, etag=None, terminal=False):
+    """Set ETag and Cache-Control on response and turn it into a 304 when If-None-Match matches."""
+    if etag is not None:
+        response.set_etag(etag)
+    else:
+        response.add_etag()
+    if terminal:
+        response.cache_control.public = True
+        response.cache_control.max_age = current_app.config['TERMINAL_CACHE_MAX_AGE']
+        response.cache_control.immutable = True
+    else:
+        # Cacheable, but must be revalidated (cheap with the ETag) on every use
+        response.cache_control.no_cache = True
+    return response.make_conditional(request)
 
 @transaction_bp.route("/<transaction_id>/status", methods=['PUT'])
 def update_transaction_status(transaction_id):
-    """Update transaction status (pending -> failed/success)."""
-    transaction = Transaction.query.get_or_404(transaction_id)
+    """
+    Update transaction status (pending -> failed/success).
 
+    The status check and the write are one conditional UPDATE (see
+    app.services.transitions); a transaction that is no longer pending,
+    even because of a concurrent request, gets 409. Setting a pending
+    transaction to pending is accepted and changes nothing.
+    """
     data = request.get_json()
     if not data or 'status' not in data:
         return jsonify({'error': 'status is required'}), 400
 
     new_status = data['status'].lower()
-    if new_status not in ['pending', 'failed', 'success']:
+    if new_status not in STATUSES:
         return jsonify({'error': 'Invalid status. Must be pending, failed, or success'}), 400
 
-    # Business logic: can only change from pending
-    if transaction.status != 'pending':
-        return jsonify({'error': f'Cannot change status from {transaction.status}'}), 400
-
-    # If trying to set to success, check fraud first
-    if new_status == 'success':
-        from app.services.fraud_service import fraud_service
-        fraud_result = fraud_service.check_transaction_fraud(transaction)
+    try:
+        if new_status == 'pending':
+            row = load_pending(transaction_id)
+            return json_response({
+                'message': 'Transaction status unchanged',
+                'transaction': project([row], TRANSACTION_FIELDS)[0]
+            })
 
-        transaction.fraud_flag = fraud_result['is_suspicious']
-        transaction.fraud_score = fraud_result['score']
+        values, timestamp = {}, None
+        # If trying to set to success, check fraud first
+        if new_status == 'success':
+            from app.services.fraud_service import fraud_service
+            current = load_for_transition(transaction_id, new_status)
+            fraud_result = fraud_service.check_transaction_fraud(current)
+            values = {'fraud_flag': fraud_result['is_suspicious'], 'fraud_score': fraud_result['score']}
+            timestamp = current.timestamp
 
-        # If suspicious, don't allow success but save the fraud detection results
-        if fraud_result['is_suspicious']:
-            try:
-                db.session.commit()
+            # If suspicious, don't allow success but save the fraud detection results
+            if fraud_result['is_suspicious']:
+                update_pending(transaction_id, timestamp, **values)
                 return jsonify({
                     'error': 'Transaction flagged as suspicious',
                     'fraud_score': fraud_result['score'],
                     'message': 'Cannot complete suspicious transaction'
                 }), 400
-            except Exception as e:
-                db.session.rollback()
-                return jsonify({'error': 'Failed to update fraud detection results', 'details': str(e)}), 500
 
-    transaction.status = new_status
-
-    try:
-        db.session.commit()
-        return jsonify({
-            'message': f'Transaction status updated to {new_status}',
-            'transaction': transaction.to_dict()
-        }), 200
+        row = transition(transaction_id, new_status, timestamp, **values)
+    except TransitionError as e:
+        return _transition_error(e, f'Cannot change status from {getattr(e, "current", None)}')
     except Exception as e:
-        db.session.rollback()
         return jsonify({'error': 'Failed to update status', 'details': str(e)}), 500
 
+    return json_response({
+        'message': f'Transaction status updated to {new_status}',
+        'transaction': project([row], TRANSACTION_FIELDS)[0]
+    })
+
 @transaction_bp.route("/<transaction_id>/process", methods=['POST'])
 def process_transaction(transaction_id):
-    """Process a pending transaction (simulate payment processing)."""
-    transaction = Transaction.query.get_or_404(transaction_id)
+    """
+    Process a pending transaction (simulate payment processing).
+
+    Like PUT /<id>/status, the outcome is written with one conditional
+    UPDATE; a transaction that is no longer pending gets 409.
+    """
+    # Async mode: hand off to the micro-batching queue and let the client poll
+    if current_app.config['PROCESS_ASYNC']:
+        status = current_status(transaction_id)
+        if status is None:
+            abort(404)
+        if not can_transition(status, 'success'):
+            return jsonify({'error': f'Transaction is already {status}', 'status': status}), 409
+        if not processing_queue.submit(transaction_id):
+            return jsonify({'error': 'Processing queue is full, retry later'}), 503, {'Retry-After': '1'}
+        status_url = url_for('transaction.get_transaction', transaction_id=transaction_id)
+        return jsonify({
+            'message': 'Transaction queued for processing',
+            'transaction_id': transaction_id,
+            'status_url': status_url
+        }), 202, {'Location': status_url}
 
-    if transaction.status != 'pending':
-        return jsonify({'error': f'Transaction is already {transaction.status}'}), 400
+    try:
+        # Simulate processing delay and random success/failure
+        if random.random() >= SUCCESS_RATE:
+            # A plain failure needs no read: one statement does the check and the write
+            row = transition(transaction_id, 'failed')
+        else:
+            # Attempt to set as success (will check fraud)
+            from app.services.fraud_service import fraud_service
+            current = load_for_transition(transaction_id, 'success')
+            fraud_result = fraud_service.check_transaction_fraud(current)
+            # Suspicious transactions are marked as failed due to fraud
+            row = transition(transaction_id, 'failed' if fraud_result['is_suspicious'] else 'success',
+                             timestamp=current.timestamp,
+                             fraud_flag=fraud_result['is_suspicious'], fraud_score=fraud_result['score'])
+            if fraud_result['is_suspicious']:
+                return json_response({
+                    'message': 'Transaction failed due to fraud detection',
+                    'fraud_score': fraud_result['score'],
+                    'transaction': project([row], TRANSACTION_FIELDS)[0]
+                })
+    except TransitionError as e:
+        return _transition_error(e, f'Transaction is already {getattr(e, "current", None)}')
+    except Exception as e:
+        return jsonify({'error': 'Failed to process transaction', 'details': str(e)}), 500
 
-    # Simulate processing delay and random success/failure
-    import random
-    success_rate = 0.8  # 80% success rate
+    return json_response({
+        'message': f'Transaction processed: {row.status}',
+        'transaction': project([row], TRANSACTION_FIELDS)[0]
+    })
 
-    if random.random() < success_rate:
-        # Attempt to set as success (will check fraud)
-        update_data = {'status': 'success'}
-    else:
-        update_data = {'status': 'failed'}
+def _transition_error(error, conflict_message):
+    """404 for a missing transaction, 409 (with its current status) for a conflicting one."""
+    if isinstance(error, TransactionNotFound):
+        abort(404)
+    return jsonify({'error': conflict_message, 'status': error.current}), 409
 
-    # Use the same logic as update status
-    from app.services.fraud_service import fraud_service
+@transaction_bp.route("/process/queue", methods=['GET'])
+def processing_queue_stats():
+    """Depth, batch sizes and end-to-end latency of the async processing queue (this worker)."""
+    return jsonify(processing_queue.stats())
 
-    if update_data['status'] == 'success':
-        fraud_result = fraud_service.check_transaction_fraud(transaction)
-        transaction.fraud_flag = fraud_result['is_suspicious']
-        transaction.fraud_score = fraud_result['score']
+@transaction_bp.route("/process/batch", methods=['POST'])
+def process_transactions_batch():
+    """
+    Process many pending transactions in one pass.
 
-        if fraud_result['is_suspicious']:
-            transaction.status = 'failed'  # Mark as failed due to fraud
-            db.session.commit()
-            return jsonify({
-                'message': 'Transaction failed due to fraud detection',
-                'fraud_score': fraud_result['score'],
-                'transaction': transaction.to_dict()
-            }), 200
+    Body: {"ids": [...]} to process specific transactions, or
+    {"limit": N} to process up to N of the oldest pending ones.
+    """
+    data = request.get_json(silent=True) or {}
+    ids = data.get('ids')
+    limit = data.get('limit')
+    max_size = current_app.config['BATCH_PROCESS_MAX_SIZE']
 
-    transaction.status = update_data['status']
+    if (ids is None) == (limit is None):
+        return jsonify({'error': 'Provide either ids or limit'}), 400
+    if ids is not None:
+        if not isinstance(ids, list) or not ids or not all(isinstance(i, str) for i in ids):
+            return jsonify({'error': 'ids must be a non-empty list of transaction IDs'}), 400
+        if len(ids) > max_size:
+            return jsonify({'error': f'At most {max_size} transactions per batch'}), 400
+    elif not isinstance(limit, int) or isinstance(limit, bool) or not 0 < limit <= max_size:
+        return jsonify({'error': f'limit must be between 1 and {max_size}'}), 400
 
     try:
-        db.session.commit()
-        return jsonify({
-            'message': f'Transaction processed: {transaction.status}',
-            'transaction': transaction.to_dict()
-        }), 200
+        results = settle_transactions(ids=ids, limit=limit)
     except Exception as e:
-        db.session.rollback()
-        return jsonify({'error': 'Failed to process transaction', 'details': str(e)}), 500
+        return jsonify({'error': 'Failed to process transactions', 'details': str(e)}), 500
+
+    processed = sum(1 for r in results if r['outcome'] not in ('skipped', 'not_found'))
+    return jsonify({'processed': processed, 'results': results}), 200
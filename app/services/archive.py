@@ -0,0 +1,123 @@
+import csv
+import gzip
+import io
+import os
+from sqlalchemy import delete, func, select
+from app.config.database import db
+from app.models.transactions import TERMINAL_STATUSES, Transaction
+from app.services.export import CSV_COLUMNS, csv_row
+from app.services.partitions import add_months, drop_empty_partitions, month_start
+
+
+def archive_transactions(directory, before, batch_size=2000):
+    """
+    Move settled transactions older than `before` out of the database.
+
+    Terminal (success/failed) rows are written to one gzip CSV per month,
+    transactions-YYYY-MM.csv.gz, in the data/transactions.csv layout, and
+    deleted in the same database transaction. pd.read_csv and train_model
+    read these files as they are. Pending rows stay in the table whatever
+    their age. On PostgreSQL, monthly partitions left empty are dropped
+    afterwards.
+
+    Args:
+        directory: where the archive files go (created if missing)
+        before: archive rows with timestamp < before (rounded down to a month)
+        batch_size: rows fetched per server-side cursor batch
+
+    Returns:
+        {'archived': [{'month', 'path', 'rows'}], 'dropped_partitions': [names]}
+    """
+    before = month_start(before)
+    oldest = db.session.execute(
+        select(func.min(Transaction.timestamp))
+        .where(Transaction.status.in_(TERMINAL_STATUSES), Transaction.timestamp < before)
+    ).scalar()
+    db.session.commit()
+
+    archived = []
+    if oldest is not None:
+        os.makedirs(directory, exist_ok=True)
+        month = month_start(oldest)
+        while month < before:
+            entry = archive_month(directory, month, batch_size)
+            if entry is not None:
+                archived.append(entry)
+            month = add_months(month, 1)
+
+    return {'archived': archived, 'dropped_partitions': drop_empty_partitions(before)}
+
+
+def archive_month(directory, month, batch_size=2000):
+    """
+    Archive one month's terminal rows; see archive_transactions.
+
+    The rows are read and deleted in one REPEATABLE READ transaction on
+    PostgreSQL. If a row in the month settles while the file is being
+    written, the DELETE fails with a serialization error: the transaction
+    is rolled back, the file is removed, and the next run tries again.
+
+    Returns:
+        {'month', 'path', 'rows'}, or None when the month has nothing to archive
+    """
+    table = Transaction.__table__
+    criteria = (table.c.status.in_(TERMINAL_STATUSES),
+                table.c.timestamp >= month,
+                table.c.timestamp < add_months(month, 1))
+    path = archive_path(directory, month)
+    partial = f'{path}.partial'
+
+    conn = db.engine.connect()
+    if conn.dialect.name == 'postgresql':
+        conn = conn.execution_options(isolation_level='REPEATABLE READ')
+    placed = False
+    try:
+        with conn.begin():
+            rows = conn.execute(select(table).where(*criteria)
+                                .order_by(table.c.timestamp, table.c.id)
+                                .execution_options(yield_per=batch_size))
+            written = _write_csv_gz(partial, rows)
+            if not written:
+                os.remove(partial)
+                return None
+
+            deleted = conn.execute(delete(table).where(*criteria)).rowcount
+            if deleted != written:
+                raise RuntimeError(f'{month:%Y-%m}: wrote {written} rows but deleted {deleted}')
+            # In place before the commit; if the commit fails the rows are
+            # still in the table and the file is removed below
+            os.replace(partial, path)
+            placed = True
+    except Exception:
+        for leftover in (partial, path if placed else None):
+            if leftover and os.path.exists(leftover):
+                os.remove(leftover)
+        raise
+    finally:
+        conn.close()
+
+    return {'month': f'{month:%Y-%m}', 'path': path, 'rows': written}
+
+
+def archive_path(directory, month):
+    """transactions-YYYY-MM.csv.gz, or .1, .2, ... when a month is archived again."""
+    base = os.path.join(directory, f'transactions-{month:%Y-%m}')
+    path, n = f'{base}.csv.gz', 0
+    while os.path.exists(path):
+        n += 1
+        path = f'{base}.{n}.csv.gz'
+    return path
+
+
+def _write_csv_gz(path, rows):
+    """Write rows to path and fsync it, so the file is durable before they are deleted."""
+    count = 0
+    with open(path, 'wb') as raw:
+        with io.TextIOWrapper(gzip.GzipFile(fileobj=raw, mode='wb'), newline='') as f:
+            writer = csv.writer(f, lineterminator='\n')
+            writer.writerow(CSV_COLUMNS)
+            for count, row in enumerate(rows, start=1):
+                writer.writerow(csv_row(row))
+        raw.flush()
+        os.fsync(raw.fileno())
+    return count
@@ -0,0 +1,164 @@
+import json
+import uuid
+from datetime import datetime
+from itertools import islice
+import pandas as pd
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from app.config.database import db
+from app.models.transactions import Transaction
+
+REQUIRED_FIELDS = [
+    'amount', 'sender_upi_id', 'receiver_upi_id',
+    'sender_name', 'receiver_name', 'sender_phone', 'receiver_phone'
+]
+MIN_AMOUNT, MAX_AMOUNT = 0, 100000
+# Longest value each string field's column holds, e.g. 15 for the phone numbers
+MAX_LENGTHS = {field: Transaction.__table__.c[field].type.length for field in REQUIRED_FIELDS if field != 'amount'}
+
+
+def validate_rows(rows, offset=0):
+    """
+    Validate a chunk of transaction payloads column-wise.
+
+    Applies the same rules as create_transaction (required fields,
+    0 < amount <= 100000) to the whole chunk at once, then checks that the
+    text fields are strings that fit their columns (MAX_LENGTHS), so the
+    database doesn't reject the chunk over one row.
+
+    Args:
+        rows: list of parsed payloads (dicts, or anything else for bad input)
+        offset: index of rows[0] in the overall request, for reject reporting
+
+    Returns:
+        (valid, rejects): list of insertable dicts, list of {'index', 'error'}
+    """
+    rejects = [{'index': offset + i, 'error': 'Row must be a valid JSON object'}
+               for i, row in enumerate(rows) if not isinstance(row, dict)]
+    positions = [i for i, row in enumerate(rows) if isinstance(row, dict)]
+    if not positions:
+        return [], rejects
+
+    df = pd.DataFrame.from_records([rows[i] for i in positions], columns=REQUIRED_FIELDS)
+    error = pd.Series(None, index=df.index, dtype=object)
+
+    # First failing rule wins, checked in create_transaction's order
+    for field in REQUIRED_FIELDS:
+        error = error.mask(error.isna() & df[field].isna(), f'{field} is required')
+    amount = pd.to_numeric(df['amount'], errors='coerce')
+    error = error.mask(error.isna() & amount.isna(), 'Invalid amount format')
+    out_of_range = (amount <= MIN_AMOUNT) | (amount > MAX_AMOUNT)
+    error = error.mask(error.isna() & out_of_range, 'Amount must be between 1 and 100,000 rupees')
+    for field, max_length in MAX_LENGTHS.items():
+        length = _string_lengths(df[field])
+        error = error.mask(error.isna() & length.isna(), f'{field} must be a string')
+        error = error.mask(error.isna() & (length > max_length), f'{field} must be at most {max_length} characters')
+
+    bad = error.notna().to_numpy()
+    rejects.extend({'index': offset + positions[i], 'error': error.iat[i]} for i in bad.nonzero()[0])
+    rejects.sort(key=lambda r: r['index'])
+
+    now = datetime.now()
+    valid = []
+    for i, amount_value in zip((~bad).nonzero()[0], amount[~bad].tolist()):
+        row = rows[positions[i]]
+        record = {field: row[field] for field in REQUIRED_FIELDS}
+        record.update(
+            id=str(uuid.uuid4())[:16].upper(),
+            amount=amount_value,
+            timestamp=now,
+            status='pending',
+            fraud_flag=False,
+        )
+        valid.append(record)
+    return valid, rejects
+
+
+def _string_lengths(values):
+    """len() of each string in values, NaN for anything else (.str.len() alone also measures lists)."""
+    is_string = values.map(type).eq(str)
+    if not is_string.any():  # .str refuses a column without any strings
+        return pd.Series(float('nan'), index=values.index)
+    return values.where(is_string).str.len()
+
+
+def insert_rows(records):
+    """Insert validated rows as multi-row INSERTs (insertmanyvalues) and commit."""
+    if records:
+        db.session.execute(insert(Transaction.__table__), records)
+    db.session.commit()
+
+
+def insert_rows_one_by_one(records, indices):
+    """
+    Insert rows one at a time, each under its own SAVEPOINT, and commit.
+
+    For a chunk the database refused as a whole: rows that fail are rolled
+    back alone and reported, and the rest are kept.
+
+    Args:
+        records: validated rows, as for insert_rows
+        indices: each record's index in the overall request
+
+    Returns:
+        (inserted, rejects): inserted records, list of {'index', 'error'}
+    """
+    inserted, rejects = [], []
+    for index, record in zip(indices, records):
+        try:
+            with db.session.begin_nested():
+                db.session.execute(insert(Transaction.__table__), [record])
+        except SQLAlchemyError as e:
+            rejects.append({'index': index, 'error': f'Insert failed: {getattr(e, "orig", None) or e}'})
+        else:
+            inserted.append(record)
+    db.session.commit()
+    return inserted, rejects
+
+
+def ingest(rows, chunk_size):
+    """
+    Validate and insert payloads chunk by chunk.
+
+    A chunk that fails at the database is rolled back and retried row by
+    row, so only the rows the database refuses are rejected.
+
+    Args:
+        rows: iterable of parsed payloads (a JSON array or a stream of NDJSON lines)
+        chunk_size: rows per INSERT/COMMIT
+
+    Returns:
+        dict: {'inserted': int, 'rejected': [{'index', 'error'}]}
+    """
+    from app.services.fraud_service import fraud_service
+
+    inserted, rejected, offset = 0, [], 0
+    rows = iter(rows)
+    while chunk := list(islice(rows, chunk_size)):
+        valid, rejects = validate_rows(chunk, offset)
+        try:
+            insert_rows(valid)
+        except SQLAlchemyError:
+            db.session.rollback()
+            already = {r['index'] for r in rejects}
+            indices = [offset + i for i in range(len(chunk)) if offset + i not in already]
+            valid, failed = insert_rows_one_by_one(valid, indices)
+            rejects = sorted(rejects + failed, key=lambda r: r['index'])
+        inserted += len(valid)
+        # Update sender/receiver velocity for fraud scoring
+        fraud_service.record_rows(valid)
+        rejected.extend(rejects)
+        offset += len(chunk)
+    return {'inserted': inserted, 'rejected': rejected}
+
+
+def parse_ndjson(lines):
+    """Yield one payload per non-blank NDJSON line; malformed lines yield None."""
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield None
@@ -0,0 +1,118 @@
+import csv
+import io
+from datetime import datetime
+from sqlalchemy import select
+from app.config.database import db, read_bind
+from app.models.transactions import Transaction
+from app.services.serialization import TRANSACTION_FIELDS, columns, dumps
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+# Same column layout as data/transactions.csv (the training input)
+CSV_COLUMNS = [
+    'Transaction ID', 'Amount', 'Sender UPI ID', 'Receiver UPI ID',
+    'Sender Name', 'Receiver Name', 'Sender Phone', 'Receiver Phone',
+    'Timestamp', 'State', 'City'
+]
+CSV_TIMESTAMP_FORMAT = "%d-%m-%Y %H:%M"
+
+
+def transaction_filters(args):
+    """
+    Build WHERE clauses from listing/export query parameters.
+
+    Raises:
+        ValueError: on a malformed fraud_flag, since or until value
+    """
+    filters = []
+    if 'status' in args:
+        filters.append(Transaction.status == args['status'].lower())
+    if 'fraud_flag' in args:
+        if args['fraud_flag'].lower() not in ('true', 'false'):
+            raise ValueError('fraud_flag must be true or false')
+        filters.append(Transaction.fraud_flag == (args['fraud_flag'].lower() == 'true'))
+    if 'sender_upi_id' in args:
+        filters.append(Transaction.sender_upi_id == args['sender_upi_id'])
+    if 'receiver_upi_id' in args:
+        filters.append(Transaction.receiver_upi_id == args['receiver_upi_id'])
+    if 'since' in args:
+        filters.append(Transaction.timestamp >= datetime.fromisoformat(args['since']))
+    if 'until' in args:
+        filters.append(Transaction.timestamp < datetime.fromisoformat(args['until']))
+    return filters
+
+
+def iter_transactions(filters, batch_size, fields=None):
+    """
+    Yield matching rows oldest first through a server-side cursor, from
+    the read replica when one is configured.
+
+    Plain column rows rather than ORM objects, so nothing accumulates in
+    the session's identity map while streaming. With fields, only those
+    columns are selected, in that order.
+    """
+    selected = columns(fields) if fields else Transaction.__table__.c
+    stmt = (select(*selected)
+            .where(*filters)
+            .order_by(Transaction.timestamp.asc(), Transaction.id.asc())
+            .execution_options(yield_per=batch_size))
+    yield from db.session.execute(stmt, bind_arguments={'bind': read_bind()})
+
+
+def csv_row(row):
+    """Transaction row in the data/transactions.csv layout."""
+    amount = row.amount.normalize()
+    return [
+        row.id,
+        f'{amount:f}',
+        row.sender_upi_id,
+        row.receiver_upi_id,
+        row.sender_name,
+        row.receiver_name,
+        row.sender_phone,
+        row.receiver_phone,
+        row.timestamp.strftime(CSV_TIMESTAMP_FORMAT),
+        'Unknown',  # State/City are not captured by the API
+        'Unknown',
+    ]
+
+
+def export_transactions(fmt, filters, batch_size, fields=None):
+    """
+    Yield the export body in chunks of batch_size rows.
+
+    Memory stays bounded by one batch regardless of the table size.
+    NDJSON lines hold `fields` (default: every to_dict key).
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    if fmt == 'csv':
+        # Send the header straight away so clients see bytes immediately
+        writer.writerow(CSV_COLUMNS)
+        yield _drain(buffer)
+        rows = iter_transactions(filters, batch_size)
+    else:
+        fields = fields or TRANSACTION_FIELDS
+        rows = iter_transactions(filters, batch_size, fields)
+
+    for count, row in enumerate(rows, start=1):
+        if fmt == 'csv':
+            writer.writerow(csv_row(row))
+        else:
+            buffer.write(dumps(dict(zip(fields, row))))
+            buffer.write('\n')
+        if count % batch_size == 0:
+            yield _drain(buffer)
+
+    if buffer.tell():
+        yield _drain(buffer)
+
+
+def _drain(buffer):
+    data = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return data
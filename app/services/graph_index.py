@@ -0,0 +1,102 @@
+import threading
+from collections import OrderedDict
+import pandas as pd
+from models.fraud_detection.graph import GRAPH_COLUMNS, TransactionGraph
+from models.fraud_detection.velocity import timestamp_seconds
+
+
+class GraphIndex:
+    """
+    Live sender -> receiver graph for mule-account features and GET /graph.
+
+    Wraps a TransactionGraph with a lock. Like VelocityStore, each
+    transaction's GRAPH_COLUMNS are snapshotted when it is recorded, so
+    scoring it again later (e.g. on PUT /status) sees the graph as it was at
+    creation, which is what add_graph_features computes for training.
+
+    The index is per process. It is bootstrapped in bulk from the whole
+    transactions table or a CSV in the data/transactions.csv layout, at
+    start-up with PRELOAD_GRAPH, otherwise on first use.
+    """
+
+    def __init__(self, max_snapshots=100_000):
+        self.max_snapshots = max_snapshots
+        self.loaded = False
+        self._graph = TransactionGraph()
+        self._snapshots = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, transaction_id, sender, receiver):
+        """
+        Add a payment and return its feature snapshot.
+
+        Recording an ID that is already known returns the stored snapshot;
+        repeat payments between the same accounts leave the graph unchanged.
+        """
+        with self._lock:
+            values = self._snapshots.get(transaction_id)
+            if values is None:
+                values = self._graph.row(*self._graph.add(sender, receiver))
+                self._remember(self._snapshots, transaction_id, values)
+            else:
+                self._snapshots.move_to_end(transaction_id)
+        return dict(zip(GRAPH_COLUMNS, map(float, values)))
+
+    def snapshot(self, transaction_id):
+        """Features stored when transaction_id was recorded, or None."""
+        with self._lock:
+            values = self._snapshots.get(transaction_id)
+        return None if values is None else dict(zip(GRAPH_COLUMNS, map(float, values)))
+
+    def rebuild(self, rows):
+        """
+        Replace the index from (id, sender, receiver) rows ordered by timestamp.
+
+        The new graph is built off to the side and swapped in at the end, so
+        scoring carries on against the old one meanwhile.
+        """
+        graph = TransactionGraph()
+        snapshots = OrderedDict()
+        add, row = graph.add, graph.row
+        for transaction_id, sender, receiver in rows:
+            self._remember(snapshots, transaction_id, row(*add(sender, receiver)))
+        with self._lock:
+            self._graph = graph
+            self._snapshots = snapshots
+        self.loaded = True
+        return len(graph)
+
+    def _remember(self, snapshots, transaction_id, values):
+        snapshots[transaction_id] = values
+        if len(snapshots) > self.max_snapshots:
+            snapshots.popitem(last=False)
+
+    def rebuild_from_csv(self, path):
+        """Rebuild from a CSV in the data/transactions.csv layout."""
+        df = pd.read_csv(path, usecols=['Transaction ID', 'Sender UPI ID', 'Receiver UPI ID', 'Timestamp'],
+                         dtype=str)
+        df = df.iloc[timestamp_seconds(df).argsort(kind='stable')]
+        return self.rebuild(zip(df['Transaction ID'], df['Sender UPI ID'], df['Receiver UPI ID']))
+
+    def account(self, upi_id, counterparty=None):
+        """Graph metrics for one UPI ID, or None if it has never transacted."""
+        with self._lock:
+            graph = self._graph
+            n = graph.node(upi_id, create=False)
+            if n is None:
+                return None
+            metrics = {
+                'upi_id': upi_id,
+                'fan_out': len(graph.out[n]),
+                'fan_in': len(graph.into[n]),
+                'two_hop_paths': graph.two_hop[n],
+            }
+            if counterparty is not None:
+                other = graph.node(counterparty, create=False)
+                metrics['counterparty'] = counterparty
+                metrics['shared_counterparties'] = 0 if other is None else graph.shared_counterparties(n, other)
+            return metrics
+
+    def stats(self):
+        with self._lock:
+            return {'loaded': self.loaded, 'accounts': len(self._graph), 'edges': self._graph.edge_count}
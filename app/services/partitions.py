@@ -0,0 +1,187 @@
+"""
+Monthly range partitions of the transactions table (PostgreSQL).
+
+The partitioning migration turns `transactions` into a table partitioned
+by RANGE (timestamp), with one partition per calendar month named
+transactions_pYYYYMM, and a transactions_default partition that catches
+anything outside them. ensure_partitions() keeps partitions created ahead of
+time so new rows never land in the default one. drop_empty_partitions()
+removes old months once archive_transactions has emptied them.
+
+Queries bounded on timestamp (the velocity store's last day, since/until
+filters) only scan the matching partitions. The newest-first listing
+reads partitions in order and stops at the page limit. Lookups by id go
+through by_id(), which finds the partition via the transaction_ids table.
+On other databases the table is a plain table and these functions do
+nothing.
+"""
+import weakref
+from datetime import datetime
+from sqlalchemy import Column, DateTime, MetaData, String, Table, select, text
+from app.config.database import db
+from app.models.transactions import Transaction
+
+PARENT = 'transactions'
+DEFAULT_PARTITION = 'transactions_default'
+
+# id -> timestamp of every transaction, kept by a trigger (migration
+# e8f3a61c2d94). Its primary key keeps ids unique across partitions. It lives
+# outside db.metadata: only partitioned PostgreSQL databases have it.
+ID_LOOKUP = Table('transaction_ids', MetaData(),
+                  Column('id', String(50), primary_key=True),
+                  Column('timestamp', DateTime, nullable=False))
+
+_has_id_lookup = weakref.WeakKeyDictionary()
+
+
+def month_start(value):
+    return datetime(value.year, value.month, 1)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f'{PARENT}_p{month:%Y%m}'
+
+
+def partition_month(name):
+    """Month a transactions_pYYYYMM partition covers, or None for other names."""
+    prefix = f'{PARENT}_p'
+    if not name.startswith(prefix):
+        return None
+    try:
+        return datetime.strptime(name[len(prefix):], '%Y%m')
+    except ValueError:
+        return None
+
+
+def is_partitioned(conn):
+    if conn.dialect.name != 'postgresql':
+        return False
+    kind = conn.execute(text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:name)"),
+                        {'name': PARENT}).scalar()
+    return kind == 'p'
+
+
+def has_id_lookup(engine=None):
+    """Whether the database has transaction_ids (checked once per engine)."""
+    engine = engine or db.engine
+    found = _has_id_lookup.get(engine)
+    if found is None:
+        found = False
+        if engine.dialect.name == 'postgresql':
+            with engine.connect() as conn:
+                found = conn.execute(text("SELECT to_regclass('transaction_ids') IS NOT NULL")).scalar()
+        _has_id_lookup[engine] = found
+    return found
+
+
+def by_id(transaction_id, timestamp=None):
+    """
+    WHERE criteria for one transaction by id.
+
+    On a partitioned table `id = :id` alone probes every monthly partition.
+    There the criteria also pin the timestamp: the one given, when the
+    caller has read the row already, or else the one in transaction_ids,
+    which PostgreSQL reads first and prunes partitions with at execution
+    time. Elsewhere they are just `id = :id`.
+
+    Args:
+        transaction_id: the id, or a bindparam for executemany
+        timestamp: the transaction's timestamp if known (value or bindparam)
+    """
+    columns = Transaction.__table__.c
+    criteria = [columns.id == transaction_id]
+    if has_id_lookup():
+        if timestamp is None:
+            timestamp = select(ID_LOOKUP.c.timestamp).where(ID_LOOKUP.c.id == transaction_id).scalar_subquery()
+        criteria.append(columns.timestamp == timestamp)
+    return criteria
+
+
+def list_partitions(conn):
+    """{month: name} of the monthly partitions, oldest first (the default partition is left out)."""
+    names = conn.execute(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE pg_inherits.inhparent = to_regclass(:name)"
+    ), {'name': PARENT}).scalars()
+    months = {partition_month(name): name for name in names}
+    months.pop(None, None)
+    return dict(sorted(months.items()))
+
+
+def create_partition(conn, month):
+    """
+    Create the partition for month.
+
+    Rows for that month already sitting in the default partition are
+    moved into the new one (PostgreSQL refuses to create it otherwise).
+    They are deleted and re-inserted through the parent table, so the
+    transaction_ids trigger sees both halves of the move.
+    """
+    name = partition_name(month)
+    # Literal bounds: PARTITION OF doesn't take bind parameters. Both are
+    # formatted from datetimes, never from user input
+    lower, upper = f"'{month:%Y-%m-%d}'", f"'{add_months(month, 1):%Y-%m-%d}'"
+    in_range = f'"timestamp" >= {lower} AND "timestamp" < {upper}'
+
+    stranded = conn.execute(text(f'SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE {in_range})')).scalar()
+    if not stranded:
+        conn.execute(text(f'CREATE TABLE {name} PARTITION OF {PARENT} FOR VALUES FROM ({lower}) TO ({upper})'))
+        return name
+
+    stranded = f'{name}_stranded'
+    conn.execute(text(f'CREATE TEMPORARY TABLE {stranded} (LIKE {PARENT}) ON COMMIT DROP'))
+    # No monthly partition covers the range yet, so these rows are all in the default one
+    conn.execute(text(f'WITH moved AS (DELETE FROM {PARENT} WHERE {in_range} RETURNING *) '
+                      f'INSERT INTO {stranded} SELECT * FROM moved'))
+    conn.execute(text(f'CREATE TABLE {name} PARTITION OF {PARENT} FOR VALUES FROM ({lower}) TO ({upper})'))
+    conn.execute(text(f'INSERT INTO {PARENT} SELECT * FROM {stranded}'))
+    return name
+
+
+def ensure_partitions(months_ahead=3, now=None):
+    """
+    Create any missing monthly partitions from the current month to months_ahead.
+
+    Returns:
+        list of created partition names (empty when not partitioned)
+    """
+    current = month_start(now or datetime.now())
+    created = []
+    with db.engine.begin() as conn:
+        if not is_partitioned(conn):
+            return created
+        existing = list_partitions(conn)
+        for offset in range(months_ahead + 1):
+            month = add_months(current, offset)
+            if month not in existing:
+                created.append(create_partition(conn, month))
+    return created
+
+
+def drop_empty_partitions(before):
+    """
+    Drop monthly partitions that end on or before `before` and hold no rows.
+
+    Partitions still holding rows (e.g. transactions that never settled)
+    are kept.
+
+    Returns:
+        list of dropped partition names
+    """
+    dropped = []
+    with db.engine.begin() as conn:
+        if not is_partitioned(conn):
+            return dropped
+        for month, name in list_partitions(conn).items():
+            if add_months(month, 1) > before:
+                break
+            if not conn.execute(text(f'SELECT EXISTS (SELECT 1 FROM {name})')).scalar():
+                conn.execute(text(f'DROP TABLE {name}'))
+                dropped.append(name)
+    return dropped
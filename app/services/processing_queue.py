@@ -0,0 +1,141 @@
+import atexit
+import queue
+import threading
+import time
+from collections import deque
+
+
+class ProcessingQueue:
+    """
+    In-process queue that settles /process requests in micro-batches.
+
+    Background threads pull transaction IDs off the queue and flush a batch
+    when it reaches batch_size IDs or max_wait_ms after its first ID,
+    whichever comes first. Each batch goes through settle_transactions: one
+    SELECT, one fraud model call and one COMMIT.
+
+    Threads are started on the first submit, so under gunicorn --preload they
+    run in the workers rather than the master. Queued IDs are drained on
+    interpreter exit; anything lost stays 'pending' and can be picked up by
+    POST /process/batch.
+    """
+
+    def __init__(self, batch_size=64, max_wait_ms=20, workers=2, max_depth=10_000, history=1000):
+        self.batch_size = batch_size
+        self.max_wait_ms = max_wait_ms
+        self.workers = workers
+        self.max_depth = max_depth
+        self.app = None
+        self.batches = 0
+        self.processed = 0
+        self.errors = 0
+        self._queue = queue.Queue(maxsize=max_depth)
+        self._batch_sizes = deque(maxlen=history)
+        self._latencies = deque(maxlen=history)
+        self._threads = []
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.app = app
+        self.batch_size = app.config.get("PROCESS_QUEUE_BATCH_SIZE", self.batch_size)
+        self.max_wait_ms = app.config.get("PROCESS_QUEUE_MAX_WAIT_MS", self.max_wait_ms)
+        self.workers = app.config.get("PROCESS_QUEUE_WORKERS", self.workers)
+        self.max_depth = app.config.get("PROCESS_QUEUE_MAX_DEPTH", self.max_depth)
+        with self._queue.mutex:
+            self._queue.maxsize = self.max_depth
+
+    def submit(self, transaction_id):
+        """Queue a transaction for processing; False if the queue is full."""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((transaction_id, time.perf_counter()))
+        except queue.Full:
+            return False
+        return True
+
+    def join(self):
+        """Block until every queued ID has been processed."""
+        self._queue.join()
+
+    def stop(self):
+        """Process what is already queued, then stop the worker threads."""
+        self.join()
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        self._stop.clear()
+
+    def stats(self):
+        with self._lock:
+            batch_sizes = list(self._batch_sizes)
+            latencies = sorted(self._latencies)
+            stats = {
+                'depth': self._queue.qsize(),
+                'batches': self.batches,
+                'processed': self.processed,
+                'errors': self.errors,
+                'avg_batch_size': sum(batch_sizes) / len(batch_sizes) if batch_sizes else 0.0,
+                'max_batch_size': max(batch_sizes, default=0),
+            }
+        for name, q in (('p50', 0.50), ('p95', 0.95), ('p99', 0.99)):
+            stats[f'latency_{name}_ms'] = latencies[int(q * (len(latencies) - 1))] * 1000 if latencies else 0.0
+        return stats
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._threads:
+                return
+            for n in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f"process-queue-{n}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            atexit.register(self.stop)
+
+    def _next_batch(self):
+        """Block for the first ID, then collect more until the batch is full or max_wait_ms passes."""
+        try:
+            batch = [self._queue.get(timeout=0.5)]
+        except queue.Empty:
+            return []
+        deadline = time.perf_counter() + self.max_wait_ms / 1000
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        from app.services.settlement import settle_transactions
+
+        while not self._stop.is_set():
+            batch = self._next_batch()
+            if not batch:
+                continue
+            ok = True
+            try:
+                with self.app.app_context():
+                    settle_transactions(ids=[transaction_id for transaction_id, _ in batch])
+            except Exception as e:
+                ok = False
+                self.app.logger.error(f"Queued processing failed for {len(batch)} transactions: {e}")
+            finished = time.perf_counter()
+            with self._lock:
+                self.batches += 1
+                self._batch_sizes.append(len(batch))
+                if ok:
+                    self.processed += len(batch)
+                    self._latencies.extend(finished - queued_at for _, queued_at in batch)
+                else:
+                    self.errors += len(batch)
+            for _ in batch:
+                self._queue.task_done()
+
+
+# Global instance
+processing_queue = ProcessingQueue()
@@ -0,0 +1,61 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class ScoreCache:
+    """
+    Bounded LRU cache of fraud scores keyed by the encoded feature tuple.
+
+    Entries expire after ttl seconds; the least recently used entry is
+    evicted once max_size is reached.
+    """
+
+    def __init__(self, max_size=10_000, ttl=300.0, clock=time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Cached score for key, or None on a miss or expired entry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                score, expires_at = entry
+                if expires_at > self.clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return score
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, score):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (score, self.clock() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,78 @@
+import json
+from datetime import datetime
+from decimal import Decimal
+from flask import current_app
+from app.models.transactions import Transaction
+
+# Keys of Transaction.to_dict, in order; also the valid ?fields= names
+TRANSACTION_FIELDS = [
+    'id', 'amount', 'sender_upi_id', 'receiver_upi_id', 'sender_name', 'receiver_name',
+    'sender_phone', 'receiver_phone', 'timestamp', 'status', 'fraud_flag', 'fraud_score'
+]
+
+
+def parse_fields(value):
+    """
+    Parse a ?fields=a,b,c sparse fieldset.
+
+    Returns:
+        list of field names in to_dict order (all of them when value is empty)
+
+    Raises:
+        ValueError: on an unknown field
+    """
+    if not value:
+        return list(TRANSACTION_FIELDS)
+    requested = {name.strip() for name in value.split(',') if name.strip()}
+    unknown = requested.difference(TRANSACTION_FIELDS)
+    if unknown:
+        raise ValueError(f'Unknown fields: {", ".join(sorted(unknown))}. '
+                         f'Valid fields: {", ".join(TRANSACTION_FIELDS)}')
+    return [name for name in TRANSACTION_FIELDS if name in requested]
+
+
+def columns(fields, *extra):
+    """Table columns for fields, followed by any extra names not already included."""
+    names = list(fields) + [name for name in extra if name not in fields]
+    return [Transaction.__table__.c[name] for name in names]
+
+
+def project(rows, fields):
+    """
+    Dicts of the first len(fields) values of each plain column row.
+
+    Values stay as the driver returned them (Decimal, datetime);
+    encode_default converts them while encoding.
+    """
+    return [dict(zip(fields, row)) for row in rows]
+
+
+def encode_default(value):
+    """json `default` hook matching Transaction.to_dict: Decimal -> float, datetime -> ISO 8601."""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def dumps(obj, **kwargs):
+    """json.dumps with encode_default; stays on the C encoder (no per-row Python conversion)."""
+    return json.dumps(obj, default=encode_default, **kwargs)
+
+
+def json_response(obj, status=200):
+    """
+    Like jsonify, but for payloads holding raw Decimal/datetime column values.
+
+    Uses the app's JSON settings (key sorting, ASCII escaping, compact vs
+    indented output), so the bytes are identical to jsonify of the to_dict
+    equivalent.
+    """
+    provider = current_app.json
+    if (provider.compact is None and current_app.debug) or provider.compact is False:
+        layout = {'indent': 2}
+    else:
+        layout = {'separators': (',', ':')}
+    body = dumps(obj, ensure_ascii=provider.ensure_ascii, sort_keys=provider.sort_keys, **layout)
+    return current_app.response_class(f'{body}\n', status=status, mimetype=provider.mimetype)
@@ -0,0 +1,94 @@
+import random
+from app.config.database import db
+from app.models.transactions import Transaction
+from app.services.transitions import can_transition, transition_many
+
+SUCCESS_RATE = 0.8  # 80% simulated payment success rate
+
+
+def settle_transactions(ids=None, limit=None):
+    """
+    Process pending transactions in one pass.
+
+    Loads the batch in one query, runs the success simulation per row, scores
+    every success attempt with a single fraud model call and writes all
+    outcomes in one database transaction with transitions.transition_many,
+    so each row's UPDATE is guarded by status = 'pending' like any other
+    transition.
+
+    Args:
+        ids: transaction IDs to process, or
+        limit: process up to this many of the oldest pending transactions
+
+    Returns:
+        list of per-ID results, in request order (oldest first for limit);
+        'outcome' is success, failed, fraud, skipped or not_found
+
+    Raises:
+        Exception: if the UPDATE fails (the session is rolled back first)
+    """
+    # Load the whole batch in one query, locking the rows for this transaction
+    if ids is not None:
+        ids = list(dict.fromkeys(ids))
+        query = Transaction.query.filter(Transaction.id.in_(ids)).with_for_update()
+    else:
+        query = (Transaction.query
+                 .filter(Transaction.status == 'pending')
+                 .order_by(Transaction.timestamp.asc())
+                 .limit(limit)
+                 .with_for_update(skip_locked=True))
+    found = {t.id: t for t in query.all()}
+    order = ids if ids is not None else list(found)
+
+    pending = [found[i] for i in order if i in found and can_transition(found[i].status, 'success')]
+    attempts = [t for t in pending if random.random() < SUCCESS_RATE]
+
+    # Score every success attempt with a single model call
+    from app.services.fraud_service import fraud_service
+    fraud_results = dict(zip(
+        (t.id for t in attempts),
+        fraud_service.check_transactions_fraud(attempts)
+    ))
+
+    updates, outcomes = [], {}
+    for transaction in pending:
+        fraud_result = fraud_results.get(transaction.id)
+        if fraud_result is None:
+            status, outcome = 'failed', 'failed'
+            fraud_flag, fraud_score = transaction.fraud_flag, transaction.fraud_score
+        else:
+            fraud_flag, fraud_score = fraud_result['is_suspicious'], fraud_result['score']
+            # Suspicious transactions are marked as failed due to fraud
+            status = 'failed' if fraud_flag else 'success'
+            outcome = 'fraud' if fraud_flag else 'success'
+        row = {'id': transaction.id, 'status': status, 'fraud_flag': fraud_flag, 'fraud_score': fraud_score}
+        updates.append(dict(row, timestamp=transaction.timestamp))
+        outcomes[transaction.id] = dict(row, outcome=outcome)
+
+    results = []
+    for transaction_id in order:
+        if transaction_id in outcomes:
+            results.append(outcomes[transaction_id])
+        elif transaction_id in found:
+            results.append(_skipped(transaction_id, found[transaction_id].status))
+        else:
+            results.append({'id': transaction_id, 'outcome': 'not_found'})
+
+    # Guarded bulk UPDATE (executemany per target status) in one transaction
+    try:
+        conflicts = transition_many(updates) if updates else {}
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    # A row that moved on between the read and the UPDATE wasn't written
+    if conflicts:
+        results = [_skipped(r['id'], conflicts[r['id']]) if r['id'] in conflicts else r for r in results]
+    return results
+
+
+def _skipped(transaction_id, status):
+    if status is None:
+        return {'id': transaction_id, 'outcome': 'not_found'}
+    return {'id': transaction_id, 'outcome': 'skipped', 'error': f'Transaction is already {status}'}
@@ -0,0 +1,70 @@
+import threading
+import time
+from collections import OrderedDict
+from app.utils.metrics import TRANSACTION_CACHE_LOOKUPS
+
+
+class TransactionCache:
+    """
+    Bounded LRU of serialized GET /<id> responses for terminal transactions.
+
+    A transaction in 'success' or 'failed' can never change again, so its
+    JSON body and ETag are cached and GET /<id> answers from memory.
+    Pending transactions are never stored: they must be read from the
+    database on every request.
+
+    Terminal rows can still disappear: `flask maintain-transactions`
+    archives old settled ones to CSV and deletes them, from a separate
+    process that can't reach the workers' copies. Entries therefore expire
+    after ttl seconds, after which an archived ID answers 404 like any
+    other missing one.
+    """
+
+    def __init__(self, max_size=10_000, ttl=3600.0, clock=time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.max_size = app.config.get("TERMINAL_CACHE_SIZE", self.max_size)
+        self.ttl = app.config.get("TERMINAL_CACHE_TTL", self.ttl)
+        self.clear()
+
+    def get(self, transaction_id):
+        """(body, etag) for a cached transaction, or None on a miss or expired entry."""
+        with self._lock:
+            entry = self._entries.get(transaction_id)
+            if entry is not None and entry[2] <= self.clock():
+                del self._entries[transaction_id]
+                entry = None
+            if entry is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(transaction_id)
+                self.hits += 1
+        TRANSACTION_CACHE_LOOKUPS.labels('miss' if entry is None else 'hit').inc()
+        return None if entry is None else entry[:2]
+
+    def put(self, transaction_id, body, etag):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[transaction_id] = (body, etag, self.clock() + self.ttl)
+            self._entries.move_to_end(transaction_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {'size': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+# Global instance
+transaction_cache = TransactionCache()
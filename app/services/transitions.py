@@ -0,0 +1,220 @@
+"""
+Transaction status state machine.
+
+Every change of status is a single conditional statement:
+
+    UPDATE transactions SET status = :target, fraud_flag = ..., fraud_score = ...
+    WHERE id = :id AND status IN (<statuses allowed to move to target>)
+    RETURNING *
+
+The check and the write happen atomically in the database, so two
+concurrent requests for the same transaction can't both pass the check:
+the second one matches no row and gets TransitionConflict.
+"""
+from sqlalchemy import bindparam, or_, select, update
+from app.config.database import db
+from app.models.transactions import TERMINAL_STATUSES, Transaction, TransactionStatus
+from app.services.partitions import by_id, has_id_lookup
+from app.services.serialization import TRANSACTION_FIELDS, columns
+
+STATUSES = tuple(status.value for status in TransactionStatus)
+
+# Statuses each status may move to. Fraud results for a transaction that
+# stays pending are written with update_pending, not a self-transition.
+TRANSITIONS = {
+    TransactionStatus.PENDING.value: frozenset(TERMINAL_STATUSES),
+    **{status: frozenset() for status in TERMINAL_STATUSES},
+}
+
+
+class TransitionError(Exception):
+    pass
+
+
+class TransactionNotFound(TransitionError):
+    def __init__(self, transaction_id):
+        super().__init__(f'Transaction {transaction_id} not found')
+        self.transaction_id = transaction_id
+
+
+class TransitionConflict(TransitionError):
+    """The transaction's current status doesn't allow the requested one."""
+
+    def __init__(self, transaction_id, current, target):
+        super().__init__(f'Cannot change status from {current} to {target}')
+        self.transaction_id = transaction_id
+        self.current = current
+        self.target = target
+
+
+def can_transition(current, target):
+    return target in TRANSITIONS.get(current, ())
+
+
+def sources(target):
+    """Statuses from which target can be reached."""
+    return [status for status, targets in TRANSITIONS.items() if target in targets]
+
+
+def current_status(transaction_id):
+    """Status of a transaction, or None if it doesn't exist."""
+    return db.session.execute(
+        select(Transaction.status).where(*by_id(transaction_id))
+    ).scalar()
+
+
+def load_for_transition(transaction_id, target):
+    """
+    Read a transaction that can currently move to target (e.g. to score it first).
+
+    The result is only a snapshot; transition() re-checks the status when
+    it writes.
+
+    Returns:
+        Row with the TRANSACTION_FIELDS columns
+
+    Raises:
+        TransactionNotFound, TransitionConflict
+    """
+    row = _load(transaction_id)
+    if not can_transition(row.status, target):
+        raise TransitionConflict(transaction_id, row.status, target)
+    return row
+
+
+def load_pending(transaction_id):
+    """
+    Read a transaction that is still pending.
+
+    Raises:
+        TransactionNotFound, TransitionConflict (target 'pending')
+    """
+    row = _load(transaction_id)
+    if row.status != TransactionStatus.PENDING.value:
+        raise TransitionConflict(transaction_id, row.status, TransactionStatus.PENDING.value)
+    return row
+
+
+def _load(transaction_id):
+    row = db.session.execute(
+        select(*columns(TRANSACTION_FIELDS)).where(*by_id(transaction_id))
+    ).first()
+    if row is None:
+        raise TransactionNotFound(transaction_id)
+    return row
+
+
+def transition(transaction_id, target, timestamp=None, **values):
+    """
+    Move a transaction to target in one conditional UPDATE ... RETURNING and commit.
+
+    Args:
+        transaction_id: the transaction to update
+        target: the new status
+        timestamp: the transaction's timestamp, when the caller has read it
+            (e.g. from load_for_transition); see partitions.by_id
+        **values: other columns to write in the same statement
+            (fraud_flag, fraud_score)
+
+    Returns:
+        the updated Row, with the TRANSACTION_FIELDS columns
+
+    Raises:
+        ValueError: if target isn't a status
+        TransactionNotFound: if there's no such transaction
+        TransitionConflict: if its status (possibly just changed by a
+            concurrent request) doesn't allow target
+        Exception: if the UPDATE fails (the session is rolled back first)
+    """
+    if target not in TRANSITIONS:
+        raise ValueError(f'Invalid status: {target}')
+    return _conditional_update(transaction_id, sources(target), target, dict(values, status=target), timestamp)
+
+
+def update_pending(transaction_id, timestamp=None, **values):
+    """
+    Write columns (e.g. fraud results) on a transaction that is still pending.
+
+    Same conditional UPDATE ... RETURNING as transition(), without changing
+    the status.
+
+    Raises:
+        TransactionNotFound, TransitionConflict (target 'pending')
+    """
+    pending = TransactionStatus.PENDING.value
+    return _conditional_update(transaction_id, [pending], pending, values, timestamp)
+
+
+def transition_many(updates):
+    """
+    Apply many transitions with one guarded executemany per target status.
+
+    Each row only matches while its transaction can still move to its
+    status, exactly like transition(). Does not commit, so a caller can
+    write a whole batch in one database transaction.
+
+    Args:
+        updates: dicts with id, status and the other columns to write,
+            plus optionally timestamp, which only helps find the row (see
+            partitions.by_id) and is not written; rows with the same status
+            must have the same keys
+
+    Returns:
+        {id: current status} for the rows that matched nothing because the
+        transaction had already moved on
+
+    Raises:
+        ValueError: if a status isn't one
+    """
+    table = Transaction.__table__
+    by_target = {}
+    for row in updates:
+        if row['status'] not in TRANSITIONS:
+            raise ValueError(f'Invalid status: {row["status"]}')
+        by_target.setdefault(row['status'], []).append(row)
+
+    conflicts = {}
+    for target, rows in by_target.items():
+        known = has_id_lookup() and all('timestamp' in row for row in rows)
+        # executemany can't expand IN lists, hence the OR of equalities
+        statement = update(table).where(*by_id(bindparam('_id'), bindparam('_timestamp') if known else None),
+                                        or_(*(table.c.status == status for status in sources(target))))
+        params = []
+        for row in rows:
+            values = {k: v for k, v in row.items() if k not in ('id', 'timestamp')}
+            values['_id'] = row['id']
+            if known:
+                values['_timestamp'] = row['timestamp']
+            params.append(values)
+        result = db.session.execute(statement, params)
+        if result.supports_sane_multi_rowcount() and result.rowcount == len(rows):
+            continue
+        # Some rows lost a race (or the driver can't tell): find them with one read
+        current = dict(db.session.execute(
+            select(table.c.id, table.c.status).where(table.c.id.in_([row['id'] for row in rows]))
+        ).all())
+        conflicts.update({row['id']: current.get(row['id']) for row in rows if current.get(row['id']) != target})
+    return conflicts
+
+
+def _conditional_update(transaction_id, allowed, target, values, timestamp=None):
+    table = Transaction.__table__
+    statement = (update(table)
+                 .where(*by_id(transaction_id, timestamp), table.c.status.in_(allowed))
+                 .values(**values)
+                 .returning(*columns(TRANSACTION_FIELDS)))
+    try:
+        row = db.session.execute(statement).first()
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    if row is not None:
+        return row
+    # Nothing matched: tell a missing transaction from one in the wrong state.
+    # This extra read only happens on the failure path.
+    current = current_status(transaction_id)
+    if current is None:
+        raise TransactionNotFound(transaction_id)
+    raise TransitionConflict(transaction_id, current, target)
@@ -0,0 +1,244 @@
+import threading
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta
+from sqlalchemy import case, distinct, func, select
+from app.config.database import db
+from app.models.transactions import Transaction
+from models.fraud_detection.velocity import SIDES, WINDOWS
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def to_seconds(timestamp: datetime) -> int:
+    """Naive timestamp as whole seconds, matching velocity.timestamp_seconds."""
+    return int((timestamp - EPOCH).total_seconds())
+
+
+class _KeyEvents:
+    """
+    One key's events, oldest first, shared by all of its windows.
+
+    Each window keeps only the index of its oldest event plus a running
+    amount sum and counterparty counter, so an event is stored once
+    however many windows it is in.
+    """
+
+    __slots__ = ('events', 'heads', 'totals', 'counterparties')
+
+    def __init__(self, n_windows):
+        self.events = []  # (ts, amount, other, transaction_id)
+        self.heads = [0] * n_windows
+        self.totals = [0.0] * n_windows
+        self.counterparties = [Counter() for _ in range(n_windows)]
+
+    def add(self, ts, amount, other, transaction_id, spans):
+        """Expire each window as of ts, add the event and return (count, amount, distinct) per window."""
+        events = self.events
+        stats = []
+        for w, span in enumerate(spans):
+            head, total, counterparties = self.heads[w], self.totals[w], self.counterparties[w]
+            while head < len(events) and events[head][0] <= ts - span:
+                _, old_amount, old_other, _ = events[head]
+                total -= old_amount
+                counterparties[old_other] -= 1
+                if not counterparties[old_other]:
+                    del counterparties[old_other]
+                head += 1
+            if head == len(events):
+                total = 0.0
+            total += amount
+            counterparties[other] += 1
+            self.heads[w], self.totals[w] = head, total
+            stats.append((len(events) + 1 - head, total, len(counterparties)))
+        events.append((ts, amount, other, transaction_id))
+
+        # The longest window starts earliest; drop what it has expired once that's half the buffer
+        oldest = self.heads[-1]
+        if oldest > 32 and oldest * 2 > len(events):
+            del events[:oldest]
+            self.heads = [head - oldest for head in self.heads]
+        return stats
+
+    def live(self):
+        """Events still inside the longest window."""
+        return self.events[self.heads[-1]:]
+
+
+class VelocityStore:
+    """
+    Online sender/receiver velocity features over rolling windows.
+
+    Per UPI ID and window the store keeps the events still inside the window
+    plus a running count, amount sum and counterparty counter, so recording a
+    transaction is amortized O(1). Features are snapshotted when a
+    transaction is recorded, which gives the same values as
+    models.fraud_detection.velocity.add_velocity_features computes offline.
+
+    record() assumes events arrive in time order, so only new transactions
+    (on create and bulk insert) are recorded. Scoring reads the snapshot, or
+    features_at() when there is none, and never changes the windows.
+
+    The store is per process; it is rebuilt from the database on first use.
+    Each worker only records the transactions created through it, so with
+    more than one worker use DatabaseVelocity instead (VELOCITY_SOURCE=db,
+    which gunicorn.conf.py sets): otherwise the online counts cover about
+    1/N of the traffic and run below the features the model was trained on.
+    """
+
+    def __init__(self, windows=WINDOWS, max_snapshots=100_000, sweep_every=10_000):
+        self.windows = windows
+        self.max_snapshots = max_snapshots
+        self.sweep_every = sweep_every
+        self.loaded = False
+        self._keys = {side: {} for side, _, _ in SIDES}
+        self._snapshots = OrderedDict()
+        self._latest = 0
+        self._recorded = 0
+        self._lock = threading.Lock()
+
+    def record(self, transaction_id, sender, receiver, amount, timestamp):
+        """
+        Add a transaction and return its feature snapshot.
+
+        Recording an ID that is already known returns the stored snapshot.
+        """
+        with self._lock:
+            snapshot = self._snapshots.get(transaction_id)
+            if snapshot is not None:
+                self._snapshots.move_to_end(transaction_id)
+                return snapshot
+
+            ts = to_seconds(timestamp)
+            self._latest = max(self._latest, ts)
+            snapshot = {}
+            spans = list(self.windows.values())
+            for side, key, other in (('Sender', sender, receiver), ('Receiver', receiver, sender)):
+                events = self._keys[side].get(key)
+                if events is None:
+                    events = self._keys[side][key] = _KeyEvents(len(spans))
+                stats = events.add(ts, float(amount), other, transaction_id, spans)
+                for name, (count, total, distinct) in zip(self.windows, stats):
+                    snapshot[f'{side}Count{name}'] = float(count)
+                    snapshot[f'{side}Amount{name}'] = total
+                    snapshot[f'{side}Distinct{name}'] = float(distinct)
+
+            self._snapshots[transaction_id] = snapshot
+            if len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+
+            self._recorded += 1
+            if self._recorded % self.sweep_every == 0:
+                self._sweep()
+            return snapshot
+
+    def snapshot(self, transaction_id):
+        """Features stored when transaction_id was recorded, or None."""
+        with self._lock:
+            return self._snapshots.get(transaction_id)
+
+    def features_at(self, transaction_id, sender, receiver, amount, timestamp):
+        """
+        Features as of timestamp for a transaction without a snapshot, read-only.
+
+        For transactions recorded by another worker, or whose snapshot was
+        evicted. Counts the events each key still holds in its longest
+        window, at or before timestamp, plus the transaction itself. A key
+        keeps events back to one longest span before its latest event, so
+        windows reaching past that (older transactions) are undercounts,
+        and ties at timestamp count even if they came later.
+        """
+        ts = to_seconds(timestamp)
+        features = {}
+        with self._lock:
+            for side, key, other in (('Sender', sender, receiver), ('Receiver', receiver, sender)):
+                events = self._keys[side].get(key)
+                events = events.live() if events else ()
+                for name, span in self.windows.items():
+                    count, total, counterparties = 1, float(amount), {other}
+                    for event_ts, event_amount, event_other, event_id in events:
+                        if ts - span < event_ts <= ts and event_id != transaction_id:
+                            count += 1
+                            total += event_amount
+                            counterparties.add(event_other)
+                    features[f'{side}Count{name}'] = float(count)
+                    features[f'{side}Amount{name}'] = total
+                    features[f'{side}Distinct{name}'] = float(len(counterparties))
+        return features
+
+    def rebuild(self, rows):
+        """
+        Replace the store contents from (id, sender, receiver, amount, timestamp) rows.
+
+        Rows must be ordered by timestamp.
+        """
+        with self._lock:
+            self._keys = {side: {} for side, _, _ in SIDES}
+            self._snapshots.clear()
+            self._latest = 0
+        for row in rows:
+            self.record(*row)
+        self.loaded = True
+
+    def _sweep(self):
+        """Drop keys whose windows have all emptied (the last window is the longest)."""
+        longest = max(self.windows.values())
+        for keys in self._keys.values():
+            for key in [k for k, events in keys.items() if events.events[-1][0] <= self._latest - longest]:
+                del keys[key]
+
+
+class DatabaseVelocity:
+    """
+    Velocity features read from the transactions table when a transaction is scored.
+
+    Every worker sees every committed transaction, so unlike VelocityStore
+    the features don't depend on which worker created what. Each side is
+    one aggregate query on the (sender or receiver, timestamp, id) index,
+    bounded to the longest window before the transaction; as in
+    VelocityStore.features_at, ties at its timestamp count. Nothing is kept
+    in memory, so record() and rebuild() do nothing.
+    """
+
+    loaded = True
+
+    def __init__(self, windows=WINDOWS):
+        self.windows = windows
+
+    def record(self, transaction_id, sender, receiver, amount, timestamp):
+        return None
+
+    def snapshot(self, transaction_id):
+        return None
+
+    def rebuild(self, rows):
+        pass
+
+    def features_at(self, transaction_id, sender, receiver, amount, timestamp):
+        """Features as of timestamp, counting the transaction itself once whether or not it is stored."""
+        features = {}
+        for side, key, key_column, other, other_column in (
+            ('Sender', sender, Transaction.sender_upi_id, receiver, Transaction.receiver_upi_id),
+            ('Receiver', receiver, Transaction.receiver_upi_id, sender, Transaction.sender_upi_id),
+        ):
+            aggregates = []
+            for span in self.windows.values():
+                inside = Transaction.timestamp > timestamp - timedelta(seconds=span)
+                aggregates += [
+                    func.count(case((inside, 1))),
+                    func.sum(case((inside, Transaction.amount))),
+                    func.count(distinct(case((inside & (other_column != other), other_column)))),
+                ]
+            row = db.session.execute(
+                select(*aggregates).where(
+                    key_column == key,
+                    Transaction.timestamp > timestamp - timedelta(seconds=max(self.windows.values())),
+                    Transaction.timestamp <= timestamp,
+                    Transaction.id != transaction_id,
+                )
+            ).one()
+            for i, name in enumerate(self.windows):
+                count, total, others = row[3 * i:3 * i + 3]
+                features[f'{side}Count{name}'] = float(count + 1)
+                features[f'{side}Amount{name}'] = float(amount) + float(total or 0)
+                features[f'{side}Distinct{name}'] = float(others + 1)
+        return features
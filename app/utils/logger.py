@@ -1,8 +1,11 @@
 import logging
 from flask import Flask
+from flask.logging import default_handler
 
 def init_logger(app: Flask) -> None:
     handler = logging.StreamHandler()
     formatter = logging.Formatter('[%(asctime)s] %(levelname)s: %(message)s')
     handler.setFormatter(formatter)
-    app.logger.addHandler(handler)
\ No newline at end of file
+    app.logger.removeHandler(default_handler)
+    app.logger.addHandler(handler)
+    app.logger.setLevel(app.config.get('LOG_LEVEL', 'INFO'))
\ No newline at end of file
@@ -0,0 +1,128 @@
+"""
+Prometheus metrics for the API, the database and the fraud model.
+
+Under gunicorn every worker is its own process. When PROMETHEUS_MULTIPROC_DIR
+is set (gunicorn.conf.py does this), each process writes its samples to
+files in that directory and /metrics merges them, so any worker can answer
+a scrape with totals for the whole server.
+"""
+import os
+import time
+from flask import Flask, g, has_request_context, request
+from prometheus_client import (CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram,
+                               REGISTRY, generate_latest, multiprocess)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (.001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', 'Time to build the response, per route.',
+    ['method', 'route', 'status'], buckets=LATENCY_BUCKETS)
+REQUEST_DB_QUERIES = Histogram(
+    'http_request_db_queries', 'SQL statements executed while handling a request.',
+    ['method', 'route'], buckets=QUERY_COUNT_BUCKETS)
+REQUEST_DB_SECONDS = Histogram(
+    'http_request_db_seconds', 'Time spent in SQL while handling a request.',
+    ['method', 'route'], buckets=LATENCY_BUCKETS)
+DB_QUERY_LATENCY = Histogram(
+    'db_query_duration_seconds', 'Latency of every SQL statement, in or out of a request.',
+    buckets=LATENCY_BUCKETS)
+
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    'db_pool_checkout_wait_seconds', 'Time spent waiting for a pooled connection.',
+    ['bind'], buckets=LATENCY_BUCKETS)
+DB_POOL_CHECKED_OUT = Gauge(
+    'db_pool_connections_in_use', 'Pooled connections currently checked out.',
+    ['bind'], multiprocess_mode='livesum')
+DB_POOL_CAPACITY = Gauge(
+    'db_pool_capacity', 'Connections the pool may open (pool size + max overflow).',
+    ['bind'], multiprocess_mode='livesum')
+DB_POOL_TIMEOUTS = Counter(
+    'db_pool_checkout_timeouts', 'Checkouts that gave up after DB_POOL_TIMEOUT.', ['bind'])
+
+INFERENCE_LATENCY = Histogram(
+    'fraud_inference_duration_seconds', 'Fraud model call latency.',
+    ['engine'], buckets=LATENCY_BUCKETS)
+INFERENCE_BATCH_SIZE = Histogram(
+    'fraud_inference_batch_size', 'Rows scored per fraud model call.',
+    ['engine'], buckets=BATCH_SIZE_BUCKETS)
+FRAUD_DECISIONS = Counter(
+    'fraud_decisions', 'Fraud decisions by the path that produced them and fallback reason (none if the path answered).',
+    ['path', 'fallback'])
+FRAUD_DECISION_LATENCY = Histogram(
+    'fraud_decision_duration_seconds', 'Time the check_transactions_fraud call took, per decision.',
+    ['path', 'fallback'], buckets=LATENCY_BUCKETS)
+SCORE_CACHE_LOOKUPS = Counter(
+    'fraud_score_cache_lookups', 'Score cache lookups by result.', ['result'])
+MODEL_LOAD_SECONDS = Gauge(
+    'fraud_model_load_seconds', 'Time the last fraud model load took.', multiprocess_mode='max')
+MODEL_LOADS = Counter('fraud_model_loads', 'Fraud model (re)loads.')
+TRANSACTION_CACHE_LOOKUPS = Counter(
+    'transaction_cache_lookups', 'Terminal-state GET /<id> cache lookups by result.', ['result'])
+
+STARTUP_PHASE_SECONDS = Gauge(
+    'app_startup_phase_seconds', 'Time spent in each create_app phase.', ['phase'], multiprocess_mode='max')
+WORKER_BOOT_SECONDS = Histogram(
+    'gunicorn_worker_boot_seconds', 'Fork to ready time of gunicorn workers.',
+    buckets=LATENCY_BUCKETS)
+
+
+def init_metrics(app: Flask) -> None:
+    """Time every request and count the SQL it runs."""
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+
+    @app.before_request
+    def start_timer():
+        g.metrics_started = time.perf_counter()
+        g.db_queries = 0
+        g.db_seconds = 0.0
+
+    @app.after_request
+    def observe_request(response):
+        started = g.pop('metrics_started', None)
+        if started is None:
+            return response
+        # The URL rule, not the path, so /<transaction_id> stays one series
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        REQUEST_LATENCY.labels(request.method, route, response.status_code).observe(
+            time.perf_counter() - started)
+        REQUEST_DB_QUERIES.labels(request.method, route).observe(g.pop('db_queries', 0))
+        REQUEST_DB_SECONDS.labels(request.method, route).observe(g.pop('db_seconds', 0.0))
+        return response
+
+    _listen_to_engines()
+
+
+def _listen_to_engines():
+    # Registered on the Engine class so every engine (including ones
+    # created later) is covered, but only once per process
+    if event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        return
+    event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info['query_started'].pop()
+    DB_QUERY_LATENCY.observe(elapsed)
+    if has_request_context() and 'db_queries' in g:
+        g.db_queries += 1
+        g.db_seconds += elapsed
+
+
+def render_metrics():
+    """Metrics in Prometheus text format, merged across workers in multiprocess mode."""
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
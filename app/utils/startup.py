@@ -0,0 +1,44 @@
+import time
+from contextlib import contextmanager
+from flask import Flask
+
+
+class StartupTimer:
+    """Wall-clock time per start-up phase, reported once the app is built."""
+
+    def __init__(self):
+        self.phases = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def record(self, name: str, seconds: float):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    @property
+    def total(self) -> float:
+        return sum(self.phases.values())
+
+    def report(self) -> str:
+        phases = ', '.join(f'{name} {seconds:.2f}s' for name, seconds in self.phases.items())
+        return f'Startup took {self.total:.2f}s ({phases})'
+
+
+def report_startup(app: Flask, timer: StartupTimer) -> None:
+    """Log the phase breakdown, export it as metrics and warn when over STARTUP_BUDGET_SECONDS."""
+    from app.utils.metrics import STARTUP_PHASE_SECONDS
+
+    app.extensions['startup'] = timer
+    for name, seconds in timer.phases.items():
+        STARTUP_PHASE_SECONDS.labels(name).set(seconds)
+
+    budget = app.config.get('STARTUP_BUDGET_SECONDS')
+    if budget and timer.total > budget:
+        app.logger.warning(f'{timer.report()}, over the {budget:.1f}s budget')
+    else:
+        app.logger.info(timer.report())
@@ -0,0 +1,79 @@
+"""
+Run the hot-path microbenchmarks and compare them with the stored baseline.
+
+    python -m benchmarks                   # everything except full-only cases
+    python -m benchmarks --full            # include preprocess_data[1M]
+    python -m benchmarks -k preprocess     # cases whose name contains "preprocess"
+    python -m benchmarks --update-baseline # record this run as the new baseline
+
+Exits with status 1 when any case is slower than its baseline by more
+than its threshold. A baseline recorded on another host only warns:
+re-record it on the machine that runs the gate.
+"""
+import argparse
+import json
+import os
+import sys
+from benchmarks import cases
+from benchmarks.harness import (REGISTRY, calibrate, compare, format_report, host, load_baseline, measure,
+                               save_baseline)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('-k', dest='pattern', default=None, help='Only run cases whose name contains this.')
+    parser.add_argument('--full', action='store_true', help='Include the slow full-only cases.')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline JSON file.')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='Write this run into the baseline instead of failing on regressions.')
+    parser.add_argument('--json', dest='json_path', default=None, help='Also write the comparison as JSON.')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    selected = [b for b in REGISTRY
+                if (args.full or not b.full_only) and (args.pattern is None or args.pattern in b.name)]
+
+    # Calibrated before and after: the faster reading is the least disturbed
+    calibration = calibrate()
+    ctx = cases.BenchContext()
+    results = {}
+    try:
+        for bench in selected:
+            fn = bench.setup(ctx)
+            results[bench.name] = measure(fn, bench.repeat, bench.number, bench.warmup)
+            print(f'  {bench.name}: done', file=sys.stderr)
+    finally:
+        ctx.close()
+    calibration = min(calibration, calibrate())
+
+    baseline = load_baseline(args.baseline)
+    rows = compare(results, baseline, calibration, host())
+    scale = calibration / baseline['calibration_s'] if baseline else 1.0
+    print(format_report(rows, scale))
+
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump({'calibration_s': calibration, 'results': rows}, f, indent=2)
+
+    if args.update_baseline:
+        save_baseline(args.baseline, results, calibration, baseline)
+        print(f'Baseline written to {args.baseline}')
+        return 0
+
+    slower = [row['name'] for row in rows if row['verdict'] == 'slower']
+    if slower:
+        print(f"\nWARNING: slower than a baseline recorded on {baseline['host']}: {', '.join(slower)}",
+              file=sys.stderr)
+    regressions = [row['name'] for row in rows if row['verdict'] == 'REGRESSION']
+    if regressions:
+        print(f"\nPERFORMANCE REGRESSION: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,195 @@
+import contextlib
+import io
+import os
+import tempfile
+from datetime import datetime, timedelta
+import pandas as pd
+from app import create_app
+from app.config.database import db
+from app.config.envVars import Config
+from app.models.transactions import Transaction
+from app.services.fraud_service import fraud_service
+from app.services.graph_index import GraphIndex
+from app.services.score_cache import ScoreCache
+from app.services.velocity_store import VelocityStore
+from benchmarks.harness import benchmark
+from models.fraud_detection.predict import predict_new
+from models.fraud_detection.preprocess import preprocess_data
+from models.fraud_detection.train import train_model
+
+SOURCE_CSV = 'data/transactions.csv'
+LISTED_ROWS = 5000
+
+
+class BenchConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = "sqlite://"
+    AUTO_MIGRATE = False
+    PRELOAD_MODEL = False
+    PRELOAD_GRAPH = False
+    SCORE_CACHE_SIZE = 0  # every call goes to the model
+
+
+class BenchContext:
+    """Shared, lazily built inputs: an in-memory app, a trained model, scaled CSVs."""
+
+    def __init__(self):
+        self._tmp = tempfile.TemporaryDirectory(prefix='benchmarks-')
+        self._app_context = None
+        self._model_path = None
+        self._csvs = {}
+
+    @property
+    def app(self):
+        if self._app_context is None:
+            app = create_app(BenchConfig)
+            self._app_context = app.app_context()
+            self._app_context.push()
+            db.create_all()
+            db.session.add_all(sample_transactions(LISTED_ROWS))
+            db.session.commit()
+        return self._app_context.app
+
+    @property
+    def model_path(self):
+        if self._model_path is None:
+            path = self.path('model', 'fraud_model.joblib')
+            with contextlib.redirect_stdout(io.StringIO()):
+                train_model(SOURCE_CSV, path, cache_dir=None)
+            self._model_path = path
+        return self._model_path
+
+    def csv(self, rows):
+        """data/transactions.csv tiled out to `rows` rows, later copies shifted in time."""
+        if rows not in self._csvs:
+            source = pd.read_csv(SOURCE_CSV)
+            timestamps = pd.to_datetime(source['Timestamp'], format='%d-%m-%Y %H:%M')
+            span = timestamps.max() - timestamps.min() + pd.Timedelta(days=1)
+            copies = []
+            for copy in range(-(-rows // len(source))):
+                df = source.copy()
+                df['Transaction ID'] = df['Transaction ID'] + f'-{copy}'
+                df['Timestamp'] = (timestamps + copy * span).dt.strftime('%d-%m-%Y %H:%M')
+                copies.append(df)
+            path = self.path(f'transactions_{rows}.csv')
+            pd.concat(copies).head(rows).to_csv(path, index=False)
+            self._csvs[rows] = path
+        return self._csvs[rows]
+
+    def path(self, *parts):
+        """A path under the run's scratch directory."""
+        return os.path.join(self._tmp.name, *parts)
+
+    def close(self):
+        if self._app_context is not None:
+            db.session.remove()
+            self._app_context.pop()
+        self._tmp.cleanup()
+
+
+def sample_transactions(n):
+    start = datetime(2025, 1, 1)
+    return [
+        Transaction(
+            id=f'BENCH{i:011d}',
+            amount=100 + i % 9000,
+            sender_upi_id=f'sender{i % 500}@upi',
+            receiver_upi_id=f'receiver{i % 700}@upi',
+            sender_name='Sender',
+            receiver_name='Receiver',
+            sender_phone='9876543210',
+            receiver_phone='9876543211',
+            timestamp=start + timedelta(minutes=i),
+            status='pending',
+            fraud_flag=False,
+            fraud_score=None,
+        )
+        for i in range(n)
+    ]
+
+
+@benchmark('to_dict[1000]', repeat=15, number=10)
+def bench_to_dict(ctx):
+    transactions = sample_transactions(1000)
+    return lambda: [t.to_dict() for t in transactions]
+
+
+def _list_page(ctx, limit):
+    client = ctx.app.test_client()
+    url = f'/?limit={limit}'
+
+    def call():
+        response = client.get(url)
+        assert response.status_code == 200
+    return call
+
+
+@benchmark('GET /?limit=100', repeat=15, number=20)
+def bench_list_100(ctx):
+    return _list_page(ctx, 100)
+
+
+@benchmark('GET /?limit=1000', repeat=15, number=5)
+def bench_list_1000(ctx):
+    return _list_page(ctx, 1000)
+
+
+@benchmark('GET /?limit=1000&fields=id,amount,status', repeat=15, number=5)
+def bench_list_1000_sparse(ctx):
+    return _list_page(ctx, '1000&fields=id,amount,status')
+
+
+@benchmark('check_transaction_fraud', repeat=15, number=50)
+def bench_check_transaction_fraud(ctx):
+    ctx.app  # create_app configures fraud_service, so override after it
+    fraud_service.model_path = ctx.model_path
+    fraud_service.cache = ScoreCache(max_size=0)
+    fraud_service.velocity = VelocityStore()
+    fraud_service.velocity.loaded = True
+    fraud_service.graph = GraphIndex()
+    fraud_service.graph.loaded = True
+    transaction = sample_transactions(1)[0]
+    transaction.timestamp = datetime(2025, 1, 1, 12)  # midday, so no rule short-circuits the model
+    fraud_service.load_model()  # outside the scoring deadline
+
+    def call():
+        result = fraud_service.check_transaction_fraud(transaction)
+        # The service swallows errors; make sure the model actually ran
+        assert result['score'] is not None and not result['rules']
+    return call
+
+
+def _preprocess(ctx, rows):
+    path = ctx.csv(rows)
+    return lambda: preprocess_data(path)
+
+
+@benchmark('preprocess_data[10k]', repeat=5)
+def bench_preprocess_10k(ctx):
+    return _preprocess(ctx, 10_000)
+
+
+@benchmark('preprocess_data[100k]', repeat=3)
+def bench_preprocess_100k(ctx):
+    return _preprocess(ctx, 100_000)
+
+
+@benchmark('preprocess_data[1M]', repeat=1, full_only=True)
+def bench_preprocess_1m(ctx):
+    return _preprocess(ctx, 1_000_000)
+
+
+@benchmark('train_model[10k]', repeat=1, warmup=False)
+def bench_train_model(ctx):
+    path = ctx.path('bench-train', 'fraud_model.joblib')
+
+    def call():
+        with contextlib.redirect_stdout(io.StringIO()):
+            train_model(SOURCE_CSV, path, cache_dir=None)
+    return call
+
+
+@benchmark('predict_new[10k]', repeat=3)
+def bench_predict_new(ctx):
+    model_path = ctx.model_path
+    return lambda: predict_new(SOURCE_CSV, model_path)
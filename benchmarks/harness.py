@@ -0,0 +1,173 @@
+import json
+import platform
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import numpy as np
+
+DEFAULT_THRESHOLD = 1.3  # fail when a case is 30% slower than its (calibrated) baseline
+
+
+class Benchmark:
+    """
+    One registered case.
+
+    `setup(ctx)` builds the inputs and returns the zero-argument callable
+    that is timed; setup cost is never measured.
+    """
+
+    def __init__(self, name, setup, repeat=5, number=1, warmup=True, full_only=False):
+        self.name = name
+        self.setup = setup
+        self.repeat = repeat
+        self.number = number
+        self.warmup = warmup
+        self.full_only = full_only
+
+
+REGISTRY = []
+
+
+def benchmark(name, repeat=5, number=1, warmup=True, full_only=False):
+    """Register the decorated setup function as a benchmark case."""
+    def decorator(setup):
+        REGISTRY.append(Benchmark(name, setup, repeat, number, warmup, full_only))
+        return setup
+    return decorator
+
+
+def measure(fn, repeat=5, number=1, warmup=True):
+    """
+    Time fn and return per-call seconds as {'best', 'median'}.
+
+    Each of `repeat` samples runs fn `number` times. The best sample is
+    the least disturbed by noise and is what baselines compare against.
+    """
+    if warmup:
+        fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - started) / number)
+    return {'best': min(samples), 'median': float(np.median(samples))}
+
+
+def calibrate(repeat=20):
+    """
+    Seconds for a fixed workload on this machine, shaped like the cases.
+
+    It sorts a NumPy array and serializes a page of row objects the way
+    to_dict and the list endpoint do (attribute reads, isoformat, JSON),
+    so allocation-heavy cases scale with it as well as numeric ones.
+    Baselines store the value they were recorded with, so a run on a
+    faster or slower machine is compared after scaling by the ratio.
+    """
+    rng = np.random.default_rng(0)
+    values = rng.random(200_000)
+    start = datetime(2025, 1, 1)
+    rows = [SimpleNamespace(id=f'TXN{i:08d}', amount=float(i), status='pending',
+                            timestamp=start + timedelta(seconds=i))
+            for i in range(5_000)]
+
+    def workload():
+        np.sort(values)
+        json.dumps([{'id': row.id, 'amount': row.amount, 'status': row.status,
+                     'timestamp': row.timestamp.isoformat()} for row in rows])
+
+    return measure(workload, repeat=repeat)['best']
+
+
+def host():
+    return platform.node()
+
+
+def load_baseline(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_baseline(path, results, calibration, previous=None):
+    """
+    Write results into the baseline, keeping per-case thresholds from previous.
+
+    New timings are scaled to the previous baseline's calibration, so a
+    partial update (-k) stays comparable with the cases it didn't rerun.
+    """
+    previous = previous or {}
+    old_cases = previous.get('benchmarks', {})
+    reference = previous.get('calibration_s', calibration)
+    cases = dict(old_cases)
+    for name, timing in results.items():
+        entry = {'seconds': timing['best'] * reference / calibration}
+        if 'threshold' in old_cases.get(name, {}):
+            entry['threshold'] = old_cases[name]['threshold']
+        cases[name] = entry
+
+    baseline = {
+        'calibration_s': reference,
+        'host': host(),
+        'machine': f'{platform.system()} {platform.machine()}, Python {platform.python_version()}',
+        'default_threshold': previous.get('default_threshold', DEFAULT_THRESHOLD),
+        'benchmarks': dict(sorted(cases.items())),
+    }
+    with open(path, 'w') as f:
+        json.dump(baseline, f, indent=2)
+        f.write('\n')
+
+
+def compare(results, baseline, calibration, current_host=None):
+    """
+    Check results against baseline.
+
+    Calibration only approximates how each case scales between machines,
+    so a baseline recorded on another host can't fail a run: its
+    regressions are reported as 'slower' instead.
+
+    Returns:
+        list of {'name', 'seconds', 'expected', 'ratio', 'threshold', 'verdict'}
+        where verdict is 'ok', 'REGRESSION', 'slower', 'faster' or 'new'
+    """
+    cases = baseline.get('benchmarks', {}) if baseline else {}
+    default = baseline.get('default_threshold', DEFAULT_THRESHOLD) if baseline else DEFAULT_THRESHOLD
+    scale = calibration / baseline['calibration_s'] if baseline else 1.0
+    same_host = not baseline or baseline.get('host', current_host) == current_host
+
+    rows = []
+    for name, timing in results.items():
+        entry = cases.get(name)
+        row = {'name': name, 'seconds': timing['best'], 'expected': None, 'ratio': None,
+               'threshold': None, 'verdict': 'new'}
+        if entry is not None:
+            threshold = entry.get('threshold', default)
+            expected = entry['seconds'] * scale
+            ratio = timing['best'] / expected
+            if ratio > threshold:
+                verdict = 'REGRESSION' if same_host else 'slower'
+            else:
+                verdict = 'faster' if ratio < 1 / threshold else 'ok'
+            row.update(expected=expected, ratio=ratio, threshold=threshold, verdict=verdict)
+        rows.append(row)
+    return rows
+
+
+def format_seconds(seconds):
+    if seconds is None:
+        return '-'
+    for unit, factor in (('s', 1), ('ms', 1e3), ('us', 1e6)):
+        if seconds * factor >= 1 or unit == 'us':
+            return f'{seconds * factor:.2f}{unit}'
+
+
+def format_report(rows, scale):
+    lines = [f'(baseline scaled by {scale:.2f} for this machine)',
+             f"{'benchmark':<44} {'time':>10} {'baseline':>10} {'ratio':>7}  verdict"]
+    for row in rows:
+        ratio = f"{row['ratio']:.2f}x" if row['ratio'] is not None else '-'
+        lines.append(f"{row['name']:<44} {format_seconds(row['seconds']):>10} "
+                     f"{format_seconds(row['expected']):>10} {ratio:>7}  {row['verdict']}")
+    return '\n'.join(lines)
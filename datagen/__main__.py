@@ -0,0 +1,63 @@
+"""
+Generate synthetic transactions in the data/transactions.csv layout.
+
+    python -m datagen --rows 1000000 -o data/synthetic_1m.csv
+    python -m datagen --rows 10000000 --seed 7 --fan-out 0.02 --night 0 -o big.csv.gz
+"""
+import argparse
+import sys
+import time
+from datetime import datetime
+from datagen.accounts import REFERENCE_CSV, Vocabulary
+from datagen.generator import FraudMix, TransactionGenerator
+
+
+def share(value):
+    value = float(value)
+    if not 0 <= value <= 1:
+        raise argparse.ArgumentTypeError('must be between 0 and 1')
+    return value
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m datagen', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, required=True, help='Transactions to generate.')
+    parser.add_argument('-o', '--output', default='-', help='CSV file to write; *.gz is compressed (default: stdout).')
+    parser.add_argument('--seed', type=int, default=0, help='Same seed and options, same file.')
+    parser.add_argument('--accounts', type=int, default=None, help='Distinct accounts (default: rows / 10).')
+    parser.add_argument('--start', type=datetime.fromisoformat, default=datetime(2025, 1, 1),
+                        help='First day (ISO date, default 2025-01-01).')
+    parser.add_argument('--days', type=int, default=365, help='Days covered, oldest first.')
+    parser.add_argument('--fan-out', type=share, default=FraudMix.fan_out,
+                        help='Share of rows in mule fan-out bursts (one sender, 5-12 receivers in an hour).')
+    parser.add_argument('--fan-in', type=share, default=FraudMix.fan_in,
+                        help='Share of rows in mule fan-in bursts (5-12 senders, one receiver in an hour).')
+    parser.add_argument('--night', type=share, default=FraudMix.night,
+                        help='Share of rows in night-time bursts (23:00-05:59).')
+    parser.add_argument('--high-amount', type=share, default=FraudMix.high_amount,
+                        help='Share of rows above 50,000.')
+    parser.add_argument('--chunk-size', type=int, default=500_000, help='Rows generated and written per step.')
+    parser.add_argument('--reference', default=REFERENCE_CSV, help='File whose names and places are reused.')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    mix = FraudMix(fan_out=args.fan_out, fan_in=args.fan_in, night=args.night, high_amount=args.high_amount)
+    started = time.perf_counter()
+    try:
+        generator = TransactionGenerator(args.rows, seed=args.seed, accounts=args.accounts, start=args.start,
+                                         days=args.days, mix=mix, chunk_size=args.chunk_size,
+                                         vocabulary=Vocabulary.from_csv(args.reference))
+    except ValueError as e:
+        sys.exit(f'error: {e}')
+    counts = generator.write(args.output)
+
+    elapsed = time.perf_counter() - started
+    patterns = ', '.join(f'{name} {n}' for name, n in counts.items())
+    print(f'{args.rows} rows in {elapsed:.1f}s ({patterns})', file=sys.stderr)
+    return counts
+
+
+if __name__ == '__main__':
+    main()
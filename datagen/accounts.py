@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+
+REFERENCE_CSV = 'data/transactions.csv'
+
+
+class Vocabulary:
+    """First names, surnames and (state, city) pairs taken from a reference file."""
+
+    def __init__(self, first_names, last_names, places):
+        self.first_names = first_names
+        self.last_names = last_names
+        self.places = places
+
+    @classmethod
+    def from_csv(cls, path=REFERENCE_CSV):
+        df = pd.read_csv(path, usecols=['Sender Name', 'Receiver Name', 'State', 'City'])
+        parts = pd.concat([df['Sender Name'], df['Receiver Name']]).str.split(' ', n=1, expand=True)
+        # Sorted, so the same seed gives the same accounts whatever the file order
+        first_names = sorted(parts[0].dropna().unique())
+        last_names = sorted(parts[1].dropna().unique())
+        places = sorted(set(zip(df['State'], df['City'])))
+        return cls(first_names, last_names, places)
+
+
+class Accounts:
+    """
+    A population of UPI accounts, stored as parallel arrays indexed by account number.
+
+    Each account has a name, a UPI ID (first eight letters of the name plus
+    the account number, e.g. nirjamit42@upi), a 10-digit mobile number, a
+    home state/city, and an activity weight. Senders and receivers are drawn
+    in proportion to that weight, so a few accounts are much busier than most.
+    """
+
+    def __init__(self, size, vocabulary, rng):
+        self.size = size
+        first = rng.integers(len(vocabulary.first_names), size=size)
+        last = rng.integers(len(vocabulary.last_names), size=size)
+        first_names = np.asarray(vocabulary.first_names, dtype=object)
+        last_names = np.asarray(vocabulary.last_names, dtype=object)
+        self.names = first_names[first] + ' ' + last_names[last]
+
+        # The UPI stem depends only on the (first, last) pair: build it per name part
+        first_lower = [name.lower() for name in vocabulary.first_names]
+        last_lower = [name.lower() for name in vocabulary.last_names]
+        self.upi_ids = np.asarray([f'{(first_lower[f] + last_lower[l])[:8]}{i}@upi'
+                                   for i, (f, l) in enumerate(zip(first.tolist(), last.tolist()))], dtype=object)
+
+        self.phones = rng.integers(6_000_000_000, 10_000_000_000, size=size).astype(str).astype(object)
+        place = rng.integers(len(vocabulary.places), size=size)
+        self.states = np.asarray([state for state, _ in vocabulary.places], dtype=object)[place]
+        self.cities = np.asarray([city for _, city in vocabulary.places], dtype=object)[place]
+
+        activity = rng.lognormal(0.0, 1.0, size=size)
+        self._cdf = np.cumsum(activity / activity.sum())
+
+    def sample(self, rng, n):
+        """n account numbers drawn by activity weight."""
+        return np.minimum(np.searchsorted(self._cdf, rng.random(n)), self.size - 1)
+
+    def columns(self, indices):
+        """(upi_ids, names, phones, states, cities) lists for the given account numbers."""
+        return tuple(column[indices].tolist()
+                     for column in (self.upi_ids, self.names, self.phones, self.states, self.cities))
@@ -0,0 +1,254 @@
+import gzip
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import numpy as np
+from datagen.accounts import Accounts, Vocabulary
+
+CSV_COLUMNS = [
+    'Transaction ID', 'Amount', 'Sender UPI ID', 'Receiver UPI ID',
+    'Sender Name', 'Receiver Name', 'Sender Phone', 'Receiver Phone',
+    'Timestamp', 'State', 'City'
+]
+TIMESTAMP_FORMAT = '%d-%m-%Y %H:%M'
+MAX_AMOUNT = 100_000  # the transactions table's amount_range constraint
+HIGH_AMOUNT = 50_000  # the high_amount rule fires above this
+
+# Relative share of ordinary traffic in each hour of the day
+HOUR_PROFILE = np.array([
+    0.2, 0.1, 0.1, 0.1, 0.2, 0.4, 0.8, 1.2, 1.6, 1.9, 2.0, 2.0,
+    2.0, 1.9, 1.8, 1.8, 1.8, 1.9, 2.0, 2.0, 1.8, 1.4, 0.9, 0.5,
+])
+NIGHT_HOURS = (23, 0, 1, 2, 3, 4, 5)  # the odd_hour rule's hours
+MINUTES_PER_DAY = 1440
+_CLOCK = np.arange(MINUTES_PER_DAY)
+# Minutes of the day a 30-minute night burst can start at and stay in the night
+NIGHT_BURST_STARTS = np.isin(_CLOCK // 60, NIGHT_HOURS) & ~((_CLOCK >= 5 * 60 + 30) & (_CLOCK < 6 * 60))
+
+
+@dataclass(frozen=True)
+class FraudMix:
+    """
+    Share of generated rows that belong to each fraud pattern.
+
+    fan_out: a mule sender pays 5-12 distinct receivers within an hour
+    fan_in: 5-12 distinct senders pay one mule receiver within an hour
+    night: a sender makes 3-8 payments within half an hour between 23:00 and 05:59
+    high_amount: single payments above 50,000
+    """
+    fan_out: float = 0.01
+    fan_in: float = 0.01
+    night: float = 0.02
+    high_amount: float = 0.01
+
+    def total(self):
+        return self.fan_out + self.fan_in + self.night + self.high_amount
+
+
+class Chunk:
+    """Parallel arrays for one chunk of rows (account numbers, amounts, minute offsets)."""
+
+    def __init__(self, senders, receivers, amounts, minutes, patterns):
+        self.senders = senders
+        self.receivers = receivers
+        self.amounts = amounts
+        self.minutes = minutes
+        self.patterns = patterns
+
+    @classmethod
+    def concat(cls, parts):
+        return cls(*(np.concatenate([getattr(p, name) for p in parts])
+                     for name in ('senders', 'receivers', 'amounts', 'minutes', 'patterns')))
+
+    def take(self, index):
+        return Chunk(self.senders[index], self.receivers[index], self.amounts[index],
+                     self.minutes[index], self.patterns[index])
+
+    def sorted(self):
+        return self.take(np.argsort(self.minutes, kind='stable'))
+
+    def __len__(self):
+        return len(self.minutes)
+
+
+PATTERNS = ('normal', 'fan_out', 'fan_in', 'night', 'high_amount')
+
+
+class TransactionGenerator:
+    """
+    Synthetic transactions in the data/transactions.csv layout.
+
+    Rows are built a chunk at a time with NumPy and written out before the
+    next chunk starts, so memory depends on chunk_size, not on rows. Chunk
+    k covers the k-th slice of the time range, and each chunk is sorted, so
+    the whole file is in timestamp order.
+
+    Every chunk has its own random stream, spawned from seed. The same seed
+    and arguments always produce the same file.
+    """
+
+    def __init__(self, rows, seed=0, accounts=None, start=datetime(2025, 1, 1), days=365,
+                 mix=FraudMix(), chunk_size=500_000, vocabulary=None):
+        if rows < 0 or days < 1 or chunk_size < 1:
+            raise ValueError('rows must be >= 0, days and chunk_size >= 1')
+        if not 0 <= mix.total() <= 1:
+            raise ValueError('fraud pattern shares must add up to at most 1')
+        self.rows = rows
+        self.start = start
+        self.days = days
+        self.mix = mix
+        self.chunk_size = chunk_size
+
+        self._chunks = max(1, -(-rows // chunk_size))
+        self._seeds = np.random.SeedSequence(seed).spawn(self._chunks + 1)
+        vocabulary = vocabulary or Vocabulary.from_csv()
+        size = accounts or max(1000, rows // 10)
+        self.accounts = Accounts(size, vocabulary, np.random.default_rng(self._seeds[0]))
+
+        # Every minute of the range formatted once; rows look theirs up
+        day_names = [(start + timedelta(days=d)).strftime('%d-%m-%Y') for d in range(days)]
+        clock = [f'{h:02d}:{m:02d}' for h in range(24) for m in range(60)]
+        self._timestamps = np.asarray([f'{day} {time}' for day in day_names for time in clock], dtype=object)
+        self._amounts = np.asarray([str(a) for a in range(MAX_AMOUNT + 1)], dtype=object)
+        self._id_width = max(6, len(str(rows)))
+        self.counts = dict.fromkeys(PATTERNS, 0)
+
+    def chunks(self):
+        """Yield each chunk as a sorted Chunk."""
+        minutes = len(self._timestamps)
+        for k in range(self._chunks):
+            size = min(self.chunk_size, self.rows - k * self.chunk_size)
+            lo, hi = k * minutes // self._chunks, (k + 1) * minutes // self._chunks
+            yield self._chunk(np.random.default_rng(self._seeds[k + 1]), size, lo, max(hi, lo + 1))
+
+    def lines(self):
+        """Yield CSV text, header first, one string per chunk."""
+        yield ','.join(CSV_COLUMNS) + '\n'
+        first_id = 1
+        for chunk in self.chunks():
+            if not len(chunk):
+                continue
+            ids = [f'TXN{i:0{self._id_width}d}' for i in range(first_id, first_id + len(chunk))]
+            first_id += len(chunk)
+            sender_upi, sender_name, sender_phone, state, city = self.accounts.columns(chunk.senders)
+            receiver_upi, receiver_name, receiver_phone, _, _ = self.accounts.columns(chunk.receivers)
+            columns = (ids, self._amounts[chunk.amounts].tolist(), sender_upi, receiver_upi,
+                       sender_name, receiver_name, sender_phone, receiver_phone,
+                       self._timestamps[chunk.minutes].tolist(), state, city)
+            yield '\n'.join(map(','.join, zip(*columns))) + '\n'
+
+    def write(self, path):
+        """Write the CSV to path ('-' for stdout, gzip-compressed for *.gz). Returns self.counts."""
+        if path == '-':
+            out = sys.stdout
+        elif path.endswith('.gz'):
+            out = gzip.open(path, 'wt', compresslevel=1, newline='')
+        else:
+            out = open(path, 'w', newline='', buffering=1 << 20)
+        try:
+            for text in self.lines():
+                out.write(text)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        return self.counts
+
+    # -- one chunk ---------------------------------------------------------
+
+    def _chunk(self, rng, size, lo, hi):
+        parts = [
+            self._bursts(rng, round(size * self.mix.fan_out), 'fan_out', lo, hi),
+            self._bursts(rng, round(size * self.mix.fan_in), 'fan_in', lo, hi),
+            self._bursts(rng, round(size * self.mix.night), 'night', lo, hi),
+            self._high_amounts(rng, round(size * self.mix.high_amount), lo, hi),
+        ]
+        # Bursts come in whole events, so ordinary traffic fills the rest exactly
+        fraud = Chunk.concat(parts)
+        if len(fraud) > size:  # only with tiny chunks
+            fraud = fraud.take(slice(0, size))
+        parts = [fraud, self._normal(rng, size - len(fraud), lo, hi)]
+
+        chunk = Chunk.concat(parts).sorted()
+        for code, name in enumerate(PATTERNS):
+            self.counts[name] += int(np.count_nonzero(chunk.patterns == code))
+        return chunk
+
+    def _pair(self, rng, n):
+        senders = self.accounts.sample(rng, n)
+        receivers = self.accounts.sample(rng, n)
+        # Nobody pays themselves
+        same = senders == receivers
+        receivers[same] = (receivers[same] + 1) % self.accounts.size
+        return senders, receivers
+
+    def _ordinary_amounts(self, rng, n):
+        # Mostly small payments with a long tail, kept under the high_amount rule
+        return np.clip(rng.lognormal(np.log(1500), 1.0, n), 1, HIGH_AMOUNT).astype(np.int64)
+
+    def _ordinary_minutes(self, rng, n, lo, hi):
+        """n minutes in [lo, hi) following HOUR_PROFILE (rejection sampling)."""
+        accept = HOUR_PROFILE / HOUR_PROFILE.max()
+        picked = []
+        while n > 0:
+            candidates = rng.integers(lo, hi, size=2 * n + 16)
+            keep = candidates[rng.random(len(candidates)) < accept[candidates % MINUTES_PER_DAY // 60]][:n]
+            picked.append(keep)
+            n -= len(keep)
+        return np.concatenate(picked) if picked else np.empty(0, dtype=np.int64)
+
+    def _night_minutes(self, rng, n, lo, hi):
+        """n minutes in [lo, hi) between 23:00 and 05:29, so a 30-minute burst stays in the night."""
+        picked = []
+        tries = 0
+        while n > 0 and tries < 100:
+            candidates = rng.integers(lo, hi, size=4 * n + 16)
+            keep = candidates[NIGHT_BURST_STARTS[candidates % MINUTES_PER_DAY]][:n]
+            picked.append(keep)
+            n -= len(keep)
+            tries += 1
+        if n > 0:
+            # The slice has no night minutes at all (a chunk shorter than a day)
+            picked.append(rng.integers(lo, hi, size=n))
+        return np.concatenate(picked) if picked else np.empty(0, dtype=np.int64)
+
+    def _normal(self, rng, n, lo, hi):
+        senders, receivers = self._pair(rng, n)
+        return Chunk(senders, receivers, self._ordinary_amounts(rng, n),
+                     self._ordinary_minutes(rng, n, lo, hi), np.zeros(n, dtype=np.int8))
+
+    def _high_amounts(self, rng, n, lo, hi):
+        senders, receivers = self._pair(rng, n)
+        return Chunk(senders, receivers, rng.integers(HIGH_AMOUNT + 1, MAX_AMOUNT + 1, n),
+                     self._ordinary_minutes(rng, n, lo, hi),
+                     np.full(n, PATTERNS.index('high_amount'), dtype=np.int8))
+
+    def _bursts(self, rng, n, pattern, lo, hi):
+        """About n rows of `pattern` bursts, in whole events."""
+        low, high, window = (3, 9, 30) if pattern == 'night' else (5, 13, 60)
+        events = round(n / ((low + high - 1) / 2))
+        if events == 0:
+            return Chunk(*(np.empty(0, dtype=np.int64) for _ in range(4)), np.empty(0, dtype=np.int8))
+        sizes = rng.integers(low, high, events)
+        total = int(sizes.sum())
+        event = np.repeat(np.arange(events), sizes)
+        position = np.arange(total) - np.repeat(np.cumsum(sizes) - sizes, sizes)  # index within its event
+
+        if pattern == 'night':
+            anchors = self._night_minutes(rng, events, lo, hi)
+        else:
+            anchors = rng.integers(lo, max(lo + 1, hi - window), events)
+        minutes = np.minimum(anchors[event] + rng.integers(0, window, total), hi - 1)
+
+        size = self.accounts.size
+        hub = self.accounts.sample(rng, events)[event]
+        # Consecutive account numbers from a random base, skipping the hub:
+        # distinct within an event
+        base = rng.integers(0, size - 1, events)[event]
+        spokes = (hub + 1 + (base + position) % (size - 1)) % size
+        if pattern == 'night':
+            # One account on a spree, paying anyone
+            spokes = (hub + 1 + rng.integers(0, size - 1, total)) % size
+        senders, receivers = (spokes, hub) if pattern == 'fan_in' else (hub, spokes)
+
+        return Chunk(senders, receivers, self._ordinary_amounts(rng, total), minutes,
+                     np.full(total, PATTERNS.index(pattern), dtype=np.int8))
@@ -0,0 +1,78 @@
+import gc
+import os
+import shutil
+import time
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 8080)}"
+workers = int(os.environ.get("WEB_CONCURRENCY", 4))
+worker_class = "sync"
+worker_connections = 1000
+timeout = 30
+keepalive = 2
+max_requests = 1000
+max_requests_jitter = 50
+
+# Build the app once in the master: create_app loads and warms the fraud model
+# there, and every worker (including ones respawned by max_requests) is forked
+# with it already in memory instead of unpickling its own copy
+preload_app = True
+
+# Workers write Prometheus samples here and /metrics merges them. This must be
+# set before the app (and prometheus_client) is imported, and is wiped on each
+# start so counters from a previous run don't leak in
+multiproc_dir = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/prometheus-multiproc")
+shutil.rmtree(multiproc_dir, ignore_errors=True)
+os.makedirs(multiproc_dir, exist_ok=True)
+
+# Build the graph index in the master too, once for all workers (the app
+# defaults to building it on first use, which suits CLI commands)
+os.environ.setdefault("PRELOAD_GRAPH", "true")
+
+# Each worker's in-memory velocity store would only see its own share of the
+# traffic, so with several workers the features are read from the table
+if workers > 1:
+    os.environ.setdefault("VELOCITY_SOURCE", "db")
+
+# Imported in the master so workers never pay for them, even when the model
+# itself isn't preloaded (PRELOAD_MODEL=false)
+HEAVY_IMPORTS = ("pandas", "sklearn.ensemble", "sklearn.tree")
+
+
+def when_ready(server):
+    from app.config.database import db
+
+    app = server.app.wsgi()
+    # Connections opened by the master (migrations) must not be shared with workers
+    with app.app_context():
+        db.engine.dispose()
+    for module in HEAVY_IMPORTS:
+        __import__(module)
+    # Keep the preloaded objects out of the GC so collections in workers
+    # don't touch (and copy) the shared pages
+    gc.freeze()
+
+
+def child_exit(server, worker):
+    # Drop the dead worker's live gauges; its counters stay in the totals
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def pre_fork(server, worker):
+    worker.forked_at = time.monotonic()
+
+
+def post_fork(server, worker):
+    # create_app skips migrations in workers (only relevant without preload_app)
+    os.environ["GUNICORN_WORKER"] = "1"
+
+
+def post_worker_init(worker):
+    from app.utils.metrics import WORKER_BOOT_SECONDS
+
+    elapsed = time.monotonic() - worker.forked_at
+    WORKER_BOOT_SECONDS.observe(elapsed)
+    budget = float(os.environ.get("WORKER_BOOT_BUDGET_SECONDS", 1))
+    log = worker.log.warning if elapsed > budget else worker.log.info
+    log(f"Worker {worker.pid} ready in {elapsed:.3f}s (budget {budget:.1f}s)")
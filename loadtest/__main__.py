@@ -0,0 +1,58 @@
+"""
+Replay data/transactions.csv against a running API and report latency.
+
+    python -m loadtest --url http://127.0.0.1:8080 --concurrency 32
+    python -m loadtest --rate 200 --duration 60 --total 100000 --json run.json
+"""
+import argparse
+import json
+from loadtest.runner import LoadRunner
+from loadtest.stats import format_report
+from loadtest.workload import Mix, replay
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m loadtest', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--url', default='http://127.0.0.1:8080', help='Base URL of the API.')
+    parser.add_argument('--csv', default='data/transactions.csv', help='Source rows for POST /.')
+    parser.add_argument('--total', type=int, default=None,
+                        help='Transactions to create; beyond the file length the rows are '
+                             'replayed with jittered amounts (default: one pass).')
+    parser.add_argument('--process-ratio', type=float, default=0.5,
+                        help='Share of created transactions sent to /<id>/process.')
+    parser.add_argument('--status-ratio', type=float, default=0.3,
+                        help='Share of the rest that get PUT /<id>/status.')
+    parser.add_argument('--concurrency', type=int, default=10,
+                        help='Closed-loop clients, or the in-flight cap with --rate.')
+    parser.add_argument('--rate', type=float, default=None,
+                        help='Open-loop target requests per second (default: closed loop).')
+    parser.add_argument('--duration', type=float, default=None, help='Stop sending after this many seconds.')
+    parser.add_argument('--timeout', type=float, default=30.0, help='Per-request timeout in seconds.')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the mix and amount jitter.')
+    parser.add_argument('--json', dest='json_path', default=None,
+                        help='Also write the summary as JSON, for comparing runs.')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    runner = LoadRunner(
+        args.url,
+        replay(args.csv, args.total, args.seed),
+        Mix(args.process_ratio, args.status_ratio, args.seed),
+        concurrency=args.concurrency,
+        rate=args.rate,
+        duration=args.duration,
+        timeout=args.timeout,
+    )
+    summary = runner.run()
+    summary['config'] = {k: v for k, v in vars(args).items() if k != 'json_path'}
+    print(format_report(summary))
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(summary, f, indent=2)
+    return summary
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+import asyncio
+import json
+from urllib.parse import urlsplit
+
+
+class HTTPError(Exception):
+    """Raised for transport failures (refused, reset, malformed response)."""
+
+
+class Connection:
+    """
+    One keep-alive HTTP/1.1 connection on top of asyncio streams.
+
+    Deliberately tiny (JSON in, JSON out) so the load generator needs
+    nothing beyond the standard library. Reconnects transparently when the
+    server closes the socket, which gunicorn's sync workers do after every
+    response.
+    """
+
+    def __init__(self, base_url: str, timeout: float = 30.0):
+        parts = urlsplit(base_url)
+        if parts.scheme != 'http':
+            raise ValueError('Only http:// targets are supported')
+        self.host = parts.hostname or '127.0.0.1'
+        self.port = parts.port or 80
+        self.prefix = parts.path.rstrip('/')
+        self.timeout = timeout
+        self._reader = None
+        self._writer = None
+
+    async def request(self, method: str, path: str, body=None):
+        """Send one request and return (status, parsed JSON body or None)."""
+        try:
+            return await asyncio.wait_for(self._request(method, path, body), self.timeout)
+        except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError, ValueError) as e:
+            self.close()
+            raise HTTPError(f'{type(e).__name__}: {e}') from e
+
+    async def _request(self, method, path, body):
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+
+        payload = json.dumps(body).encode() if body is not None else b''
+        head = (f'{method} {self.prefix}{path} HTTP/1.1\r\n'
+                f'Host: {self.host}:{self.port}\r\n'
+                f'Content-Type: application/json\r\n'
+                f'Content-Length: {len(payload)}\r\n'
+                f'Connection: keep-alive\r\n\r\n')
+        self._writer.write(head.encode() + payload)
+        await self._writer.drain()
+
+        version, status, headers = await self._read_head()
+        raw = await self._read_body(headers)
+        if version == 'HTTP/1.0' or headers.get('connection', '').lower() == 'close':
+            self.close()
+
+        content_type = headers.get('content-type', '')
+        data = json.loads(raw) if raw and content_type.startswith('application/json') else None
+        return status, data
+
+    async def _read_head(self):
+        status_line = (await self._reader.readuntil(b'\r\n')).decode('latin-1')
+        version, status = status_line.split(' ', 2)[:2]
+        headers = {}
+        while True:
+            line = (await self._reader.readuntil(b'\r\n')).decode('latin-1')
+            if line == '\r\n':
+                return version, int(status), headers
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+    async def _read_body(self, headers):
+        if 'content-length' in headers:
+            return await self._reader.readexactly(int(headers['content-length']))
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await self._reader.readuntil(b'\r\n')).split(b';')[0], 16)
+                chunk = await self._reader.readexactly(size + 2)
+                if size == 0:
+                    return b''.join(chunks)
+                chunks.append(chunk[:-2])
+        # No framing: the body runs until the server closes the socket
+        body = await self._reader.read()
+        self.close()
+        return body
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
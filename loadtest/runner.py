@@ -0,0 +1,141 @@
+import asyncio
+import time
+from collections import deque
+from loadtest.http import Connection, HTTPError
+from loadtest.stats import LoadStats
+
+CREATE_LABEL = 'POST /'
+
+
+class LoadRunner:
+    """
+    Drive the API with created transactions plus their follow-up calls.
+
+    Two modes:
+      - closed loop (rate=None): `concurrency` clients each send a request,
+        wait for the answer, then send the next one;
+      - open loop (rate=N): requests start at N per second regardless of
+        how fast the server answers, up to `concurrency` in flight. Latency
+        is measured from the scheduled start so a stalled server shows up
+        in the percentiles instead of silently lowering the offered load.
+
+    Follow-ups (process / status update) for a created transaction are
+    queued and take priority over new creates.
+    """
+
+    def __init__(self, base_url, payloads, mix, concurrency=10, rate=None, duration=None, timeout=30.0):
+        if concurrency < 1:
+            raise ValueError('concurrency must be at least 1')
+        if rate is not None and rate <= 0:
+            raise ValueError('rate must be positive')
+        self.base_url = base_url
+        self.payloads = iter(payloads)
+        self.mix = mix
+        self.concurrency = concurrency
+        self.rate = rate
+        self.duration = duration
+        self.timeout = timeout
+        self.stats = LoadStats()
+        self._follow_ups = deque()
+        self._in_flight = 0
+        self._deadline = None
+
+    def run(self):
+        """Run to completion and return the summary dict."""
+        return asyncio.run(self.run_async())
+
+    async def run_async(self):
+        started = time.perf_counter()
+        self._deadline = started + self.duration if self.duration else None
+        if self.rate is None:
+            await self._closed_loop()
+        else:
+            await self._open_loop(started)
+        return self.stats.summary(time.perf_counter() - started)
+
+    def _next_op(self):
+        if self._deadline is not None and time.perf_counter() >= self._deadline:
+            return None
+        if self._follow_ups:
+            return self._follow_ups.popleft()
+        payload = next(self.payloads, None)
+        if payload is None:
+            return None
+        return CREATE_LABEL, 'POST', '/', payload
+
+    async def _wait_for_op(self):
+        # Out of new work, but in-flight creates may still queue follow-ups
+        while True:
+            op = self._next_op()
+            if op is not None or not self._in_flight:
+                return op
+            await asyncio.sleep(0.001)
+
+    async def _send(self, conn, op, scheduled):
+        label, method, path, body = op
+        self._in_flight += 1
+        try:
+            status, data = await conn.request(method, path, body)
+        except HTTPError:
+            status, data = None, None
+        finally:
+            self._in_flight -= 1
+        self.stats.record(label, time.perf_counter() - scheduled, status)
+
+        if label == CREATE_LABEL and status == 201 and data:
+            follow_up = self.mix.follow_up(data['id'])
+            if follow_up is not None:
+                self._follow_ups.append(follow_up)
+
+    async def _closed_loop(self):
+        async def client():
+            conn = Connection(self.base_url, self.timeout)
+            try:
+                while (op := await self._wait_for_op()) is not None:
+                    await self._send(conn, op, time.perf_counter())
+            finally:
+                conn.close()
+
+        await asyncio.gather(*(client() for _ in range(self.concurrency)))
+
+    async def _open_loop(self, started):
+        idle = [Connection(self.base_url, self.timeout) for _ in range(self.concurrency)]
+        tasks = set()
+
+        async def fire(conn, op, scheduled):
+            try:
+                await self._send(conn, op, scheduled)
+            finally:
+                idle.append(conn)
+
+        interval = 1 / self.rate
+        base, tick = started, 0
+        while True:
+            scheduled = base + tick * interval
+            tick += 1
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            op = self._next_op()
+            if op is None:
+                if not tasks:
+                    break
+                # Nothing to send until an in-flight create yields a follow-up
+                await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                base, tick = time.perf_counter(), 0
+                continue
+            if not idle:
+                # Every connection is busy: the arrival is dropped, a
+                # follow-up goes back to the front of the queue
+                self.stats.dropped += 1
+                if op[0] != CREATE_LABEL:
+                    self._follow_ups.appendleft(op)
+                continue
+
+            task = asyncio.create_task(fire(idle.pop(), op, scheduled))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        for conn in idle:
+            conn.close()
@@ -0,0 +1,87 @@
+from collections import Counter, defaultdict
+import numpy as np
+
+PERCENTILES = (50, 95, 99)
+# Upper bounds (ms) of the printed latency histogram buckets
+HISTOGRAM_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+class EndpointStats:
+    def __init__(self):
+        self.latencies = []
+        self.statuses = Counter()
+
+    def record(self, latency_s: float, status):
+        self.latencies.append(latency_s)
+        self.statuses[status] += 1
+
+    @property
+    def errors(self):
+        # Transport failures are recorded with status None
+        return sum(n for status, n in self.statuses.items() if status is None or status >= 500)
+
+    def summary(self, elapsed_s: float):
+        ms = np.asarray(self.latencies) * 1000
+        count = len(ms)
+        result = {
+            'count': count,
+            'rps': round(count / elapsed_s, 1) if elapsed_s else 0.0,
+            'error_rate': round(self.errors / count, 4) if count else 0.0,
+            'statuses': {str(k): v for k, v in sorted(self.statuses.items(), key=lambda kv: str(kv[0]))},
+        }
+        if count:
+            for p, value in zip(PERCENTILES, np.percentile(ms, PERCENTILES)):
+                result[f'p{p}_ms'] = round(float(value), 2)
+            result['max_ms'] = round(float(ms.max()), 2)
+            buckets = np.searchsorted(HISTOGRAM_BOUNDS_MS, ms, side='left')
+            result['histogram'] = np.bincount(buckets, minlength=len(HISTOGRAM_BOUNDS_MS) + 1).tolist()
+        return result
+
+
+class LoadStats:
+    """Per-endpoint latency samples and status codes for one run."""
+
+    def __init__(self):
+        self.endpoints = defaultdict(EndpointStats)
+        self.dropped = 0
+
+    def record(self, label: str, latency_s: float, status):
+        self.endpoints[label].record(latency_s, status)
+
+    def summary(self, elapsed_s: float):
+        total = EndpointStats()
+        for stats in self.endpoints.values():
+            total.latencies.extend(stats.latencies)
+            total.statuses.update(stats.statuses)
+        return {
+            'elapsed_s': round(elapsed_s, 3),
+            'dropped': self.dropped,
+            'endpoints': {label: stats.summary(elapsed_s) for label, stats in sorted(self.endpoints.items())},
+            'total': total.summary(elapsed_s),
+        }
+
+
+def format_report(summary) -> str:
+    """Render a summary as the table printed at the end of a run."""
+    lines = [f"{'endpoint':<22} {'count':>7} {'rps':>8} {'err%':>6} "
+             f"{'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}"]
+    rows = list(summary['endpoints'].items()) + [('total', summary['total'])]
+    for label, s in rows:
+        if not s['count']:
+            continue
+        lines.append(f"{label:<22} {s['count']:>7} {s['rps']:>8.1f} {s['error_rate'] * 100:>5.1f}% "
+                     f"{s['p50_ms']:>6.1f}ms {s['p95_ms']:>6.1f}ms {s['p99_ms']:>6.1f}ms {s['max_ms']:>6.1f}ms")
+
+    labels = [f'<={b}ms' for b in HISTOGRAM_BOUNDS_MS] + [f'>{HISTOGRAM_BOUNDS_MS[-1]}ms']
+    for label, s in rows:
+        if not s['count']:
+            continue
+        lines.append(f'\n{label} latency histogram')
+        peak = max(s['histogram'])
+        for bucket, n in zip(labels, s['histogram']):
+            if n:
+                lines.append(f"  {bucket:>9} {n:>7} {'#' * max(1, round(40 * n / peak))}")
+
+    lines.append(f"\nelapsed {summary['elapsed_s']}s, dropped {summary['dropped']} "
+                 f"(open-loop arrivals skipped at the in-flight cap)")
+    return '\n'.join(lines)
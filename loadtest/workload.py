@@ -0,0 +1,84 @@
+import csv
+import random
+from itertools import count, islice
+
+# data/transactions.csv header -> POST / payload field
+CSV_FIELDS = {
+    'Amount': 'amount',
+    'Sender UPI ID': 'sender_upi_id',
+    'Receiver UPI ID': 'receiver_upi_id',
+    'Sender Name': 'sender_name',
+    'Receiver Name': 'receiver_name',
+    'Sender Phone': 'sender_phone',
+    'Receiver Phone': 'receiver_phone',
+}
+STATUS_CHOICES = ('success', 'failed')
+
+
+def read_payloads(csv_path: str):
+    """Yield POST / payloads from a file in the data/transactions.csv layout."""
+    with open(csv_path, newline='') as f:
+        for row in csv.DictReader(f):
+            payload = {field: row[column] for column, field in CSV_FIELDS.items()}
+            payload['amount'] = float(payload['amount'])
+            yield payload
+
+
+def replay(csv_path: str, total=None, seed: int = 0):
+    """
+    Stream payloads from csv_path, turning it into a synthetic superset
+    when total exceeds the file length.
+
+    The first pass replays the file verbatim. Later passes reuse the same
+    parties with jittered amounts, so sender/receiver velocity keeps
+    building the way it would in production instead of resetting.
+
+    Args:
+        csv_path: source file in the data/transactions.csv layout
+        total: number of payloads to yield (None: one pass over the file)
+        seed: RNG seed for the jitter, so runs are repeatable
+    """
+    if total is None:
+        yield from read_payloads(csv_path)
+        return
+
+    rng = random.Random(seed)
+    emitted = 0
+    for pass_no in count():
+        produced = 0
+        for payload in islice(read_payloads(csv_path), total - emitted):
+            if pass_no:
+                factor = rng.uniform(0.5, 1.5)
+                payload['amount'] = round(min(max(payload['amount'] * factor, 1), 100000), 2)
+            produced += 1
+            yield payload
+        emitted += produced
+        if emitted >= total or not produced:
+            return
+
+
+class Mix:
+    """
+    Follow-up traffic for each created transaction.
+
+    After POST / succeeds, the transaction is sent to /process with
+    probability `process`, otherwise to PUT /status with probability
+    `status` (a pending transaction only accepts one of the two).
+    """
+
+    def __init__(self, process: float = 0.5, status: float = 0.3, seed: int = 0):
+        if not (0 <= process <= 1 and 0 <= status <= 1):
+            raise ValueError('Mix ratios must be between 0 and 1')
+        self.process = process
+        self.status = status
+        self._rng = random.Random(seed)
+
+    def follow_up(self, transaction_id: str):
+        """Return (label, method, path, body) for the next request, or None."""
+        roll = self._rng.random()
+        if roll < self.process:
+            return 'POST /<id>/process', 'POST', f'/{transaction_id}/process', None
+        if roll < self.process + (1 - self.process) * self.status:
+            body = {'status': self._rng.choice(STATUS_CHOICES)}
+            return 'PUT /<id>/status', 'PUT', f'/{transaction_id}/status', body
+        return None
@@ -0,0 +1,36 @@
+"""Add composite indexes for keyset-paginated transaction listing
+
+Revision ID: 7c1e4f2a9b3d
+Revises: 34bfb6783323
+Create Date: 2026-10-18 10:12:41.204518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c1e4f2a9b3d'
+down_revision = '34bfb6783323'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.create_index('ix_transactions_timestamp_id', ['timestamp', 'id'], unique=False)
+        batch_op.create_index('ix_transactions_status_timestamp_id', ['status', 'timestamp', 'id'], unique=False)
+        batch_op.create_index('ix_transactions_sender_timestamp_id', ['sender_upi_id', 'timestamp', 'id'], unique=False)
+        batch_op.create_index('ix_transactions_receiver_timestamp_id', ['receiver_upi_id', 'timestamp', 'id'], unique=False)
+        # Flagged rows are rare: a partial index on Postgres keeps it small
+        batch_op.create_index('ix_transactions_fraud_timestamp_id', ['fraud_flag', 'timestamp', 'id'], unique=False,
+                              postgresql_where=sa.text('fraud_flag'))
+
+
+def downgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.drop_index('ix_transactions_fraud_timestamp_id')
+        batch_op.drop_index('ix_transactions_receiver_timestamp_id')
+        batch_op.drop_index('ix_transactions_sender_timestamp_id')
+        batch_op.drop_index('ix_transactions_status_timestamp_id')
+        batch_op.drop_index('ix_transactions_timestamp_id')
@@ -0,0 +1,120 @@
+"""Partition transactions by month on timestamp (PostgreSQL)
+
+Revision ID: b51d9e03c6a7
+Revises: 7c1e4f2a9b3d
+Create Date: 2026-10-18 20:31:07.512094
+
+The table is rebuilt as PARTITION BY RANGE (timestamp) with one partition
+per month holding data, partitions for the next few months, and a default
+partition. A partitioned table's primary key must include the partition
+key, so it becomes (id, timestamp). The model keeps id as its identity;
+e8f3a61c2d94 keeps it unique. Other databases keep the plain table.
+
+Rows are copied while the migration holds its lock, so run it in a
+maintenance window on large tables. `flask maintain-transactions` keeps
+creating partitions ahead of time afterwards.
+"""
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b51d9e03c6a7'
+down_revision = '7c1e4f2a9b3d'
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 3
+
+INDEXES = [
+    ('ix_transactions_timestamp', ['timestamp'], {}),
+    ('ix_transactions_timestamp_id', ['timestamp', 'id'], {}),
+    ('ix_transactions_status_timestamp_id', ['status', 'timestamp', 'id'], {}),
+    ('ix_transactions_sender_timestamp_id', ['sender_upi_id', 'timestamp', 'id'], {}),
+    ('ix_transactions_receiver_timestamp_id', ['receiver_upi_id', 'timestamp', 'id'], {}),
+    ('ix_transactions_fraud_timestamp_id', ['fraud_flag', 'timestamp', 'id'],
+     {'postgresql_where': sa.text('fraud_flag')}),
+]
+
+COLUMNS = ('id, amount, sender_upi_id, receiver_upi_id, sender_name, receiver_name, '
+           'sender_phone, receiver_phone, "timestamp", status, fraud_flag, fraud_score')
+
+
+def _columns():
+    return [
+        sa.Column('id', sa.String(length=50), nullable=False),
+        sa.Column('amount', sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column('sender_upi_id', sa.String(length=100), nullable=False),
+        sa.Column('receiver_upi_id', sa.String(length=100), nullable=False),
+        sa.Column('sender_name', sa.String(length=100), nullable=False),
+        sa.Column('receiver_name', sa.String(length=100), nullable=False),
+        sa.Column('sender_phone', sa.String(length=15), nullable=False),
+        sa.Column('receiver_phone', sa.String(length=15), nullable=False),
+        sa.Column('timestamp', sa.DateTime(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('fraud_flag', sa.Boolean(), nullable=True),
+        sa.Column('fraud_score', sa.Float(), nullable=True),
+        sa.CheckConstraint('amount > 0 AND amount <= 100000', name='amount_range'),
+        sa.CheckConstraint("status IN ('pending', 'failed', 'success')", name='status_check'),
+    ]
+
+
+def _add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def _retire(name):
+    """Rename the current transactions table out of the way, freeing its index names."""
+    op.execute(f'ALTER TABLE transactions RENAME TO {name}')
+    op.execute(f'ALTER INDEX IF EXISTS transactions_pkey RENAME TO {name}_pkey')
+    for index, _, _ in INDEXES:
+        op.execute(f'DROP INDEX IF EXISTS {index}')
+
+
+def _create_indexes():
+    for index, columns, kwargs in INDEXES:
+        op.create_index(index, 'transactions', columns, unique=False, **kwargs)
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    # The copy can outlast an application-level DB_STATEMENT_TIMEOUT_MS
+    op.execute('SET LOCAL statement_timeout = 0')
+    _retire('transactions_unpartitioned')
+    op.create_table('transactions', *_columns(),
+                    sa.PrimaryKeyConstraint('id', 'timestamp', name='transactions_pkey'),
+                    postgresql_partition_by='RANGE ("timestamp")')
+    _create_indexes()
+
+    # One partition per month from the oldest row to MONTHS_AHEAD from now
+    oldest = bind.execute(sa.text('SELECT min("timestamp") FROM transactions_unpartitioned')).scalar()
+    current = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    month = min(oldest, current).replace(day=1, hour=0, minute=0, second=0, microsecond=0) if oldest else current
+    while month <= _add_months(current, MONTHS_AHEAD):
+        op.execute(f"CREATE TABLE transactions_p{month:%Y%m} PARTITION OF transactions "
+                   f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{_add_months(month, 1):%Y-%m-%d}')")
+        month = _add_months(month, 1)
+    op.execute('CREATE TABLE transactions_default PARTITION OF transactions DEFAULT')
+
+    op.execute(f'INSERT INTO transactions ({COLUMNS}) SELECT {COLUMNS} FROM transactions_unpartitioned')
+    op.drop_table('transactions_unpartitioned')
+    op.execute('ANALYZE transactions')
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    op.execute('SET LOCAL statement_timeout = 0')
+    # Dropping the partitioned table drops its partitions with it
+    _retire('transactions_partitioned')
+    op.create_table('transactions', *_columns(), sa.PrimaryKeyConstraint('id', name='transactions_pkey'))
+    _create_indexes()
+    op.execute(f'INSERT INTO transactions ({COLUMNS}) SELECT {COLUMNS} FROM transactions_partitioned')
+    op.drop_table('transactions_partitioned')
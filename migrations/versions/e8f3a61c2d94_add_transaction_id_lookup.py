@@ -0,0 +1,67 @@
+"""Keep transaction ids unique across partitions with an id lookup table (PostgreSQL)
+
+Revision ID: e8f3a61c2d94
+Revises: b51d9e03c6a7
+Create Date: 2026-10-18 21:02:44.318406
+
+A partitioned table can't have a unique index on id alone: its primary key
+is (id, timestamp). transaction_ids holds one (id, timestamp) row per
+transaction under a plain primary key on id, kept up to date by a trigger
+on transactions, so inserting an id that exists in any month fails as it
+did before partitioning. Lookups by id read the timestamp from it to go
+straight to the right partition (see app.services.partitions.by_id).
+Other databases keep id as the plain table's primary key.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8f3a61c2d94'
+down_revision = 'b51d9e03c6a7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    op.execute('SET LOCAL statement_timeout = 0')
+    op.create_table('transaction_ids',
+                    sa.Column('id', sa.String(length=50), nullable=False),
+                    sa.Column('timestamp', sa.DateTime(), nullable=False),
+                    sa.PrimaryKeyConstraint('id', name='transaction_ids_pkey'))
+    op.execute('INSERT INTO transaction_ids (id, "timestamp") SELECT id, "timestamp" FROM transactions')
+
+    # AFTER row triggers on the partitioned table apply to every partition,
+    # including ones created later. Rows moved between partitions go through
+    # here as DELETE + INSERT or as one UPDATE; both keep the lookup right.
+    op.execute('''
+        CREATE FUNCTION transactions_track_id() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                DELETE FROM transaction_ids WHERE id = OLD.id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO transaction_ids (id, "timestamp") VALUES (NEW.id, NEW."timestamp");
+            END IF;
+            RETURN NULL;
+        END
+        $$
+    ''')
+    op.execute('CREATE TRIGGER transactions_track_id '
+               'AFTER INSERT OR DELETE OR UPDATE OF id, "timestamp" ON transactions '
+               'FOR EACH ROW EXECUTE FUNCTION transactions_track_id()')
+    op.execute('ANALYZE transaction_ids')
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    op.execute('DROP TRIGGER transactions_track_id ON transactions')
+    op.execute('DROP FUNCTION transactions_track_id()')
+    op.drop_table('transaction_ids')
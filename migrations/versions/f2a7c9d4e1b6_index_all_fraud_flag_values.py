@@ -0,0 +1,43 @@
+"""Index both fraud_flag values for the flagged/unflagged listings (PostgreSQL)
+
+Revision ID: f2a7c9d4e1b6
+Revises: e8f3a61c2d94
+Create Date: 2026-10-18 21:40:12.583017
+
+ix_transactions_fraud_timestamp_id was partial (WHERE fraud_flag), so
+fraud_flag=false listings and exports couldn't use it and fell back to
+the (timestamp, id) index, filtering out flagged rows as they went.
+It becomes a plain (fraud_flag, timestamp, id) index. Other databases
+never created the partial form, so there is nothing to change there.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2a7c9d4e1b6'
+down_revision = 'e8f3a61c2d94'
+branch_labels = None
+depends_on = None
+
+INDEX = 'ix_transactions_fraud_timestamp_id'
+COLUMNS = ['fraud_flag', 'timestamp', 'id']
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    op.execute('SET LOCAL statement_timeout = 0')
+    op.drop_index(INDEX, table_name='transactions')
+    op.create_index(INDEX, 'transactions', COLUMNS, unique=False)
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    op.drop_index(INDEX, table_name='transactions')
+    op.create_index(INDEX, 'transactions', COLUMNS, unique=False, postgresql_where=sa.text('fraud_flag'))
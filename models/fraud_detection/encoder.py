@@ -0,0 +1,49 @@
+import zlib
+import pandas as pd
+
+# Raw CSV column -> encoded feature column
+CATEGORICAL_FIELDS = {
+    'Sender UPI ID': 'SenderUPI',
+    'Receiver UPI ID': 'ReceiverUPI',
+    'State': 'StateCode',
+    'City': 'CityCode',
+}
+
+class FeatureEncoder:
+    """
+    Fitted vocabulary for the categorical features.
+
+    Known values map to their training code (same codes as cat.codes on the
+    training set). Unseen values fall back to a stable crc32 bucket placed
+    after the vocabulary, so codes agree across processes and workers.
+    """
+
+    def __init__(self, hash_buckets: int = 1024):
+        self.hash_buckets = hash_buckets
+        self.vocabularies = {}
+
+    def fit(self, df: pd.DataFrame):
+        for column in CATEGORICAL_FIELDS:
+            values = sorted(df[column].dropna().astype(str).unique())
+            self.vocabularies[column] = {v: i for i, v in enumerate(values)}
+        return self
+
+    def encode_value(self, column: str, value) -> int:
+        """O(1) lookup for a single value."""
+        vocab = self.vocabularies[column]
+        value = str(value)
+        code = vocab.get(value)
+        if code is None:
+            code = len(vocab) + zlib.crc32(value.encode('utf-8')) % self.hash_buckets
+        return code
+
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Add the encoded feature columns to df in place."""
+        for column, feature in CATEGORICAL_FIELDS.items():
+            values = df[column].astype(str)
+            codes = values.map(self.vocabularies[column])
+            unseen = codes.isna()
+            if unseen.any():
+                codes[unseen] = values[unseen].map(lambda v: self.encode_value(column, v))
+            df[feature] = codes.astype('int64')
+        return df
@@ -0,0 +1,127 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import joblib
+import numpy as np
+import pandas as pd
+from .encoder import FeatureEncoder
+from .preprocess import FEATURE_COLUMNS, preprocess_data, read_feature_source
+from .rules import SUSPICIOUS_RULES
+
+FEATURE_CACHE_DIR = os.environ.get('FEATURE_CACHE_DIR', 'data/feature_cache')
+
+# Bump when build_features changes what a feature column holds
+CACHE_VERSION = 1
+
+def file_hash(path: str) -> str:
+    """sha256 of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def cache_key(source) -> str:
+    """
+    Cache key for the features of source (a CSV path or list of them).
+
+    Derived from the files' contents, not their names or mtimes, plus the
+    feature columns and rules, so any change to either means a fresh entry.
+    """
+    paths = [source] if isinstance(source, str) else list(source)
+    spec = {
+        'version': CACHE_VERSION,
+        'columns': FEATURE_COLUMNS,
+        'rules': [repr(rule) for rule in SUSPICIOUS_RULES],
+        'files': [file_hash(path) for path in paths],
+    }
+    return hashlib.sha256(json.dumps(spec).encode()).hexdigest()[:32]
+
+def encoder_hash(encoder: FeatureEncoder) -> str:
+    return joblib.hash((encoder.hash_buckets, encoder.vocabularies))
+
+def load_features(source, encoder: FeatureEncoder | None = None, cache_dir: str | None = FEATURE_CACHE_DIR):
+    """
+    Feature matrix, labels and encoder for source, built once per input.
+
+    The first call parses the CSV(s) and writes the features to
+    cache_dir/<cache_key> as .npy files. Later calls for the same bytes
+    (training again, evaluating, plotting) memory-map them instead of parsing.
+
+    Args:
+        source: CSV path or list of CSV paths
+        encoder: FeatureEncoder to encode with (e.g. the one saved with a
+            model); when omitted one is fitted on source
+        cache_dir: where entries live; None skips the cache
+
+    Returns:
+        (X, y, encoder): X is a float32 DataFrame with FEATURE_COLUMNS (backed
+        by a read-only memory map when cached), y the rule labels
+    """
+    if cache_dir is None:
+        return _build(source, encoder)
+
+    key = cache_key(source)
+    entry = _find(cache_dir, key, encoder)
+    if entry is None:
+        name = key if encoder is None else f'{key}-{encoder_hash(encoder)[:12]}'
+        X, y, encoder = _build(source, encoder)
+        entry = _write(cache_dir, name, source, X, y, encoder)
+    return _open(entry)
+
+def _find(cache_dir, key, encoder):
+    fitted = os.path.join(cache_dir, key)
+    if encoder is None:
+        return fitted if os.path.exists(fitted) else None
+    # An entry fitted on this data has the same encoder a model trained on it saved
+    wanted = encoder_hash(encoder)
+    for entry in (fitted, f'{fitted}-{wanted[:12]}'):
+        if os.path.exists(entry) and _meta(entry)['encoder'] == wanted:
+            return entry
+    return None
+
+def _build(source, encoder):
+    df = read_feature_source(source)
+    encoder = encoder or FeatureEncoder().fit(df)
+    X, y, _ = preprocess_data(df, encoder)
+    return X.astype(np.float32), y, encoder
+
+def _write(cache_dir, name, source, X, y, encoder):
+    """Write an entry to a scratch directory, then rename it into place."""
+    os.makedirs(cache_dir, exist_ok=True)
+    entry = os.path.join(cache_dir, name)
+    scratch = tempfile.mkdtemp(prefix='.tmp-', dir=cache_dir)
+    try:
+        np.save(os.path.join(scratch, 'features.npy'), X.to_numpy())
+        np.save(os.path.join(scratch, 'labels.npy'), np.asarray(y))
+        joblib.dump(encoder, os.path.join(scratch, 'encoder.joblib'))
+        meta = {
+            'version': CACHE_VERSION,
+            'sources': [source] if isinstance(source, str) else list(source),
+            'rows': len(X),
+            'columns': list(X.columns),
+            'encoder': encoder_hash(encoder),
+        }
+        with open(os.path.join(scratch, 'meta.json'), 'w') as f:
+            json.dump(meta, f, indent=2)
+        os.rename(scratch, entry)
+    except OSError:
+        # Another process wrote the same entry first; its contents are identical
+        shutil.rmtree(scratch, ignore_errors=True)
+        if not os.path.exists(entry):
+            raise
+    return entry
+
+def _meta(entry):
+    with open(os.path.join(entry, 'meta.json')) as f:
+        return json.load(f)
+
+def _open(entry):
+    meta = _meta(entry)
+    features = np.load(os.path.join(entry, 'features.npy'), mmap_mode='r')
+    X = pd.DataFrame(features, columns=meta['columns'], copy=False)
+    y = pd.Series(np.load(os.path.join(entry, 'labels.npy')), name='Label')
+    encoder = joblib.load(os.path.join(entry, 'encoder.joblib'))
+    return X, y, encoder
@@ -0,0 +1,83 @@
+import numpy as np
+from sklearn.tree._tree import TREE_LEAF
+
+class FlatForest:
+    """
+    A fitted RandomForestClassifier flattened into contiguous NumPy arrays.
+
+    All trees share one node table (feature, threshold, left, right) plus a
+    per-node class-probability table. Leaves point at themselves with an
+    infinite threshold, so a fixed number of vectorized steps (the deepest
+    tree's depth) walks every tree at once. Predictions match sklearn's
+    exactly: inputs are compared as float32 like sklearn's trees do, and tree
+    probabilities are summed in estimator order before averaging.
+
+    Exposes predict/predict_proba/classes_/feature_names_in_, so it can be
+    used wherever the sklearn model is.
+    """
+
+    def __init__(self, feature, threshold, left, right, value, roots, max_depth, classes, feature_names=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.max_depth = max_depth
+        self.classes_ = classes
+        if feature_names is not None:
+            self.feature_names_in_ = feature_names
+
+    @classmethod
+    def from_sklearn(cls, forest):
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            n = tree.node_count
+            ids = np.arange(offset, offset + n)
+            leaf = tree.children_left == TREE_LEAF
+
+            features.append(np.where(leaf, 0, tree.feature))
+            thresholds.append(np.where(leaf, np.inf, tree.threshold))
+            lefts.append(np.where(leaf, ids, tree.children_left + offset))
+            rights.append(np.where(leaf, ids, tree.children_right + offset))
+
+            # Same normalization as DecisionTreeClassifier.predict_proba
+            proba = tree.value[:, 0, :forest.n_classes_].astype(np.float64)
+            normalizer = proba.sum(axis=1)[:, np.newaxis]
+            normalizer[normalizer == 0.0] = 1.0
+            values.append(proba / normalizer)
+
+            roots.append(offset)
+            offset += n
+
+        return cls(
+            feature=np.concatenate(features).astype(np.intp),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            left=np.concatenate(lefts).astype(np.intp),
+            right=np.concatenate(rights).astype(np.intp),
+            value=np.concatenate(values),
+            roots=np.asarray(roots, dtype=np.intp),
+            max_depth=max(e.tree_.max_depth for e in forest.estimators_),
+            classes=forest.classes_,
+            feature_names=getattr(forest, 'feature_names_in_', None),
+        )
+
+    def leaves(self, X):
+        """Leaf node index per (row, tree)."""
+        X = np.asarray(X, dtype=np.float32)
+        rows = np.arange(X.shape[0])[:, np.newaxis]
+        nodes = np.broadcast_to(self.roots, (X.shape[0], self.roots.size))
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return nodes
+
+    def predict_proba(self, X):
+        # cumsum adds trees one after another, the same order sklearn accumulates them
+        per_tree = self.value[self.leaves(X)]
+        return per_tree.cumsum(axis=1)[:, -1] / self.roots.size
+
+    def predict(self, X):
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1))
@@ -0,0 +1,190 @@
+from array import array
+import numpy as np
+import pandas as pd
+from .velocity import timestamp_seconds
+
+# Per-transaction graph features, taken right after the transaction's edge is added
+GRAPH_COLUMNS = [
+    'SenderFanOut',          # distinct accounts the sender has paid
+    'SenderFanIn',           # distinct accounts that have paid the sender
+    'ReceiverFanIn',         # distinct accounts that have paid the receiver
+    'ReceiverFanOut',        # distinct accounts the receiver has paid (money passing through)
+    'SenderTwoHop',          # sender -> x -> y payment paths
+    'SharedCounterparties',  # accounts both sides have transacted with
+]
+
+
+class TransactionGraph:
+    """
+    Directed sender -> receiver graph over UPI IDs, grown one payment at a time.
+
+    Accounts get consecutive integer node numbers. Each node keeps its
+    distinct receivers and senders in array('l') adjacency lists, plus a
+    set of everyone it has transacted with in either direction; a set of
+    packed (sender, receiver) pairs makes repeat payments no-ops. Fan-in and
+    fan-out are list lengths, and the two-hop path count is kept up to date
+    on every new edge, so all three are O(1) lookups. Adding an edge costs
+    O(sender's fan-in); shared counterparties cost O(smaller degree).
+
+    Not thread-safe; app.services.graph_index wraps it with a lock.
+    """
+
+    def __init__(self):
+        self.ids = {}
+        self.names = []
+        self.out = []
+        self.into = []
+        self.counterparties = []
+        self.two_hop = array('q')
+        self._edges = set()
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def edge_count(self):
+        return len(self._edges)
+
+    def node(self, upi_id, create=True):
+        """Node number for upi_id (new nodes are added when create), or None."""
+        n = self.ids.get(upi_id)
+        if n is None and create:
+            n = self.ids[upi_id] = len(self.names)
+            self.names.append(upi_id)
+            self.out.append(array('l'))
+            self.into.append(array('l'))
+            self.counterparties.append(set())
+            self.two_hop.append(0)
+        return n
+
+    def add(self, sender, receiver):
+        """Record a payment between two UPI IDs; returns their node numbers."""
+        s, r = self.node(sender), self.node(receiver)
+        self.add_edge(s, r)
+        return s, r
+
+    def add_edge(self, s, r):
+        """Record a payment from node s to node r (both already added)."""
+        key = s << 32 | r
+        if key in self._edges:
+            return
+        self._edges.add(key)
+        # Everyone who pays s gains a path through s's new receiver
+        two_hop = self.two_hop
+        for p in self.into[s]:
+            two_hop[p] += 1
+        self.out[s].append(r)
+        self.into[r].append(s)
+        self.counterparties[s].add(r)
+        self.counterparties[r].add(s)
+        two_hop[s] += len(self.out[r])
+
+    def shared_counterparties(self, a, b):
+        """Accounts other than a and b that both have transacted with."""
+        shared = self.counterparties[a] & self.counterparties[b]  # walks the smaller set
+        return len(shared) - (a in shared) - (b in shared)
+
+    def row(self, s, r):
+        """GRAPH_COLUMNS values, in order, for a payment from node s to node r."""
+        return (len(self.out[s]), len(self.into[s]), len(self.into[r]), len(self.out[r]),
+                self.two_hop[s], self.shared_counterparties(s, r))
+
+    def features(self, s, r):
+        """GRAPH_COLUMNS as a dict of floats, like the velocity features."""
+        return dict(zip(GRAPH_COLUMNS, map(float, self.row(s, r))))
+
+
+class _Adjacency:
+    """
+    Time-ordered adjacency lists of a whole replay, in CSR form.
+
+    node[k] gains neighbour other[k] at replay position pos[k]; the lists
+    are sorted by (node, pos), so "node's list as of position p" is a
+    prefix found with one searchsorted. Every method takes arrays and
+    answers for all of them at once.
+    """
+
+    def __init__(self, node, other, pos, nodes, n):
+        by = np.argsort(node, kind='stable')  # pos is ascending, so this sorts by (node, pos)
+        self.n = n
+        self.keys = node[by] * n + pos[by]
+        self.other = other[by]
+        self.start = np.concatenate(([0], np.cumsum(np.bincount(node, minlength=nodes))[:-1]))
+
+    def degree(self, node, at):
+        """Length of each node's list as of positions at."""
+        return np.searchsorted(self.keys, node * self.n + at, side='right') - self.start[node]
+
+    def neighbours(self, node, at):
+        """(index into node, neighbour) for every list entry as of positions at."""
+        counts = self.degree(node, at)
+        index = np.repeat(np.arange(len(node)), counts)
+        offsets = np.arange(len(index)) - np.repeat(np.cumsum(counts) - counts, counts)
+        return index, self.other[self.start[node][index] + offsets]
+
+
+def _graph_rows(s, r, nodes):
+    """
+    GRAPH_COLUMNS for payments s[i] -> r[i] (node numbers, in replay order).
+
+    Row i sees the graph after the first i + 1 payments, like
+    TransactionGraph.row right after add_edge. An edge appears at the
+    position of its first payment, so each count is a prefix of a node's
+    time-ordered adjacency list; two-hop paths and shared counterparties
+    expand those prefixes instead of replaying payments one by one.
+    """
+    n = len(s)
+    pos = np.arange(n)
+    first = ~pd.Index(s * nodes + r).duplicated()
+    es, er, ep = s[first], r[first], pos[first]
+    out = _Adjacency(es, er, ep, nodes, n)
+    into = _Adjacency(er, es, ep, nodes, n)
+
+    # Two-hop paths: sum over the sender's receivers x of x's fan-out
+    index, x = out.neighbours(s, pos)
+    two_hop = np.bincount(index, weights=out.degree(x, index), minlength=n)
+
+    # Counterparties in either direction, each from the first payment between the two
+    a, b, at = np.stack([es, er], axis=1).ravel(), np.stack([er, es], axis=1).ravel(), np.repeat(ep, 2)
+    pairs, kept = np.unique(a * nodes + b, return_index=True)
+    seen = at[kept]
+    kept.sort()
+    both = _Adjacency(a[kept], b[kept], at[kept], nodes, n)
+
+    def knows(a, b, at):
+        key = a * nodes + b
+        i = np.minimum(np.searchsorted(pairs, key), len(pairs) - 1)
+        return (pairs[i] == key) & (seen[i] <= at)
+
+    # Walk the smaller side's counterparties and look each up on the other side
+    swap = both.degree(r, pos) < both.degree(s, pos)
+    index, x = both.neighbours(np.where(swap, r, s), pos)
+    shared = np.bincount(index, weights=knows(np.where(swap, s, r)[index], x, index), minlength=n)
+    # s and r know each other, so they are in the overlap exactly when they paid themselves
+    shared -= knows(s, s, pos).astype(np.int64) + knows(r, r, pos)
+
+    return np.column_stack([out.degree(s, pos), into.degree(s, pos), into.degree(r, pos), out.degree(r, pos),
+                            two_hop, shared])
+
+
+def add_graph_features(df: pd.DataFrame, ts: np.ndarray | None = None) -> pd.DataFrame:
+    """
+    Add GRAPH_COLUMNS to df in place.
+
+    Rows are taken in timestamp order (ties in file order), and each row
+    gets the graph as it stood just after its own payment, the same values
+    the API's graph index records live by growing a TransactionGraph.
+    ts is timestamp_seconds(df), for callers that have parsed it already.
+    """
+    n = len(df)
+    values = np.zeros((n, len(GRAPH_COLUMNS)), dtype=np.float64)
+    if n:
+        order = np.argsort(timestamp_seconds(df) if ts is None else ts, kind='stable')
+        # Node numbers for every UPI ID up front, in one vectorized pass
+        upi_ids = pd.concat([df['Sender UPI ID'], df['Receiver UPI ID']], ignore_index=True).astype(str)
+        codes, names = pd.factorize(upi_ids)
+        codes = codes.astype(np.int64)
+        values[order] = _graph_rows(codes[:n][order], codes[n:][order], len(names))
+    for j, column in enumerate(GRAPH_COLUMNS):
+        df[column] = values[:, j]
+    return df
@@ -1,10 +1,49 @@
 import joblib
 import pandas as pd
-from .preprocess import preprocess_data
+from .preprocess import FEATURE_COLUMNS, preprocess_data, build_features
+from .utils import load_encoder
 
 def predict_new(csv_path: str, model_path: str):
     model = joblib.load(model_path)
-    X, y, df = preprocess_data(csv_path)
-    df['Prediction'] = model.predict(X)
+    X, y, df = preprocess_data(csv_path, load_encoder(model_path))
+    df['Prediction'] = model.predict(df[model_columns(model)])
     df['Prediction'] = df['Prediction'].map({0: "NOT_SUSPICIOUS", 1: "SUSPICIOUS"})
     return df[['Transaction ID','Amount','Sender UPI ID','Receiver UPI ID','Prediction']]
+
+def predict_records(records, model, encoder=None):
+    """
+    Score transactions in memory with an already-loaded model.
+
+    Args:
+        records: DataFrame or list of dicts using the training CSV column names
+        model: fitted classifier (e.g. the one cached by FraudDetectionService)
+        encoder: FeatureEncoder saved with the model (see utils.load_encoder)
+
+    Returns:
+        numpy array of 0/1 predictions, one per record
+    """
+    return model.predict(feature_matrix(records, model, encoder))
+
+def predict_score_records(records, model, encoder=None):
+    """Like predict_records, but returns the fraud score (see positive_score)."""
+    return positive_score(model, feature_matrix(records, model, encoder))
+
+def feature_matrix(records, model, encoder=None):
+    """Encoded feature rows for records, in the column order model was fitted on."""
+    df = records if isinstance(records, pd.DataFrame) else pd.DataFrame.from_records(records)
+    build_features(df, encoder)
+    return df[model_columns(model)]
+
+def positive_score(model, X):
+    """
+    Fraud score for each row of X: predict_proba's column for class 1 (SUSPICIOUS).
+
+    For the forest this is the average of the trees' leaf class fractions,
+    a vote share between 0 and 1. It ranks transactions but is not
+    calibrated, so it shouldn't be read as the probability of fraud.
+    """
+    return model.predict_proba(X)[:, list(model.classes_).index(1)]
+
+def model_columns(model):
+    """Feature columns the model was fitted on (older models predate newer features)."""
+    return list(getattr(model, 'feature_names_in_', FEATURE_COLUMNS))
@@ -1,34 +1,102 @@
 import pandas as pd
+from pandas.api.types import union_categoricals
+from .encoder import CATEGORICAL_FIELDS, FeatureEncoder
+from .graph import GRAPH_COLUMNS, add_graph_features
+from .rules import RuleSet
+from .velocity import VELOCITY_COLUMNS, add_velocity_features, epoch_seconds, parse_timestamps
 
-def preprocess_data(csv_path: str):
-    df = pd.read_csv(csv_path)
+FEATURE_COLUMNS = ['Amount','Hour','SenderUPI','ReceiverUPI','StateCode','CityCode'] + VELOCITY_COLUMNS + GRAPH_COLUMNS
 
-    # Extract hour from timestamp
-    df['Hour'] = pd.to_datetime(df['Timestamp'], format="%d-%m-%Y %H:%M").dt.hour
+# Raw CSV columns the features and rule labels are computed from
+SOURCE_COLUMNS = ['Amount','Sender UPI ID','Receiver UPI ID','Timestamp','State','City']
+READ_CHUNK_ROWS = 500_000
 
-    # Encode categorical features
-    df['SenderUPI'] = df['Sender UPI ID'].astype('category').cat.codes
-    df['ReceiverUPI'] = df['Receiver UPI ID'].astype('category').cat.codes
-    df['StateCode'] = df['State'].astype('category').cat.codes
-    df['CityCode'] = df['City'].astype('category').cat.codes
-
-    # Features & Labels
-    X = df[['Amount','Hour','SenderUPI','ReceiverUPI','StateCode','CityCode']]
-    
-    # Rule-based suspicion (for labeling training set)
-    df['Label'] = df.apply(lambda x: suspicious_rule(x), axis=1)
+def read_transactions(source) -> pd.DataFrame:
+    """
+    Load transactions in the data/transactions.csv layout.
+
+    Args:
+        source: CSV path (.csv.gz archives included) or a list of them,
+            e.g. data/transactions.csv plus files from `flask maintain-transactions`
+    """
+    if isinstance(source, str):
+        return pd.read_csv(source)
+    return pd.concat([pd.read_csv(path) for path in source], ignore_index=True)
+
+def read_feature_source(source, chunksize: int = READ_CHUNK_ROWS) -> pd.DataFrame:
+    """
+    Load only SOURCE_COLUMNS, chunksize rows at a time.
+
+    Each chunk's strings are parsed into compact dtypes (datetimes, categoricals)
+    before the next chunk is read. Peak memory is then a fraction of
+    read_transactions' on large files, and build_features gives the same result.
+    """
+    paths = [source] if isinstance(source, str) else list(source)
+    parts = []
+    for path in paths:
+        chunks = pd.read_csv(path, usecols=SOURCE_COLUMNS, chunksize=chunksize,
+                             dtype=dict.fromkeys(CATEGORICAL_FIELDS, str))
+        for chunk in chunks:
+            chunk['Timestamp'] = pd.to_datetime(chunk['Timestamp'], format="%d-%m-%Y %H:%M")
+            for column in CATEGORICAL_FIELDS:
+                chunk[column] = chunk[column].astype('category')
+            parts.append(chunk[SOURCE_COLUMNS])
+    return pd.DataFrame({
+        column: (pd.Series(union_categoricals([p[column] for p in parts]), copy=False)
+                 if column in CATEGORICAL_FIELDS
+                 else pd.concat([p[column] for p in parts], ignore_index=True))
+        for column in SOURCE_COLUMNS
+    })
+
+def preprocess_data(source, encoder: FeatureEncoder | None = None):
+    """
+    Load and featurize transactions.
+
+    Args:
+        source: CSV path, list of CSV paths or an already-loaded DataFrame
+        encoder: fitted FeatureEncoder; when omitted one is fitted on this batch
+    """
+    df = source if isinstance(source, pd.DataFrame) else read_transactions(source)
+
+    X = build_features(df, encoder)
+
+    # Rule-based suspicion (for labeling training set), evaluated column-wise
+    df['Label'] = RuleSet().label(df)
     y = df['Label']
 
     return X, y, df
 
+def build_features(df: pd.DataFrame, encoder: FeatureEncoder | None = None):
+    """Add model features to df in place and return the feature matrix."""
+    # Timestamp is parsed once for the hour, velocity and graph features; live
+    # rows arrive with all of them precomputed and skip it
+    timestamps = seconds = None
+    if not {'Hour', *VELOCITY_COLUMNS, *GRAPH_COLUMNS}.issubset(df.columns):
+        timestamps = parse_timestamps(df)
+        seconds = epoch_seconds(timestamps)
+
+    # Extract hour from timestamp (callers scoring live rows may pass Hour directly)
+    if 'Hour' not in df:
+        df['Hour'] = timestamps.dt.hour
+
+    # Rolling sender/receiver velocity (live rows arrive with these precomputed)
+    if not set(VELOCITY_COLUMNS).issubset(df.columns):
+        add_velocity_features(df, ts=seconds)
+
+    # Sender -> receiver graph as of each row (live rows arrive with these too)
+    if not set(GRAPH_COLUMNS).issubset(df.columns):
+        add_graph_features(df, ts=seconds)
+
+    # Encode categorical features
+    if encoder is None:
+        encoder = FeatureEncoder().fit(df)
+    encoder.transform(df)
+
+    # Features
+    return df[FEATURE_COLUMNS]
+
+_row_rules = RuleSet()
+
 def suspicious_rule(row):
-    """Basic rules for suspicious detection"""
-    # Unusual high amount
-    if row['Amount'] > 50000:
-        return 1
-    # Odd hour (midnight transactions)
-    if row['Hour'] >= 23 or row['Hour'] <= 5:
-        return 1
-    # Same sender -> many receivers (mule accounts detection)
-    # Simplified rule: if SenderUPI or ReceiverUPI are very rare
-    return 0
+    """Basic rules for suspicious detection (single row; see rules.SUSPICIOUS_RULES)"""
+    return 1 if _row_rules.match(row) else 0
@@ -0,0 +1,80 @@
+import operator
+import threading
+from collections import Counter
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+
+OPERATORS = {
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le,
+    '==': operator.eq,
+}
+
+@dataclass(frozen=True)
+class Rule:
+    """A named rule that fires when any of its (column, op, value) conditions holds."""
+    name: str
+    conditions: tuple
+
+# Distinct counterparties within an hour that look like a mule account
+MULE_DISTINCT_THRESHOLD = 5
+
+SUSPICIOUS_RULES = [
+    # Unusual high amount
+    Rule('high_amount', (('Amount', '>', 50000),)),
+    # Odd hour (midnight transactions)
+    Rule('odd_hour', (('Hour', '>=', 23), ('Hour', '<=', 5))),
+    # Same sender -> many receivers, or many senders -> one receiver (mule accounts)
+    Rule('mule_fan_out', (('SenderDistinct1h', '>=', MULE_DISTINCT_THRESHOLD),)),
+    Rule('mule_fan_in', (('ReceiverDistinct1h', '>=', MULE_DISTINCT_THRESHOLD),)),
+]
+
+class RuleSet:
+    """
+    Evaluates rules over whole DataFrames (NumPy masks) or single records.
+
+    Keeps a per-rule hit counter across calls.
+    """
+
+    def __init__(self, rules=SUSPICIOUS_RULES):
+        self.rules = list(rules)
+        self.hits = Counter()
+        self.evaluated = 0
+        self._lock = threading.Lock()
+
+    def masks(self, df: pd.DataFrame) -> dict:
+        """One boolean mask per rule."""
+        masks = {}
+        for rule in self.rules:
+            mask = np.zeros(len(df), dtype=bool)
+            for column, op, value in rule.conditions:
+                mask |= OPERATORS[op](df[column].to_numpy(), value)
+            masks[rule.name] = mask
+        return masks
+
+    def label(self, df: pd.DataFrame) -> np.ndarray:
+        """1 where any rule fires, else 0."""
+        masks = self.masks(df)
+        labels = np.zeros(len(df), dtype=np.int64)
+        for mask in masks.values():
+            labels |= mask
+        with self._lock:
+            self.evaluated += len(df)
+            self.hits.update({name: int(mask.sum()) for name, mask in masks.items()})
+        return labels
+
+    def match(self, record) -> list:
+        """Names of the rules that fire for one record (dict or Series)."""
+        matched = [rule.name for rule in self.rules
+                   if any(OPERATORS[op](record[column], value) for column, op, value in rule.conditions)]
+        with self._lock:
+            self.evaluated += 1
+            self.hits.update(matched)
+        return matched
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'evaluated': self.evaluated, 'hits': {rule.name: self.hits[rule.name] for rule in self.rules}}
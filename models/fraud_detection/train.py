@@ -2,23 +2,46 @@ from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report
 import joblib, os
-from .preprocess import preprocess_data
+from .feature_cache import FEATURE_CACHE_DIR, load_features
+from .flat_forest import FlatForest
+from .utils import encoder_path, flat_forest_path
 
-def train_model(csv_path: str, model_path: str):
-    X, y, df = preprocess_data(csv_path)
+def train_model(csv_path: str | list[str], model_path: str, n_jobs: int = -1,
+                cache_dir: str | None = FEATURE_CACHE_DIR):
+    """
+    Fit the fraud forest on csv_path and save it (plus encoder and FlatForest) at model_path.
+
+    Args:
+        csv_path: CSV path or list of them (see preprocess.read_transactions)
+        model_path: where the model is saved
+        n_jobs: cores to grow trees on (-1: all of them)
+        cache_dir: feature cache (see feature_cache.load_features); None
+            always re-parses the CSV
+    """
+    X, y, encoder = load_features(csv_path, cache_dir=cache_dir)
 
     X_train, X_test, y_train, y_test = train_test_split(
         X, y, test_size=0.2, random_state=42
     )
 
-    clf = RandomForestClassifier(n_estimators=200, random_state=42)
+    # Trees get their seeds up front, so the forest is the same for any n_jobs
+    clf = RandomForestClassifier(n_estimators=200, random_state=42, n_jobs=n_jobs)
     clf.fit(X_train, y_train)
 
     y_pred = clf.predict(X_test)
     print(classification_report(y_test, y_pred))
 
+    # Serving scores a few rows per call; a thread pool per predict costs more than it saves
+    clf.set_params(n_jobs=None)
+
     # ✅ ensure directory exists
     os.makedirs(os.path.dirname(model_path), exist_ok=True)
 
     joblib.dump(clf, model_path)
+    joblib.dump(encoder, encoder_path(model_path))
+    export_flat_forest(clf, model_path)
     print(f"✅ Model saved at {model_path}")
+
+def export_flat_forest(clf, model_path: str):
+    """Save clf as a FlatForest next to model_path for fast small-batch inference."""
+    joblib.dump(FlatForest.from_sklearn(clf), flat_forest_path(model_path))
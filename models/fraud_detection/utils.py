@@ -5,11 +5,41 @@ def save_model(model, path: str):
     os.makedirs(os.path.dirname(path), exist_ok=True)
     joblib.dump(model, path)
 
-def load_model(path: str):
+def load_model(path: str, mmap_mode: str | None = None):
+    """
+    Load a model saved with save_model/joblib.dump.
+
+    mmap_mode='r' memory-maps the numpy arrays stored in the file so several
+    processes share them through the page cache instead of each holding a copy.
+    """
     if not os.path.exists(path):
         raise FileNotFoundError(f"Model file not found: {path}")
+    return joblib.load(path, mmap_mode=mmap_mode)
+
+def encoder_path(model_path: str) -> str:
+    """Path of the feature encoder saved next to a model file."""
+    root, ext = os.path.splitext(model_path)
+    return f"{root}_encoder{ext}"
+
+def flat_forest_path(model_path: str) -> str:
+    """Path of the flattened forest (see flat_forest.FlatForest) saved next to a model file."""
+    root, ext = os.path.splitext(model_path)
+    return f"{root}_flat{ext}"
+
+def load_encoder(model_path: str):
+    """Load the encoder saved alongside model_path, or None if there isn't one."""
+    path = encoder_path(model_path)
+    if not os.path.exists(path):
+        return None
     return joblib.load(path)
 
+def load_flat_forest(model_path: str, mmap_mode: str | None = None):
+    """Load the flattened forest saved alongside model_path, or None if there isn't one."""
+    path = flat_forest_path(model_path)
+    if not os.path.exists(path):
+        return None
+    return joblib.load(path, mmap_mode=mmap_mode)
+
 def print_banner(text: str):
     print("=" * 50)
     print(f" {text}")
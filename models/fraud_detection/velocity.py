@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+
+# Rolling windows in seconds; a window covers (t - span, t], including the row itself
+WINDOWS = {'1m': 60, '1h': 3600, '24h': 86400}
+
+# (feature prefix, key column, counterparty column)
+SIDES = [
+    ('Sender', 'Sender UPI ID', 'Receiver UPI ID'),
+    ('Receiver', 'Receiver UPI ID', 'Sender UPI ID'),
+]
+
+STATS = ['Count', 'Amount', 'Distinct']
+
+VELOCITY_COLUMNS = [f'{side}{stat}{window}' for side, _, _ in SIDES for window in WINDOWS for stat in STATS]
+
+
+def parse_timestamps(df: pd.DataFrame) -> pd.Series:
+    """Timestamp column as datetimes (strings in the CSV layout, or already parsed)."""
+    return pd.to_datetime(df['Timestamp'], format="%d-%m-%Y %H:%M")
+
+
+def epoch_seconds(timestamps: pd.Series) -> np.ndarray:
+    """Datetimes as integer seconds since the epoch."""
+    return timestamps.to_numpy(dtype='datetime64[s]').astype(np.int64)
+
+
+def timestamp_seconds(df: pd.DataFrame) -> np.ndarray:
+    """Timestamp column as integer seconds since the epoch."""
+    return epoch_seconds(parse_timestamps(df))
+
+
+def add_velocity_features(df: pd.DataFrame, windows=WINDOWS, ts: np.ndarray | None = None) -> pd.DataFrame:
+    """
+    Add per-sender and per-receiver rolling window features to df in place.
+
+    For every row and window: number of transactions, amount sum and number
+    of distinct counterparties for the same key within the window ending at
+    the row's timestamp. Rows with equal timestamps count in file order.
+    Fully vectorized: one sort per side, then searchsorted/cumsum per window.
+    ts is timestamp_seconds(df), for callers that have parsed it already.
+    """
+    n = len(df)
+    if ts is None:
+        ts = timestamp_seconds(df)
+    amounts = df['Amount'].to_numpy(dtype=np.float64)
+    positions = np.arange(n)
+    if n == 0:
+        for column in VELOCITY_COLUMNS:
+            df[column] = pd.Series(dtype=np.float64)
+        return df
+
+    t_min = ts.min()
+    span = int(ts.max() - t_min) + max(windows.values()) + 1
+
+    for side, key_column, other_column in SIDES:
+        keys = pd.factorize(df[key_column])[0].astype(np.int64)
+        others = pd.factorize(df[other_column])[0].astype(np.int64)
+
+        # Sort by (key, time); a composite key keeps groups apart for searchsorted
+        order = np.lexsort((positions, ts, keys))
+        k, t, a, o = keys[order], ts[order] - t_min, amounts[order], others[order]
+        composite = k * span + t
+        amount_cumsum = np.concatenate(([0.0], np.cumsum(a)))
+
+        # Next occurrence of the same (key, counterparty) pair in sorted order
+        pair_order = np.lexsort((positions, o, k))
+        same_pair = (k[pair_order][1:] == k[pair_order][:-1]) & (o[pair_order][1:] == o[pair_order][:-1])
+        next_same = np.full(n, n)
+        next_same[pair_order[:-1][same_pair]] = pair_order[1:][same_pair]
+
+        for window, seconds in windows.items():
+            start = np.searchsorted(composite, composite - seconds, side='right')
+            count = positions - start + 1
+            total = amount_cumsum[positions + 1] - amount_cumsum[start]
+
+            # Row j is the latest sighting of its pair for rows [j, min(next_same, expiry))
+            expiry = np.searchsorted(composite, composite + seconds, side='left')
+            delta = np.zeros(n + 1, dtype=np.int64)
+            np.add.at(delta, positions, 1)
+            np.add.at(delta, np.minimum(next_same, expiry), -1)
+            distinct = np.cumsum(delta)[:n]
+
+            for stat, values in (('Count', count), ('Amount', total), ('Distinct', distinct)):
+                column = np.empty(n, dtype=np.float64)
+                column[order] = values
+                df[f'{side}{stat}{window}'] = column
+
+    return df
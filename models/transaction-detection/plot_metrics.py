@@ -1,13 +1,16 @@
 import matplotlib.pyplot as plt
 from sklearn.metrics import roc_curve, auc, accuracy_score
 import joblib
-from models.fraud_detection.preprocess import preprocess_data
+from models.fraud_detection.feature_cache import load_features
+from models.fraud_detection.predict import model_columns
+from models.fraud_detection.utils import load_encoder
 from sklearn.model_selection import train_test_split
 
 def plot_metrics(csv_path: str, model_path: str, output_img: str = "roc_curve.png"):
-    # Load model & preprocess data
+    # Load model & features (cached by train_model when it saw the same file)
     model = joblib.load(model_path)
-    X, y, df = preprocess_data(csv_path)
+    X, y, _ = load_features(csv_path, load_encoder(model_path))
+    X = X[model_columns(model)]
 
     # Train/test split (same as in training)
     X_train, X_test, y_train, y_test = train_test_split(
@@ -16,7 +19,7 @@ def plot_metrics(csv_path: str, model_path: str, output_img: str = "roc_curve.pn
 
     # Predictions
     y_pred = model.predict(X_test)
-    y_proba = model.predict_proba(X_test)[:, 1]  # probability for ROC curve
+    y_proba = model.predict_proba(X_test)[:, 1]  # fraud score for the ROC curve
 
     # Accuracy
     acc = accuracy_score(y_test, y_pred)
@@ -0,0 +1,33 @@
+import time
+import numpy as np
+from models.fraud_detection.flat_forest import FlatForest
+from models.fraud_detection.feature_cache import load_features
+from models.fraud_detection.utils import load_model, load_encoder, load_flat_forest, print_banner
+
+def time_per_call(fn, X, repeat):
+    fn(X)  # warm-up
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(X)
+    return (time.perf_counter() - started) / repeat
+
+def benchmark(csv_path: str, model_path: str, batch_sizes=(1, 8, 32, 128, 1024)):
+    model = load_model(model_path)
+    flat = load_flat_forest(model_path) or FlatForest.from_sklearn(model)
+    X, y, _ = load_features(csv_path, load_encoder(model_path))
+    X = X[list(model.feature_names_in_)]
+
+    # Same answers first, then speed
+    assert np.array_equal(model.predict_proba(X), flat.predict_proba(X)), "FlatForest disagrees with sklearn"
+
+    print_banner("sklearn vs FlatForest (per call)")
+    print(f"{'rows':>6} {'sklearn':>12} {'flat':>12} {'speedup':>8}")
+    for n in batch_sizes:
+        batch = X.iloc[:n]
+        repeat = max(3, 2000 // n)
+        sk = time_per_call(model.predict, batch, repeat)
+        fl = time_per_call(flat.predict, batch.to_numpy(), repeat)
+        print(f"{n:>6} {sk * 1e6:>10.0f}us {fl * 1e6:>10.0f}us {sk / fl:>7.1f}x")
+
+if __name__ == "__main__":
+    benchmark("data/transactions.csv", "model/fraud_model.joblib")
@@ -1,28 +1,30 @@
 import pandas as pd
-from models.fraud_detection.utils import load_model
-import datetime
+from models.fraud_detection.graph import GRAPH_COLUMNS
+from models.fraud_detection.preprocess import build_features
+from models.fraud_detection.utils import load_model, load_encoder
+from models.fraud_detection.velocity import VELOCITY_COLUMNS
 
-def prepare_single_transaction(sender_upi, receiver_upi, amount, state, city, timestamp):
+def prepare_single_transaction(encoder, sender_upi, receiver_upi, amount, state, city, timestamp):
 
-    hour = pd.to_datetime(timestamp, format="%d-%m-%Y %H:%M").hour
-
-    # NOTE: For unseen UPI IDs / states, we’ll just hash them into integers
-    sender_code = abs(hash(sender_upi)) % 10000
-    receiver_code = abs(hash(receiver_upi)) % 10000
-    state_code = abs(hash(state)) % 1000
-    city_code = abs(hash(city)) % 1000
-
-    return pd.DataFrame([{
+    df = pd.DataFrame([{
         "Amount": amount,
-        "Hour": hour,
-        "SenderUPI": sender_code,
-        "ReceiverUPI": receiver_code,
-        "StateCode": state_code,
-        "CityCode": city_code
+        "Sender UPI ID": sender_upi,
+        "Receiver UPI ID": receiver_upi,
+        "State": state,
+        "City": city,
+        "Timestamp": timestamp,
     }])
+    # A lone transaction has no history: zero velocity and graph features,
+    # as the API uses when it has nothing recorded
+    for column in VELOCITY_COLUMNS + GRAPH_COLUMNS:
+        df[column] = 0.0
+
+    # NOTE: Unseen UPI IDs / states get the encoder's stable hashed fallback
+    return build_features(df, encoder)
 
 if __name__ == "__main__":
     model = load_model("model/fraud_model.joblib")
+    encoder = load_encoder("model/fraud_model.joblib")
 
     # 🧪 Some random unseen transactions
     test_transactions = [
@@ -54,7 +56,7 @@ if __name__ == "__main__":
 
     for t in test_transactions:
         df = prepare_single_transaction(
-            t["sender"], t["receiver"], t["amount"],
+            encoder, t["sender"], t["receiver"], t["amount"],
             t["state"], t["city"], t["timestamp"]
         )
         pred = model.predict(df)[0]
@@ -0,0 +1,20 @@
+import pandas as pd
+from models.fraud_detection.encoder import FeatureEncoder
+
+def test_encoder_matches_category_codes():
+    df = pd.read_csv("data/transactions.csv")
+    encoder = FeatureEncoder().fit(df)
+    encoded = encoder.transform(df.copy())
+    expected = df['Sender UPI ID'].astype('category').cat.codes
+    assert (encoded['SenderUPI'] == expected).all()
+
+def test_encoder_single_row_and_unseen_values():
+    df = pd.read_csv("data/transactions.csv")
+    encoder = FeatureEncoder().fit(df)
+    row = df.head(1).copy()
+    known = encoder.transform(row.copy())['SenderUPI'].iloc[0]
+    assert known == encoder.vocabularies['Sender UPI ID'][row['Sender UPI ID'].iloc[0]]
+
+    unseen = encoder.encode_value('Sender UPI ID', 'never-seen@upi')
+    assert unseen >= len(encoder.vocabularies['Sender UPI ID'])
+    assert unseen == encoder.encode_value('Sender UPI ID', 'never-seen@upi')
@@ -0,0 +1,47 @@
+import os
+import shutil
+import numpy as np
+from models.fraud_detection import feature_cache
+from models.fraud_detection.feature_cache import load_features
+from models.fraud_detection.preprocess import preprocess_data, read_feature_source
+from models.fraud_detection.train import train_model
+from models.fraud_detection.utils import load_encoder
+
+def test_compact_reader_gives_the_same_features():
+    X, y, _ = preprocess_data("data/transactions.csv")
+    X_chunked, y_chunked, _ = preprocess_data(read_feature_source("data/transactions.csv", chunksize=777))
+    assert X.equals(X_chunked)
+    assert (y.to_numpy() == y_chunked.to_numpy()).all()
+
+def test_cache_is_keyed_by_content(tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    copy = str(tmp_path / "copy.csv")
+    shutil.copy("data/transactions.csv", copy)
+
+    X, y, encoder = load_features("data/transactions.csv", cache_dir=cache_dir)
+    X_expected, y_expected, _ = preprocess_data("data/transactions.csv")
+    assert np.array_equal(X.to_numpy(), X_expected.to_numpy(dtype=np.float32))
+    assert (y.to_numpy() == y_expected.to_numpy()).all()
+    assert not X.to_numpy().flags.writeable  # a read-only memory map
+
+    # Same bytes under another name: served from the cache without parsing
+    monkeypatch.setattr(feature_cache, "read_feature_source", None)
+    X_copy, _, _ = load_features(copy, cache_dir=cache_dir)
+    assert np.array_equal(X_copy.to_numpy(), X.to_numpy())
+    assert len(os.listdir(cache_dir)) == 1
+
+    monkeypatch.undo()
+    with open(copy, "a") as f:
+        f.write("TXNEXTRA,100,a@upi,b@upi,A,B,9876543210,9876543211,01-01-2025 10:00,Goa,Panaji\n")
+    assert len(load_features(copy, cache_dir=cache_dir)[0]) == len(X) + 1
+    assert len(os.listdir(cache_dir)) == 2
+
+def test_evaluation_reuses_the_training_entry(tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    model_path = str(tmp_path / "model" / "fraud_model.joblib")
+    train_model("data/transactions.csv", model_path, n_jobs=2, cache_dir=cache_dir)
+
+    monkeypatch.setattr(feature_cache, "read_feature_source", None)
+    X, _, encoder = load_features("data/transactions.csv", load_encoder(model_path), cache_dir=cache_dir)
+    assert encoder.vocabularies == load_encoder(model_path).vocabularies
+    assert len(os.listdir(cache_dir)) == 1
@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+from models.fraud_detection.predict import predict_new, predict_records
+from models.fraud_detection.preprocess import build_features
+from models.fraud_detection.train import train_model
+from models.fraud_detection.utils import load_model, load_encoder, load_flat_forest
+
+def test_predict_records_matches_predict_new(tmp_path):
+    model_path = str(tmp_path / "fraud_model.joblib")
+    train_model("data/transactions.csv", model_path, cache_dir=str(tmp_path / "cache"))
+    model = load_model(model_path)
+    encoder = load_encoder(model_path)
+
+    expected = predict_new("data/transactions.csv", model_path)
+    df = pd.read_csv("data/transactions.csv")
+    preds = predict_records(df, model, encoder)
+
+    labels = pd.Series(preds).map({0: "NOT_SUSPICIOUS", 1: "SUSPICIOUS"})
+    assert list(labels) == list(expected['Prediction'])
+    assert len(predict_records(df.head(1).to_dict('records'), model, encoder)) == 1
+
+def test_flat_forest_matches_sklearn(tmp_path):
+    model_path = str(tmp_path / "fraud_model.joblib")
+    train_model("data/transactions.csv", model_path, cache_dir=str(tmp_path / "cache"))
+    model = load_model(model_path)
+    flat = load_flat_forest(model_path, mmap_mode='r')
+
+    df = pd.read_csv("data/transactions.csv")
+    build_features(df, load_encoder(model_path))
+    X = df[list(model.feature_names_in_)]
+
+    assert np.array_equal(flat.predict_proba(X), model.predict_proba(X))
+    assert np.array_equal(flat.predict(X.head(1)), model.predict(X.head(1)))
@@ -0,0 +1,27 @@
+import pandas as pd
+from models.fraud_detection.preprocess import build_features
+from models.fraud_detection.rules import RuleSet, SUSPICIOUS_RULES
+
+def _legacy_rule(row):
+    if row['Amount'] > 50000:
+        return 1
+    if row['Hour'] >= 23 or row['Hour'] <= 5:
+        return 1
+    return 0
+
+def test_vectorized_labels_match_row_rules():
+    df = pd.read_csv("data/transactions.csv")
+    build_features(df)
+    rules = RuleSet()
+    labels = rules.label(df)
+
+    assert labels.tolist() == df.apply(lambda row: 1 if rules.match(row) else 0, axis=1).tolist()
+    # No mule patterns in the sample data, so the original two rules decide
+    assert labels.tolist() == df.apply(_legacy_rule, axis=1).tolist()
+
+def test_rule_hit_counters():
+    rules = RuleSet(SUSPICIOUS_RULES[:2])
+    df = pd.DataFrame({'Amount': [60000, 100, 100], 'Hour': [12, 2, 12]})
+    assert rules.label(df).tolist() == [1, 1, 0]
+    assert rules.match({'Amount': 70000, 'Hour': 23}) == ['high_amount', 'odd_hour']
+    assert rules.stats() == {'evaluated': 4, 'hits': {'high_amount': 2, 'odd_hour': 2}}
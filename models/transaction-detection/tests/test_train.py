@@ -1,7 +1,7 @@
 from models.fraud_detection.train import train_model
 import os
 
-def test_train():
-    model_path = "models/test_model.joblib"
-    train_model("data/transactions.csv", model_path)
+def test_train(tmp_path):
+    model_path = str(tmp_path / "test_model.joblib")
+    train_model("data/transactions.csv", model_path, cache_dir=str(tmp_path / "cache"))
     assert os.path.exists(model_path)
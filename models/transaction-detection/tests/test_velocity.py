@@ -0,0 +1,19 @@
+import pandas as pd
+from models.fraud_detection.velocity import add_velocity_features
+
+def test_velocity_windows():
+    df = pd.DataFrame({
+        'Amount': [100, 200, 300, 400],
+        'Sender UPI ID': ['a@upi', 'a@upi', 'a@upi', 'b@upi'],
+        'Receiver UPI ID': ['x@upi', 'y@upi', 'x@upi', 'x@upi'],
+        'Timestamp': ['01-09-2025 10:00', '01-09-2025 10:00', '01-09-2025 10:30', '01-09-2025 12:00'],
+    })
+    add_velocity_features(df)
+
+    assert df['SenderCount1m'].tolist() == [1, 2, 1, 1]
+    assert df['SenderCount1h'].tolist() == [1, 2, 3, 1]
+    assert df['SenderAmount1h'].tolist() == [100, 300, 600, 400]
+    assert df['SenderDistinct1h'].tolist() == [1, 2, 2, 1]
+    # x@upi hears from a@upi twice and then b@upi after the 1h window has moved on
+    assert df['ReceiverDistinct1h'].tolist() == [1, 1, 1, 1]
+    assert df['ReceiverDistinct24h'].tolist() == [1, 1, 1, 2]
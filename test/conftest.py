@@ -0,0 +1,72 @@
+import pytest
+from app import create_app
+from app.config.database import db
+from app.config.envVars import Config
+from app.services.fraud_service import fraud_service
+from app.services.graph_index import GraphIndex
+from app.services.score_cache import ScoreCache
+from app.services.velocity_store import VelocityStore
+from models.fraud_detection.train import train_model
+
+
+class TestConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = "sqlite://"
+    AUTO_MIGRATE = False
+    PRELOAD_MODEL = False
+    PRELOAD_GRAPH = False
+    # Score inline: a cold model load in a test shouldn't turn into a timeout fallback
+    FRAUD_SCORING_DEADLINE_MS = 0
+
+
+@pytest.fixture
+def app():
+    app = create_app(TestConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture(autouse=True)
+def fresh_fraud_state(monkeypatch):
+    # The service singleton outlives each test's in-memory database
+    monkeypatch.setattr(fraud_service, "velocity", VelocityStore())
+    monkeypatch.setattr(fraud_service, "graph", GraphIndex())
+    monkeypatch.setattr(fraud_service, "cache", ScoreCache())
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture(scope="session")
+def model_path(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("model") / "fraud_model.joblib")
+    train_model("data/transactions.csv", path, cache_dir=str(tmp_path_factory.mktemp("features")))
+    return path
+
+
+@pytest.fixture
+def trained_fraud_service(model_path, monkeypatch):
+    # A different path is a different model file: load_model reloads
+    monkeypatch.setattr(fraud_service, "model_path", model_path)
+    return fraud_service
+
+
+def make_transaction(client, **overrides):
+    payload = {
+        "amount": 1500,
+        "sender_upi_id": "alice@upi",
+        "receiver_upi_id": "bob@upi",
+        "sender_name": "Alice",
+        "receiver_name": "Bob",
+        "sender_phone": "9876543210",
+        "receiver_phone": "9876543211",
+    }
+    payload.update(overrides)
+    response = client.post("/", json=payload)
+    assert response.status_code == 201
+    return response.get_json()
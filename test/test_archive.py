@@ -0,0 +1,67 @@
+import gzip
+from datetime import datetime
+import pandas as pd
+from app.config.database import db
+from app.models.transactions import Transaction
+from app.services.archive import archive_transactions
+from app.services.export import CSV_COLUMNS
+from models.fraud_detection.preprocess import preprocess_data
+
+
+def add(id, timestamp, status):
+    db.session.add(Transaction(
+        id=id, amount=1200, sender_upi_id="alice@upi", receiver_upi_id="bob@upi",
+        sender_name="Alice", receiver_name="Bob", sender_phone="9876543210",
+        receiver_phone="9876543211", timestamp=timestamp, status=status))
+
+
+def test_archive_moves_old_settled_rows_to_monthly_files(app, tmp_path):
+    add("OLD1", datetime(2025, 1, 5, 10, 30), "success")
+    add("OLD2", datetime(2025, 1, 20, 23, 59), "failed")
+    add("OLD3", datetime(2025, 3, 2, 8, 0), "success")
+    add("STUCK", datetime(2025, 1, 9), "pending")
+    add("RECENT", datetime(2025, 6, 1), "success")
+    db.session.commit()
+
+    result = archive_transactions(str(tmp_path), before=datetime(2025, 6, 15))
+
+    assert [(e["month"], e["rows"]) for e in result["archived"]] == [("2025-01", 2), ("2025-03", 1)]
+    assert {t.id for t in Transaction.query.all()} == {"STUCK", "RECENT"}
+
+    january = pd.read_csv(tmp_path / "transactions-2025-01.csv.gz")
+    assert list(january.columns) == CSV_COLUMNS
+    assert list(january["Transaction ID"]) == ["OLD1", "OLD2"]
+    assert january["Timestamp"][1] == "20-01-2025 23:59"
+
+    # The files feed straight into the training pipeline
+    X, y, df = preprocess_data([str(p) for p in sorted(tmp_path.glob("*.csv.gz"))])
+    assert len(X) == 3
+
+
+def test_archiving_a_month_again_adds_a_file(app, tmp_path):
+    add("FIRST", datetime(2025, 1, 5), "success")
+    db.session.commit()
+    archive_transactions(str(tmp_path), before=datetime(2025, 2, 1))
+
+    add("LATE", datetime(2025, 1, 6), "pending")
+    db.session.commit()
+    assert archive_transactions(str(tmp_path), before=datetime(2025, 2, 1))["archived"] == []
+
+    db.session.get(Transaction, "LATE").status = "failed"
+    db.session.commit()
+    entry = archive_transactions(str(tmp_path), before=datetime(2025, 2, 1))["archived"][0]
+    assert entry["path"].endswith("transactions-2025-01.1.csv.gz")
+    with gzip.open(entry["path"], "rt") as f:
+        assert f.read().splitlines()[1].startswith("LATE,")
+    assert not list(tmp_path.glob("*.partial"))
+
+
+def test_maintain_transactions_command(app, tmp_path):
+    add("OLD", datetime(2020, 1, 1), "success")
+    db.session.commit()
+
+    result = app.test_cli_runner().invoke(
+        args=["maintain-transactions", "--retention-months", "1", "--archive-dir", str(tmp_path)])
+    assert result.exit_code == 0, result.output
+    assert "Archived 1 transactions from 2020-01" in result.output
+    assert (tmp_path / "transactions-2020-01.csv.gz").exists()
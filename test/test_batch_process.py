@@ -0,0 +1,61 @@
+import random
+from app.config.database import db
+from app.models.transactions import Transaction
+from conftest import make_transaction
+
+
+def test_batch_process_by_ids(client, trained_fraud_service, monkeypatch):
+    monkeypatch.setattr(random, "random", lambda: 0.0)  # every attempt succeeds
+    ok = make_transaction(client, amount=1500)
+    risky = make_transaction(client, amount=75000)
+    done = make_transaction(client)
+    client.put(f"/{done['id']}/status", json={"status": "failed"})
+
+    response = client.post("/process/batch", json={"ids": [ok["id"], risky["id"], done["id"], "MISSING"]})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["processed"] == 2
+    outcomes = {r["id"]: r["outcome"] for r in body["results"]}
+    assert outcomes == {ok["id"]: "success", risky["id"]: "fraud", done["id"]: "skipped", "MISSING": "not_found"}
+
+    assert db.session.get(Transaction, ok["id"]).status == "success"
+    flagged = db.session.get(Transaction, risky["id"])
+    assert flagged.status == "failed" and flagged.fraud_flag
+
+
+def test_batch_process_oldest_pending(client, monkeypatch):
+    monkeypatch.setattr(random, "random", lambda: 0.99)  # every attempt fails
+    created = [make_transaction(client) for _ in range(3)]
+
+    response = client.post("/process/batch", json={"limit": 2})
+    assert response.status_code == 200
+    results = response.get_json()["results"]
+    assert [r["id"] for r in results] == [t["id"] for t in created[:2]]
+    assert all(r["status"] == "failed" for r in results)
+    assert db.session.get(Transaction, created[2]["id"]).status == "pending"
+
+
+def test_batch_process_validation(client):
+    assert client.post("/process/batch", json={}).status_code == 400
+    assert client.post("/process/batch", json={"ids": ["A"], "limit": 1}).status_code == 400
+    assert client.post("/process/batch", json={"limit": 0}).status_code == 400
+
+
+def test_batch_process_skips_rows_settled_concurrently(client, monkeypatch):
+    from app.services.fraud_service import fraud_service
+    from app.services.transitions import transition
+    monkeypatch.setattr(random, "random", lambda: 0.0)  # every attempt succeeds
+    created = make_transaction(client)
+
+    def concurrent_failure(transactions):
+        # Another request settles the transaction after the batch read it
+        transition(created["id"], "failed")
+        return [{"is_suspicious": False, "score": 0.1, "rules": []} for _ in transactions]
+
+    monkeypatch.setattr(fraud_service, "check_transactions_fraud", concurrent_failure)
+    response = client.post("/process/batch", json={"ids": [created["id"]]})
+    assert response.get_json()["results"] == [
+        {"id": created["id"], "outcome": "skipped", "error": "Transaction is already failed"}
+    ]
+    db.session.expire_all()
+    assert db.session.get(Transaction, created["id"]).status == "failed"
@@ -0,0 +1,45 @@
+import json
+from benchmarks import cases
+from benchmarks.harness import REGISTRY, compare, measure, save_baseline
+
+
+def test_compare_scales_baseline_by_calibration():
+    baseline = {
+        'calibration_s': 1.0,
+        'default_threshold': 1.3,
+        'benchmarks': {'fast': {'seconds': 1.0}, 'slow': {'seconds': 1.0}, 'lenient': {'seconds': 1.0, 'threshold': 3}},
+    }
+    results = {name: {'best': seconds, 'median': seconds}
+               for name, seconds in (('fast', 0.5), ('slow', 2.8), ('lenient', 2.8), ('added', 1.0))}
+
+    # This machine is twice as slow as the one that recorded the baseline
+    verdicts = {row['name']: row['verdict'] for row in compare(results, baseline, calibration=2.0)}
+
+    assert verdicts == {'fast': 'faster', 'slow': 'REGRESSION', 'lenient': 'ok', 'added': 'new'}
+
+
+def test_baseline_from_another_host_only_warns(tmp_path):
+    path = tmp_path / 'baseline.json'
+    save_baseline(path, {'case': {'best': 1.0, 'median': 1.0}}, calibration=1.0)
+    baseline = json.loads(path.read_text())
+    results = {'case': {'best': 2.0, 'median': 2.0}}
+
+    assert compare(results, baseline, 1.0, current_host=baseline['host'])[0]['verdict'] == 'REGRESSION'
+    assert compare(results, baseline, 1.0, current_host='ci-runner')[0]['verdict'] == 'slower'
+
+
+def test_registered_cases_are_unique():
+    names = [bench.name for bench in REGISTRY]
+    assert len(names) == len(set(names))
+    assert {'to_dict[1000]', 'check_transaction_fraud', 'preprocess_data[1M]', 'train_model[10k]'} <= set(names)
+
+
+def test_serialization_cases_run_against_in_memory_app():
+    ctx = cases.BenchContext()
+    try:
+        for name in ('to_dict[1000]', 'GET /?limit=100'):
+            bench = next(b for b in REGISTRY if b.name == name)
+            timing = measure(bench.setup(ctx), repeat=1)
+            assert 0 < timing['best'] <= timing['median']
+    finally:
+        ctx.close()
@@ -0,0 +1,74 @@
+import json
+import app.services.bulk_ingest as bulk_ingest
+from app.models.transactions import Transaction
+
+ROW = {
+    "amount": 1500,
+    "sender_upi_id": "alice@upi",
+    "receiver_upi_id": "bob@upi",
+    "sender_name": "Alice",
+    "receiver_name": "Bob",
+    "sender_phone": "9876543210",
+    "receiver_phone": "9876543211",
+}
+
+
+def test_bulk_json_array_reports_rejects(client, app):
+    app.config["BULK_INSERT_CHUNK_SIZE"] = 2
+    missing = {k: v for k, v in ROW.items() if k != "receiver_name"}
+    rows = [ROW, dict(ROW, amount=0), missing, dict(ROW, amount="abc"), "oops", dict(ROW, amount="99.5")]
+
+    response = client.post("/bulk", json=rows)
+    assert response.status_code == 201
+    body = response.get_json()
+    assert body["inserted"] == 2
+    assert body["rejected"] == [
+        {"index": 1, "error": "Amount must be between 1 and 100,000 rupees"},
+        {"index": 2, "error": "receiver_name is required"},
+        {"index": 3, "error": "Invalid amount format"},
+        {"index": 4, "error": "Row must be a valid JSON object"},
+    ]
+    assert Transaction.query.count() == 2
+    assert all(t.status == "pending" for t in Transaction.query.all())
+
+
+def test_bulk_ndjson_stream(client):
+    body = "\n".join([json.dumps(ROW)] * 3 + ["{not json", ""])
+    response = client.post("/bulk", data=body, content_type="application/x-ndjson")
+    assert response.status_code == 201
+    assert response.get_json() == {
+        "inserted": 3,
+        "rejected": [{"index": 3, "error": "Row must be a valid JSON object"}],
+    }
+
+
+def test_bulk_rejects_non_array(client):
+    assert client.post("/bulk", json={"amount": 1}).status_code == 400
+
+
+def test_bulk_rejects_values_that_do_not_fit_their_columns(client):
+    rows = [dict(ROW, sender_phone="9" * 16), dict(ROW, receiver_upi_id=42), ROW, dict(ROW, sender_name=["A"])]
+    assert client.post("/bulk", json=rows).get_json() == {
+        "inserted": 1,
+        "rejected": [
+            {"index": 0, "error": "sender_phone must be at most 15 characters"},
+            {"index": 1, "error": "receiver_upi_id must be a string"},
+            {"index": 3, "error": "sender_name must be a string"},
+        ],
+    }
+    # A column with no strings at all
+    body = client.post("/bulk", json=[dict(ROW, sender_phone=9876543210)]).get_json()
+    assert body["rejected"] == [{"index": 0, "error": "sender_phone must be a string"}]
+
+
+def test_bulk_database_failure_rejects_only_the_failing_rows(client, app, monkeypatch):
+    app.config["BULK_INSERT_CHUNK_SIZE"] = 5
+    # Rows 1 and 3 reuse row 0's id, so the chunk's INSERT fails as a whole
+    ids = iter(["DUPLICATE", "DUPLICATE", "UNIQUE-1", "DUPLICATE", "UNIQUE-2"])
+    monkeypatch.setattr(bulk_ingest.uuid, "uuid4", lambda: next(ids))
+
+    body = client.post("/bulk", json=[ROW] * 5).get_json()
+    assert body["inserted"] == 3
+    assert [r["index"] for r in body["rejected"]] == [1, 3]
+    assert all(r["error"].startswith("Insert failed: ") for r in body["rejected"])
+    assert {t.id for t in Transaction.query.all()} == {"DUPLICATE", "UNIQUE-1", "UNIQUE-2"}
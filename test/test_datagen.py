@@ -0,0 +1,54 @@
+import pandas as pd
+import pytest
+from datagen.__main__ import main
+from datagen.generator import CSV_COLUMNS, FraudMix, TransactionGenerator
+from models.fraud_detection.preprocess import preprocess_data
+from models.fraud_detection.rules import RuleSet
+
+
+def test_same_seed_same_file(tmp_path):
+    paths = [tmp_path / "a.csv", tmp_path / "b.csv", tmp_path / "c.csv"]
+    for path, seed in zip(paths, (1, 1, 2)):
+        main(["--rows", "5000", "--chunk-size", "2000", "--seed", str(seed), "-o", str(path)])
+    assert paths[0].read_bytes() == paths[1].read_bytes()
+    assert paths[0].read_bytes() != paths[2].read_bytes()
+
+
+def test_output_matches_the_training_layout(tmp_path):
+    path = tmp_path / "synthetic.csv"
+    TransactionGenerator(20_000, seed=0, days=30, chunk_size=7000).write(str(path))
+
+    df = pd.read_csv(path, dtype={"Sender Phone": str, "Receiver Phone": str})
+    assert list(df.columns) == CSV_COLUMNS
+    assert len(df) == 20_000 and df["Transaction ID"].is_unique
+    assert df["Amount"].between(1, 100_000).all()
+    assert (df["Sender UPI ID"] != df["Receiver UPI ID"]).all()
+    assert df["Sender Phone"].str.fullmatch(r"[6-9]\d{9}").all()
+    timestamps = pd.to_datetime(df["Timestamp"], format="%d-%m-%Y %H:%M")
+    assert timestamps.is_monotonic_increasing
+    assert timestamps.min() >= pd.Timestamp(2025, 1, 1) and timestamps.max() < pd.Timestamp(2025, 1, 31)
+
+    X, y, _ = preprocess_data(str(path))
+    assert len(X) == 20_000
+
+
+def test_fraud_mix_controls_the_rules_that_fire(tmp_path):
+    path = tmp_path / "mules.csv"
+    mix = FraudMix(fan_out=0.05, fan_in=0, night=0, high_amount=0.02)
+    counts = TransactionGenerator(20_000, seed=0, mix=mix).write(str(path))
+    assert counts["fan_in"] == counts["night"] == 0
+    assert counts["high_amount"] == 400
+
+    _, _, df = preprocess_data(str(path))
+    rules = RuleSet()
+    rules.label(df)
+    hits = rules.stats()["hits"]
+    assert hits["high_amount"] == 400
+    # Every burst row from the fifth receiver on trips the rule
+    assert hits["mule_fan_out"] >= counts["fan_out"] * 0.4
+    assert hits["mule_fan_in"] < hits["mule_fan_out"] / 10
+
+
+def test_rejects_impossible_mix():
+    with pytest.raises(ValueError):
+        TransactionGenerator(10, mix=FraudMix(fan_out=0.6, fan_in=0.6))
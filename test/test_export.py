@@ -0,0 +1,51 @@
+import io
+import json
+import pandas as pd
+from conftest import make_transaction
+from models.fraud_detection.preprocess import preprocess_data
+
+
+def test_export_ndjson_streams_all_rows(client, app):
+    app.config["EXPORT_BATCH_SIZE"] = 2
+    created = [make_transaction(client, amount=100 + i) for i in range(5)]
+
+    response = client.get("/export")
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert rows == created
+
+
+def test_export_csv_matches_training_layout(client):
+    make_transaction(client, amount=25000.5)
+    make_transaction(client, amount=60000)
+
+    response = client.get("/export?format=csv")
+    df = pd.read_csv(io.StringIO(response.get_data(as_text=True)))
+    assert list(df.columns) == list(pd.read_csv("data/transactions.csv", nrows=0).columns)
+    assert df["Amount"].tolist() == [25000.5, 60000]
+
+    X, y, _ = preprocess_data(df)
+    assert len(X) == 2 and y.tolist() == [0, 1]
+
+
+def test_export_cli_writes_file(client, app, tmp_path):
+    make_transaction(client)
+    output = tmp_path / "export.csv"
+    result = app.test_cli_runner().invoke(args=["export-transactions", "--output", str(output)])
+    assert result.exit_code == 0, result.output
+    assert len(pd.read_csv(output)) == 1
+
+
+def test_export_rejects_unknown_format(client):
+    assert client.get("/export?format=xml").status_code == 400
+
+
+def test_export_ndjson_sparse_fieldset(client):
+    created = make_transaction(client, amount=99.5)
+
+    response = client.get("/export?fields=timestamp,amount")
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert rows == [{"amount": 99.5, "timestamp": created["timestamp"]}]
+
+    assert client.get("/export?format=csv&fields=id").status_code == 400
@@ -0,0 +1,162 @@
+import os
+import threading
+import time
+from datetime import datetime
+from prometheus_client import REGISTRY
+from types import SimpleNamespace
+import app.services.fraud_service as fraud_module
+from app.services.score_cache import ScoreCache
+from conftest import make_transaction
+
+
+def _transaction(id, amount=1500, hour=14):
+    return SimpleNamespace(id=id, amount=amount, sender_upi_id="alice@upi", receiver_upi_id="bob@upi",
+                           timestamp=datetime(2025, 9, 1, hour, 0))
+
+
+def test_scores_are_in_range_and_cached(app, trained_fraud_service):
+    service = trained_fraud_service
+    first = service.check_transaction_fraud(_transaction("T1"))
+    assert 0.0 <= first["score"] <= 1.0
+    assert first["is_suspicious"] == (first["score"] >= service.threshold)
+    assert (first["path"], first["fallback"]) == ("model", None)
+    assert service.cache.stats()["misses"] == 1
+
+    # A retry of the same transaction has the same feature vector: no model call
+    assert service.check_transaction_fraud(_transaction("T1")) == dict(first, path="cache")
+    assert service.cache.stats()["hits"] == 1
+
+
+def test_rules_flag_before_model(app, trained_fraud_service):
+    result = trained_fraud_service.check_transaction_fraud(_transaction("T2", amount=75000))
+    assert result == {"is_suspicious": True, "score": 1.0, "rules": ["high_amount"], "path": "rules",
+                      "fallback": None}
+
+
+def test_cache_invalidated_when_model_file_changes(app, trained_fraud_service):
+    service = trained_fraud_service
+    service.check_transaction_fraud(_transaction("T3"))
+    assert service.cache.stats()["size"] == 1
+
+    stat = os.stat(service.model_path)
+    os.utime(service.model_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    service.check_transaction_fraud(_transaction("T3"))
+    assert service.cache.stats()["size"] == 1
+    assert service.cache.stats()["hits"] == 0
+
+
+def test_score_cache_lru_and_ttl():
+    now = [0.0]
+    cache = ScoreCache(max_size=2, ttl=10, clock=lambda: now[0])
+    cache.put("a", 0.1)
+    cache.put("b", 0.2)
+    assert cache.get("a") == 0.1
+    cache.put("c", 0.3)  # evicts b, the least recently used
+    assert cache.get("b") is None
+    now[0] = 11
+    assert cache.get("a") is None
+    assert cache.stats() == {"size": 1, "hits": 1, "misses": 2, "evictions": 1, "hit_rate": 1 / 3}
+
+
+def test_deadline_falls_back_to_rules(app, trained_fraud_service, monkeypatch):
+    service = trained_fraud_service
+    service.load_model()
+    monkeypatch.setattr(service, "deadline", 0.05)
+    release = threading.Event()
+    real_scores = service._scores
+
+    def slow_scores(records, loaded):
+        release.wait(5)
+        return real_scores(records, loaded)
+    monkeypatch.setattr(service, "_scores", slow_scores)
+
+    started = time.perf_counter()
+    result = service.check_transaction_fraud(_transaction("T4"))
+    assert time.perf_counter() - started < 1
+    assert result == {"is_suspicious": False, "score": None, "rules": [], "path": "rules", "fallback": "timeout"}
+    # Rules still flag what they can while the model is stuck
+    assert service.check_transaction_fraud(_transaction("T5", hour=2))["rules"] == ["odd_hour"]
+
+    # The timed-out call finishes in the background and fills the score cache
+    release.set()
+    service._executor.shutdown(wait=True)
+    monkeypatch.setattr(service, "_executor", None)
+    monkeypatch.setattr(service, "_scores", real_scores)
+    assert service.check_transaction_fraud(_transaction("T4"))["path"] == "cache"
+
+    # No free slot in the executor: fall back without waiting
+    monkeypatch.setattr(service, "max_pending", 0)
+    monkeypatch.setattr(service, "_executor", None)
+    before = _decisions("rules", "busy")
+    assert service.check_transaction_fraud(_transaction("T6"))["fallback"] == "busy"
+    assert _decisions("rules", "busy") == before + 1
+
+
+def test_model_errors_fall_back_instead_of_allowing(app, trained_fraud_service, monkeypatch):
+    def broken(records, loaded):
+        raise ValueError("corrupt model")
+    monkeypatch.setattr(trained_fraud_service, "_scores", broken)
+    before = _decisions("rules", "error")
+    result = trained_fraud_service.check_transaction_fraud(_transaction("T7"))
+    assert (result["path"], result["fallback"], result["score"]) == ("rules", "error", None)
+    assert _decisions("rules", "error") == before + 1
+
+
+
+def test_concurrent_callers_share_one_model_load(app, trained_fraud_service, monkeypatch):
+    service = trained_fraud_service
+    calls = []
+    real_load = fraud_module.load_model
+
+    def slow_load(*args):
+        calls.append(threading.current_thread().name)
+        time.sleep(0.05)
+        return real_load(*args)
+    monkeypatch.setattr(fraud_module, "load_model", slow_load)
+    stat = os.stat(service.model_path)
+    os.utime(service.model_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000_000))
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(service.load_model())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # One load; everyone gets the same model, encoder and flattened forest together
+    assert len(calls) == 1
+    assert len({id(loaded) for loaded in results}) == 1 and results[0].encoder is not None
+
+
+def test_bootstrap_counts_against_the_deadline(client, trained_fraud_service, monkeypatch):
+    service = trained_fraud_service
+    make_transaction(client, sender_upi_id="fan@upi", receiver_upi_id="x@upi")
+    # Creating a transaction doesn't bootstrap the stores; the first scoring call does
+    assert not service.velocity.loaded and not service.graph.loaded
+
+    service.load_model()
+    monkeypatch.setattr(service, "deadline", 0.05)
+    release = threading.Event()
+    real_load_velocity = service.load_velocity
+
+    def slow_load_velocity():
+        release.wait(5)
+        real_load_velocity()
+    monkeypatch.setattr(service, "load_velocity", slow_load_velocity)
+
+    started = time.perf_counter()
+    result = service.check_transaction_fraud(_transaction("T8"))
+    assert time.perf_counter() - started < 1
+    assert (result["path"], result["fallback"]) == ("rules", "timeout")
+    # Rules still run, on zeros for the features that aren't loaded yet
+    assert service.check_transaction_fraud(_transaction("T9", amount=75000))["rules"] == ["high_amount"]
+
+    # The bootstrap finishes in the background, reading the table from its own app context
+    release.set()
+    service._executor.shutdown(wait=True)
+    monkeypatch.setattr(service, "_executor", None)
+    assert service.velocity.loaded and service.graph.stats()["accounts"] == 2
+    assert service.check_transaction_fraud(_transaction("T8"))["path"] == "model"
+
+
+def _decisions(path, fallback):
+    return REGISTRY.get_sample_value("fraud_decisions_total", {"path": path, "fallback": fallback}) or 0
@@ -0,0 +1,120 @@
+import random
+import threading
+from datetime import datetime, timedelta
+import pandas as pd
+from app.services.fraud_service import fraud_service
+from app.services.graph_index import GraphIndex
+from models.fraud_detection.graph import GRAPH_COLUMNS, TransactionGraph, add_graph_features
+from conftest import make_transaction
+
+
+def test_online_index_matches_offline_features():
+    rng = random.Random(7)
+    accounts = [f'{name}@upi' for name in 'abcdefghij']
+    timestamp = datetime(2025, 9, 1)
+    rows = []
+    for i in range(300):
+        timestamp += timedelta(minutes=rng.randint(0, 3))
+        sender, receiver = rng.sample(accounts, 2)
+        rows.append({'Transaction ID': f'T{i}', 'Sender UPI ID': sender, 'Receiver UPI ID': receiver,
+                     'Timestamp': timestamp})
+
+    index = GraphIndex()
+    online = [index.record(r['Transaction ID'], r['Sender UPI ID'], r['Receiver UPI ID']) for r in rows]
+    # Recording a known transaction again returns its original snapshot
+    assert index.record('T0', 'a@upi', 'b@upi') == online[0]
+
+    df = pd.DataFrame(rows)
+    df['Timestamp'] = df['Timestamp'].dt.strftime("%d-%m-%Y %H:%M")
+    add_graph_features(df)
+    pd.testing.assert_frame_equal(pd.DataFrame(online)[GRAPH_COLUMNS], df[GRAPH_COLUMNS])
+
+
+def test_offline_features_match_a_replay():
+    # Self-payments, repeat payments and equal timestamps out of file order
+    rng = random.Random(11)
+    accounts = [f'{name}@upi' for name in 'abcdef']
+    df = pd.DataFrame({
+        'Sender UPI ID': [rng.choice(accounts) for _ in range(400)],
+        'Receiver UPI ID': [rng.choice(accounts) for _ in range(400)],
+        'Timestamp': [f'0{rng.randint(1, 3)}-09-2025 10:0{rng.randint(0, 9)}' for _ in range(400)],
+    })
+    add_graph_features(df)
+
+    graph = TransactionGraph()
+    order = pd.to_datetime(df['Timestamp'], format='%d-%m-%Y %H:%M').sort_values(kind='stable').index
+    expected = pd.DataFrame(index=df.index, columns=GRAPH_COLUMNS, dtype=float)
+    for i in order:
+        expected.loc[i] = graph.row(*graph.add(df.at[i, 'Sender UPI ID'], df.at[i, 'Receiver UPI ID']))
+    pd.testing.assert_frame_equal(df[GRAPH_COLUMNS], expected)
+
+
+def test_two_hop_and_shared_counterparties():
+    graph = TransactionGraph()
+    # Three victims pay a mule, which forwards to two cash-out accounts
+    for victim in ['v1', 'v2', 'v3']:
+        graph.add(victim, 'mule')
+    graph.add('mule', 'out1')
+    graph.add('mule', 'out2')
+    graph.add('mule', 'out2')  # a repeat payment adds no edge
+    graph.add('v1', 'out1')
+
+    v1, mule, v2 = graph.node('v1'), graph.node('mule'), graph.node('v2')
+    assert (len(graph.into[mule]), len(graph.out[mule])) == (3, 2)
+    assert graph.edge_count == 6
+    assert graph.two_hop[v1] == 2 and graph.two_hop[v2] == 2
+    assert graph.shared_counterparties(v1, mule) == 1  # out1
+    assert graph.shared_counterparties(v1, v2) == 1    # mule
+
+
+def test_endpoint_bootstraps_from_database(client):
+    for sender in ['s1@upi', 's2@upi', 's3@upi']:
+        make_transaction(client, sender_upi_id=sender, receiver_upi_id='mule@upi')
+    make_transaction(client, sender_upi_id='mule@upi', receiver_upi_id='cash@upi')
+
+    # A fresh worker: the index is rebuilt from the table on first use
+    fraud_service.graph = GraphIndex()
+    response = client.get('/graph/mule@upi?counterparty=s1@upi')
+    assert response.status_code == 200
+    assert response.get_json() == {'upi_id': 'mule@upi', 'fan_in': 3, 'fan_out': 1, 'two_hop_paths': 0,
+                                   'counterparty': 's1@upi', 'shared_counterparties': 0}
+    assert client.get('/graph/s1@upi').get_json()['two_hop_paths'] == 1
+    assert client.get('/graph/nobody@upi').status_code == 404
+    assert client.get('/graph').get_json() == {'loaded': True, 'accounts': 5, 'edges': 4}
+
+    # New transactions update the index in place
+    make_transaction(client, sender_upi_id='mule@upi', receiver_upi_id='cash2@upi')
+    assert client.get('/graph/s2@upi').get_json()['two_hop_paths'] == 2
+
+
+def test_endpoint_answers_503_while_the_index_loads(client, monkeypatch):
+    make_transaction(client, sender_upi_id='s1@upi', receiver_upi_id='mule@upi')
+    monkeypatch.setattr(fraud_service, 'deadline', 0.05)
+    release = threading.Event()
+    real_load_graph = fraud_service.load_graph
+    calls = []
+
+    def slow_load_graph():
+        calls.append(1)
+        release.wait(5)
+        return real_load_graph()
+    monkeypatch.setattr(fraud_service, 'load_graph', slow_load_graph)
+
+    # The request thread never reads the table; repeated requests share one bootstrap
+    for _ in range(2):
+        response = client.get('/graph')
+        assert response.status_code == 503 and response.headers['Retry-After'] == '5'
+    release.set()
+    fraud_service._executor.shutdown(wait=True)
+    monkeypatch.setattr(fraud_service, '_executor', None)
+    assert calls == [1]
+    assert client.get('/graph/mule@upi').get_json()['fan_in'] == 1
+
+
+def test_bootstrap_from_csv():
+    index = GraphIndex()
+    assert index.rebuild_from_csv('data/transactions.csv') > 0
+    df = pd.read_csv('data/transactions.csv')
+    sender = df['Sender UPI ID'].iloc[0]
+    expected = df.loc[df['Sender UPI ID'] == sender, 'Receiver UPI ID'].nunique()
+    assert index.account(sender)['fan_out'] == expected
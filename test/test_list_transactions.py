@@ -0,0 +1,69 @@
+from conftest import make_transaction
+
+
+def test_list_paginates_newest_first(client):
+    created = [make_transaction(client, amount=100 + i) for i in range(5)]
+
+    seen, cursor = [], None
+    while True:
+        query = {"limit": 2} if cursor is None else {"limit": 2, "cursor": cursor}
+        body = client.get("/", query_string=query).get_json()
+        seen.extend(t["id"] for t in body["transactions"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == [t["id"] for t in reversed(created)]
+
+
+def test_list_filters(client):
+    make_transaction(client, sender_upi_id="carol@upi")
+    other = make_transaction(client)
+    client.put(f"/{other['id']}/status", json={"status": "failed"})
+
+    body = client.get("/?sender_upi_id=carol@upi").get_json()
+    assert [t["sender_upi_id"] for t in body["transactions"]] == ["carol@upi"]
+
+    body = client.get("/?status=failed&fraud_flag=false").get_json()
+    assert [t["id"] for t in body["transactions"]] == [other["id"]]
+
+    assert client.get("/?since=2000-01-01T00:00:00&until=2000-01-02T00:00:00").get_json()["transactions"] == []
+
+
+def test_list_rejects_bad_params(client):
+    assert client.get("/?limit=0").status_code == 400
+    assert client.get("/?cursor=not-a-cursor").status_code == 400
+    assert client.get("/?fraud_flag=maybe").status_code == 400
+
+
+def test_list_body_identical_to_to_dict(app, client):
+    from flask import jsonify
+    from app.models.transactions import Transaction
+
+    for i in range(3):
+        created = make_transaction(client, amount=100.25 + i, sender_name="Zoë")
+    client.put(f"/{created['id']}/status", json={"status": "success"})
+
+    response = client.get("/?limit=2")
+    transactions = Transaction.query.order_by(Transaction.timestamp.desc(), Transaction.id.desc()).limit(2)
+    expected = jsonify({
+        "transactions": [t.to_dict() for t in transactions],
+        "next_cursor": response.get_json()["next_cursor"],
+    })
+    assert response.get_data() == expected.get_data()
+
+
+def test_list_sparse_fieldset(client):
+    make_transaction(client)
+    make_transaction(client)
+
+    body = client.get("/?fields=status,id,amount&limit=1").get_json()
+    assert [list(t) for t in body["transactions"]] == [["amount", "id", "status"]]
+    assert body["next_cursor"] is not None
+    # The cursor still works without timestamp in the fieldset
+    rest = client.get("/", query_string={"fields": "id", "cursor": body["next_cursor"]}).get_json()
+    assert len(rest["transactions"]) == 1
+
+    response = client.get("/?fields=id,password")
+    assert response.status_code == 400
+    assert "password" in response.get_json()["error"]
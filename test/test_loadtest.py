@@ -0,0 +1,61 @@
+import threading
+import pytest
+from werkzeug.serving import make_server
+from app import create_app
+from app.config.database import db
+from conftest import TestConfig
+from loadtest.runner import LoadRunner
+from loadtest.stats import format_report
+from loadtest.workload import Mix, read_payloads, replay
+
+
+@pytest.fixture
+def server(tmp_path):
+    class FileConfig(TestConfig):
+        # A file so the server threads share one database
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'load.db'}"
+
+    app = create_app(FileConfig)
+    with app.app_context():
+        db.create_all()
+    httpd = make_server('127.0.0.1', 0, app, threaded=True)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_port}'
+    httpd.shutdown()
+
+
+def test_replay_extends_the_file_with_jittered_amounts():
+    originals = list(read_payloads('data/transactions.csv'))
+    payloads = list(replay('data/transactions.csv', total=len(originals) + 5, seed=1))
+
+    assert len(payloads) == len(originals) + 5
+    assert payloads[:len(originals)] == originals
+    extra = payloads[len(originals)]
+    assert extra['sender_upi_id'] == originals[0]['sender_upi_id']
+    assert 1 <= extra['amount'] <= 100000
+
+
+def test_closed_loop_reports_every_endpoint(server):
+    runner = LoadRunner(server, replay('data/transactions.csv', total=40), Mix(process=0.5, status=1.0),
+                        concurrency=4)
+    summary = runner.run()
+
+    endpoints = summary['endpoints']
+    assert endpoints['POST /']['count'] == 40
+    assert endpoints['POST /']['statuses'] == {'201': 40}
+    follow_ups = endpoints['POST /<id>/process']['count'] + endpoints['PUT /<id>/status']['count']
+    assert follow_ups == 40
+    assert summary['total']['error_rate'] == 0
+    assert summary['total']['p50_ms'] <= summary['total']['p99_ms'] <= summary['total']['max_ms']
+    assert 'POST /<id>/process' in format_report(summary)
+
+
+def test_open_loop_paces_requests(server):
+    runner = LoadRunner(server, replay('data/transactions.csv', total=10), Mix(process=0, status=0),
+                        concurrency=4, rate=100)
+    summary = runner.run()
+
+    assert summary['endpoints']['POST /']['count'] + summary['dropped'] == 10
+    # 10 arrivals at 100/s take at least 90ms to schedule
+    assert summary['elapsed_s'] >= 0.09
@@ -0,0 +1,82 @@
+import os
+import subprocess
+import sys
+import textwrap
+from conftest import make_transaction
+
+
+def _sample(text, name, **labels):
+    """Value of the first sample called name whose labels include labels."""
+    for line in text.splitlines():
+        if line.startswith(name + '{') or line.startswith(name + ' '):
+            if all(f'{k}="{v}"' in line for k, v in labels.items()):
+                return float(line.rsplit(' ', 1)[1])
+    return None
+
+
+def test_metrics_report_route_latency_and_sql(client):
+    before = client.get('/metrics').get_data(as_text=True)
+    created = make_transaction(client)
+    client.get(f"/{created['id']}")
+
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.content_type.startswith('text/plain')
+    text = response.get_data(as_text=True)
+
+    route = dict(method='GET', route='/<transaction_id>')
+    count_before = _sample(before, 'http_request_duration_seconds_count', status='200', **route) or 0
+    assert _sample(text, 'http_request_duration_seconds_count', status='200', **route) == count_before + 1
+    assert _sample(text, 'http_request_duration_seconds_count', method='POST', route='/', status='201') >= 1
+    # The GET ran at least one SELECT, and its time was attributed to the route
+    assert _sample(text, 'http_request_db_queries_sum', **route) >= 1
+    assert _sample(text, 'http_request_db_seconds_sum', **route) > 0
+
+
+def test_metrics_report_inference_and_cache(app, trained_fraud_service):
+    from datetime import datetime
+    from types import SimpleNamespace
+    from app.utils.metrics import render_metrics
+
+    transaction = SimpleNamespace(id='M1', amount=1500, sender_upi_id='a@upi', receiver_upi_id='b@upi',
+                                  timestamp=datetime(2025, 9, 1, 14))
+    trained_fraud_service.check_transaction_fraud(transaction)
+    trained_fraud_service.check_transaction_fraud(transaction)
+
+    text = render_metrics()[0].decode()
+    assert _sample(text, 'fraud_inference_batch_size_count', engine='flat_forest') >= 1
+    assert _sample(text, 'fraud_score_cache_lookups_total', result='hit') >= 1
+    assert _sample(text, 'fraud_model_load_seconds') > 0
+
+
+WORKER = textwrap.dedent('''
+    import sys
+    sys.path.insert(0, "test")
+    from conftest import TestConfig
+    from app import create_app
+    from app.config.database import db
+
+    app = create_app(TestConfig)
+    with app.app_context():
+        db.create_all()
+    client = app.test_client()
+    for _ in range({requests}):
+        assert client.get("/?limit=1").status_code == 200
+    if {scrape}:
+        print(client.get("/metrics").get_data(as_text=True))
+''')
+
+
+def test_metrics_aggregate_across_processes(tmp_path):
+    env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=str(tmp_path))
+
+    def run(requests, scrape=False):
+        return subprocess.run([sys.executable, '-c', WORKER.format(requests=requests, scrape=scrape)],
+                              env=env, capture_output=True, text=True, check=True).stdout
+
+    run(2)
+    run(3)
+    text = run(1, scrape=True)
+
+    # Two exited "workers" plus the scraping one
+    assert _sample(text, 'http_request_duration_seconds_count', method='GET', route='/', status='200') == 6
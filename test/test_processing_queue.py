@@ -0,0 +1,48 @@
+import random
+import pytest
+from app.config.database import db
+from app.models.transactions import Transaction
+from app.services.processing_queue import ProcessingQueue
+from conftest import make_transaction
+
+
+@pytest.fixture
+def queue(app, monkeypatch):
+    app.config.update(PROCESS_ASYNC=True, PROCESS_QUEUE_BATCH_SIZE=3,
+                      PROCESS_QUEUE_MAX_WAIT_MS=200, PROCESS_QUEUE_WORKERS=1)
+    processing_queue = ProcessingQueue()
+    processing_queue.init_app(app)
+    monkeypatch.setattr("app.routes.transaction.processing_queue", processing_queue)
+    yield processing_queue
+    processing_queue.stop()
+
+
+def test_async_process_returns_202_and_settles_in_batches(client, queue, monkeypatch):
+    monkeypatch.setattr(random, "random", lambda: 0.99)  # every attempt fails
+    created = [make_transaction(client) for _ in range(5)]
+
+    for t in created:
+        response = client.post(f"/{t['id']}/process")
+        assert response.status_code == 202
+        assert response.headers["Location"] == f"/{t['id']}"
+    queue.join()
+
+    db.session.expire_all()
+    assert all(db.session.get(Transaction, t["id"]).status == "failed" for t in created)
+    stats = client.get("/process/queue").get_json()
+    assert stats["processed"] == 5 and stats["depth"] == 0
+    assert stats["max_batch_size"] <= 3 and stats["batches"] >= 2
+
+
+def test_max_depth_comes_from_config(app, monkeypatch):
+    app.config["PROCESS_QUEUE_MAX_DEPTH"] = 1
+    processing_queue = ProcessingQueue()
+    processing_queue.init_app(app)
+    monkeypatch.setattr(processing_queue, "_ensure_started", lambda: None)  # nothing drains it
+
+    assert processing_queue.submit("T1")
+    assert not processing_queue.submit("T2")
+
+
+def test_async_process_still_validates(client, queue):
+    assert client.post("/MISSING/process").status_code == 404
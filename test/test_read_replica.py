@@ -0,0 +1,71 @@
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import insert
+from app import create_app
+from app.config.database import READ_BIND, InstrumentedQueuePool, db
+from app.models.transactions import Transaction
+from conftest import TestConfig, make_transaction
+
+
+@pytest.fixture
+def replica_app(tmp_path):
+    class ReplicaConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'primary.db'}"
+        DATABASE_READ_URL = f"sqlite:///{tmp_path / 'replica.db'}"
+        DB_POOL_SIZE = 2
+        DB_MAX_OVERFLOW = 1
+
+    app = create_app(ReplicaConfig)
+    with app.app_context():
+        db.create_all()
+        # Stands in for a replica that hasn't caught up: same schema, no rows
+        db.metadata.create_all(app.extensions[READ_BIND])
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+        app.extensions[READ_BIND].dispose()
+
+
+def test_reads_use_replica_until_the_client_writes(replica_app):
+    created = make_transaction(replica_app.test_client())
+
+    # A client that hasn't written reads the (lagging) replica
+    fresh = replica_app.test_client()
+    assert fresh.get("/").get_json()["transactions"] == []
+    # ...but a single transaction missing there is re-read from the primary
+    assert fresh.get(f"/{created['id']}").get_json() == created
+
+    # Right after a write, the writer reads the primary
+    writer = replica_app.test_client()
+    mine = make_transaction(writer, amount=99)
+    ids = [t["id"] for t in writer.get("/").get_json()["transactions"]]
+    assert set(ids) == {created["id"], mine["id"]}
+
+
+def test_replica_rows_are_served_without_the_primary(replica_app):
+    row = {"id": "TXNREPLICA", "amount": 10, "sender_upi_id": "a@upi", "receiver_upi_id": "b@upi",
+           "sender_name": "A", "receiver_name": "B", "sender_phone": "1", "receiver_phone": "2",
+           "status": "pending"}
+    with replica_app.extensions[READ_BIND].begin() as conn:
+        conn.execute(insert(Transaction.__table__), [row])
+
+    body = replica_app.test_client().get("/").get_json()
+    assert [t["id"] for t in body["transactions"]] == ["TXNREPLICA"]
+
+
+def test_pool_settings_and_metrics(replica_app):
+    pool = db.engine.pool
+    assert isinstance(pool, InstrumentedQueuePool)
+    assert pool.size() == 2 and pool.bind == "primary"
+    assert replica_app.extensions[READ_BIND].pool.bind == READ_BIND
+
+    replica_app.test_client().get("/")
+    assert REGISTRY.get_sample_value("db_pool_capacity", {"bind": READ_BIND}) >= 3
+    assert REGISTRY.get_sample_value("db_pool_checkout_wait_seconds_count", {"bind": READ_BIND}) >= 1
+    with db.engine.connect():
+        assert REGISTRY.get_sample_value("db_pool_connections_in_use", {"bind": "primary"}) >= 1
+
+
+def test_in_memory_sqlite_keeps_static_pool(app):
+    assert not isinstance(db.engine.pool, InstrumentedQueuePool)
+    assert READ_BIND not in app.extensions
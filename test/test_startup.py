@@ -0,0 +1,62 @@
+import flask_migrate
+import pytest
+import app as app_module
+from app import create_app
+from app.config.database import run_migrations
+from conftest import TestConfig
+
+
+@pytest.fixture
+def file_config(tmp_path):
+    class FileConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'startup.db'}"
+    return FileConfig
+
+
+def test_run_migrations_only_upgrades_when_behind_head(file_config, monkeypatch):
+    app = create_app(file_config)
+    upgrades = []
+    monkeypatch.setattr(flask_migrate, "upgrade", lambda directory: upgrades.append(directory))
+
+    # Fresh database: no alembic_version yet
+    assert run_migrations(app) is True
+    assert len(upgrades) == 1
+
+    with app.app_context():
+        flask_migrate.stamp(upgrades[0])
+    assert run_migrations(app) is False
+    assert len(upgrades) == 1
+
+
+def test_create_app_reports_startup_phases(app):
+    timer = app.extensions["startup"]
+    assert {"config", "routes", "fraud_model", "processing_queue"} <= set(timer.phases)
+    # AUTO_MIGRATE is off in tests
+    assert "migrations" not in timer.phases
+    assert timer.report().startswith("Startup took")
+
+
+def test_gunicorn_workers_skip_migrations(file_config, monkeypatch):
+    class MigratingConfig(file_config):
+        AUTO_MIGRATE = True
+
+    calls = []
+    monkeypatch.setattr(app_module, "run_migrations", calls.append)
+    monkeypatch.setenv("GUNICORN_WORKER", "1")
+    worker_app = create_app(MigratingConfig)
+    assert calls == []
+    assert "migrations" not in worker_app.extensions["startup"].phases
+
+    monkeypatch.delenv("GUNICORN_WORKER")
+    create_app(MigratingConfig)
+    assert len(calls) == 1
+
+
+def test_preflight_command(file_config, monkeypatch):
+    app = create_app(file_config)
+    monkeypatch.setattr(flask_migrate, "upgrade", lambda directory: None)
+
+    result = app.test_cli_runner().invoke(args=["preflight"])
+    assert result.exit_code == 0, result.output
+    assert "Migrations applied." in result.output
+    assert "Startup took" in result.output
@@ -0,0 +1,77 @@
+from app.config.database import db
+from app.models.transactions import Transaction
+from app.services.transaction_cache import TransactionCache, transaction_cache
+from conftest import make_transaction
+
+
+def test_pending_transaction_revalidates_with_etag(client):
+    created = make_transaction(client)
+    url = f"/{created['id']}"
+
+    first = client.get(url)
+    assert first.status_code == 200
+    assert first.headers["Cache-Control"] == "no-cache"
+    etag = first.headers["ETag"]
+
+    not_modified = client.get(url, headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.get_data() == b""
+    assert transaction_cache.stats()["size"] == 0
+
+    # Once it changes, the old ETag no longer matches
+    assert client.put(f"{url}/status", json={"status": "failed"}).status_code == 200
+    changed = client.get(url, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.get_json()["status"] == "failed"
+
+
+def test_terminal_transaction_served_from_cache(app, client):
+    created = make_transaction(client)
+    url = f"/{created['id']}"
+    client.put(f"{url}/status", json={"status": "failed"})
+
+    first = client.get(url)
+    assert first.headers["Cache-Control"] == "public, max-age=86400, immutable"
+    assert transaction_cache.stats()["size"] == 1
+
+    # Gone from the database, still answered from memory
+    db.session.delete(db.session.get(Transaction, created["id"]))
+    db.session.commit()
+    cached = client.get(url)
+    assert cached.status_code == 200
+    assert cached.get_json() == first.get_json()
+    assert cached.headers["ETag"] == first.headers["ETag"]
+    assert cached.headers["Cache-Control"] == first.headers["Cache-Control"]
+    assert client.get(url, headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
+
+
+def test_list_page_honours_if_none_match(client):
+    make_transaction(client)
+    first = client.get("/?limit=10")
+    assert client.get("/?limit=10", headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
+
+    make_transaction(client)
+    assert client.get("/?limit=10", headers={"If-None-Match": first.headers["ETag"]}).status_code == 200
+
+
+def test_cache_is_bounded_lru():
+    cache = TransactionCache(max_size=2)
+    cache.put("A", b"a", "ea")
+    cache.put("B", b"b", "eb")
+    assert cache.get("A") == (b"a", "ea")
+    cache.put("C", b"c", "ec")
+
+    assert cache.get("B") is None
+    assert cache.get("A") is not None and cache.get("C") is not None
+    assert cache.stats() == {"size": 2, "hits": 3, "misses": 1}
+
+
+def test_entries_expire_so_archived_rows_stop_being_served():
+    now = [0.0]
+    cache = TransactionCache(ttl=60, clock=lambda: now[0])
+    cache.put("A", b"a", "ea")
+    now[0] = 59.0
+    assert cache.get("A") == (b"a", "ea")
+    now[0] = 60.0
+    assert cache.get("A") is None
+    assert cache.stats()["size"] == 0
@@ -0,0 +1,109 @@
+import random
+import pytest
+from sqlalchemy import event
+from app.config.database import db
+from app.models.transactions import Transaction
+from app.services.fraud_service import fraud_service
+from app.services.transitions import TransactionNotFound, TransitionConflict, can_transition, transition
+from conftest import make_transaction
+
+
+def test_state_machine_rules():
+    assert can_transition("pending", "success") and can_transition("pending", "failed")
+    assert not can_transition("pending", "pending")
+    assert not can_transition("success", "failed") and not can_transition("failed", "pending")
+
+
+def test_transition_returns_row_and_rejects_second_move(client):
+    created = make_transaction(client)
+
+    row = transition(created["id"], "failed", fraud_score=0.25)
+    assert row.status == "failed" and row.fraud_score == 0.25
+    with pytest.raises(TransitionConflict) as conflict:
+        transition(created["id"], "success")
+    assert conflict.value.current == "failed"
+    with pytest.raises(TransactionNotFound):
+        transition("MISSING", "failed")
+    with pytest.raises(ValueError):
+        transition(created["id"], "refunded")
+
+
+def test_terminal_transaction_conflicts(client):
+    created = make_transaction(client)
+    url = f"/{created['id']}"
+    assert client.put(f"{url}/status", json={"status": "failed"}).status_code == 200
+
+    response = client.put(f"{url}/status", json={"status": "success"})
+    assert response.status_code == 409
+    assert response.get_json() == {"error": "Cannot change status from failed", "status": "failed"}
+    response = client.post(f"{url}/process")
+    assert response.status_code == 409
+    assert response.get_json()["error"] == "Transaction is already failed"
+
+    assert client.put("/MISSING/status", json={"status": "failed"}).status_code == 404
+    assert client.post("/MISSING/process").status_code == 404
+
+
+def test_setting_pending_again_is_a_no_op(client):
+    created = make_transaction(client)
+    url = f"/{created['id']}/status"
+
+    response = client.put(url, json={"status": "pending"})
+    assert response.status_code == 200
+    assert response.get_json()["message"] == "Transaction status unchanged"
+    assert response.get_json()["transaction"]["status"] == "pending"
+
+    assert client.put(url, json={"status": "success"}).status_code == 200
+    response = client.put(url, json={"status": "pending"})
+    assert response.status_code == 409
+    assert response.get_json() == {"error": "Cannot change status from success", "status": "success"}
+    assert client.put("/MISSING/status", json={"status": "pending"}).status_code == 404
+
+
+def test_failed_process_is_a_single_statement(app, client, monkeypatch):
+    monkeypatch.setattr(random, "random", lambda: 0.99)  # every attempt fails
+    created = make_transaction(client)
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", count)
+    try:
+        response = client.post(f"/{created['id']}/process")
+    finally:
+        event.remove(db.engine, "before_cursor_execute", count)
+
+    assert response.status_code == 200
+    assert response.get_json()["transaction"] == dict(created, status="failed")
+    assert len(statements) == 1 and statements[0].startswith("UPDATE")
+
+
+def test_status_changed_while_scoring_is_a_conflict(client, monkeypatch):
+    monkeypatch.setattr(random, "random", lambda: 0.0)  # every attempt succeeds
+    created = make_transaction(client)
+
+    def concurrent_failure(transaction):
+        # Another request settles the transaction after this one read it
+        transition(transaction.id, "failed")
+        return {"is_suspicious": False, "score": 0.1, "rules": []}
+
+    monkeypatch.setattr(fraud_service, "check_transaction_fraud", concurrent_failure)
+    response = client.post(f"/{created['id']}/process")
+    assert response.status_code == 409
+
+    db.session.expire_all()
+    stored = db.session.get(Transaction, created["id"])
+    assert stored.status == "failed" and stored.fraud_score is None
+
+
+def test_suspicious_success_stays_pending_with_fraud_fields(client, monkeypatch):
+    created = make_transaction(client)
+    monkeypatch.setattr(fraud_service, "check_transaction_fraud",
+                        lambda transaction: {"is_suspicious": True, "score": 0.97, "rules": []})
+
+    response = client.put(f"/{created['id']}/status", json={"status": "success"})
+    assert response.status_code == 400
+    stored = client.get(f"/{created['id']}").get_json()
+    assert stored["status"] == "pending"
+    assert stored["fraud_flag"] is True and stored["fraud_score"] == 0.97
@@ -0,0 +1,112 @@
+import random
+from datetime import datetime, timedelta
+import pandas as pd
+from app.config.database import db
+from app.models.transactions import Transaction
+from app.services.velocity_store import DatabaseVelocity, VelocityStore
+from models.fraud_detection.velocity import VELOCITY_COLUMNS, add_velocity_features
+from conftest import make_transaction
+
+
+def test_online_store_matches_offline_features():
+    rng = random.Random(7)
+    timestamp = datetime(2025, 9, 1)
+    rows = []
+    for i in range(300):
+        timestamp += timedelta(minutes=rng.randint(0, 20))
+        rows.append({
+            'Transaction ID': f'T{i}',
+            'Amount': float(rng.randint(1, 5000)),
+            'Sender UPI ID': rng.choice(['a@upi', 'b@upi', 'c@upi']),
+            'Receiver UPI ID': rng.choice(['x@upi', 'y@upi', 'z@upi', 'w@upi']),
+            'Timestamp': timestamp,
+        })
+
+    store = VelocityStore()
+    online = [store.record(r['Transaction ID'], r['Sender UPI ID'], r['Receiver UPI ID'],
+                           r['Amount'], r['Timestamp']) for r in rows]
+
+    df = pd.DataFrame(rows)
+    df['Timestamp'] = df['Timestamp'].dt.strftime("%d-%m-%Y %H:%M")
+    add_velocity_features(df)
+    pd.testing.assert_frame_equal(pd.DataFrame(online)[VELOCITY_COLUMNS], df[VELOCITY_COLUMNS])
+
+
+def test_store_rebuilds_from_database(client):
+    from app.services.fraud_service import fraud_service
+    for receiver in ['x@upi', 'y@upi', 'z@upi']:
+        make_transaction(client, sender_upi_id='fan@upi', receiver_upi_id=receiver)
+
+    fraud_service.velocity = VelocityStore()
+    fraud_service.load_velocity()
+    snapshot = fraud_service.velocity.record('NEW', 'fan@upi', 'w@upi', 10, datetime.now())
+    assert snapshot['SenderCount1h'] == 4
+    assert snapshot['SenderDistinct1h'] == 4
+
+
+def test_scoring_reads_features_without_recording(client):
+    from types import SimpleNamespace
+    from app.services.fraud_service import fraud_service
+    live = [make_transaction(client, sender_upi_id='s@upi', amount=10) for _ in range(3)]
+
+    # Scored long after it was made, e.g. created in another worker
+    old = SimpleNamespace(id='OLD', amount=99999.0, sender_upi_id='s@upi', receiver_upi_id='r@upi',
+                          timestamp=datetime.now() - timedelta(days=2))
+    features = fraud_service.features(old)
+    assert features['SenderCount24h'] == 1 and features['SenderAmount24h'] == 99999
+    assert features['SenderFanOut'] == 0
+
+    # A live one scored again gets its creation snapshot back
+    first = fraud_service.features(SimpleNamespace(**{**live[0], 'timestamp': datetime.now()}))
+    assert first['SenderCount24h'] == 1
+
+    snapshot = fraud_service.velocity.record('NEW', 's@upi', 'bob@upi', 5, datetime.now())
+    assert snapshot['SenderCount24h'] == 4 and snapshot['SenderAmount24h'] == 35
+
+
+def test_features_at_counts_only_earlier_events():
+    store = VelocityStore()
+    start = datetime(2025, 9, 1, 12)
+    for i in range(4):
+        store.record(f'T{i}', 'a@upi', f'r{i}@upi', 100, start + timedelta(minutes=10 * i))
+
+    features = store.features_at('LATE', 'a@upi', 'r9@upi', 1, start + timedelta(minutes=15))
+    assert features['SenderCount1h'] == 3 and features['SenderAmount1h'] == 201
+    assert features['SenderCount1m'] == 1 and features['SenderDistinct1h'] == 3
+    # The evicted snapshot of a recorded transaction doesn't count it twice
+    assert store.features_at('T1', 'a@upi', 'r1@upi', 100, start + timedelta(minutes=10))['SenderCount1h'] == 2
+
+
+def test_database_velocity_matches_offline_features(app):
+    rng = random.Random(3)
+    timestamp = datetime(2025, 9, 1)
+    rows = []
+    for i in range(200):
+        timestamp += timedelta(minutes=rng.randint(1, 30))
+        rows.append({
+            'Transaction ID': f'T{i}',
+            'Amount': float(rng.randint(1, 5000)),
+            'Sender UPI ID': rng.choice(['a@upi', 'b@upi', 'c@upi']),
+            'Receiver UPI ID': rng.choice(['x@upi', 'y@upi', 'z@upi', 'w@upi']),
+            'Timestamp': timestamp,
+        })
+    db.session.add_all(
+        Transaction(id=r['Transaction ID'], amount=r['Amount'], sender_upi_id=r['Sender UPI ID'],
+                    receiver_upi_id=r['Receiver UPI ID'], sender_name='S', receiver_name='R',
+                    sender_phone='9876543210', receiver_phone='9876543211', timestamp=r['Timestamp'])
+        for r in rows
+    )
+    db.session.commit()
+
+    velocity = DatabaseVelocity()
+    online = [velocity.features_at(r['Transaction ID'], r['Sender UPI ID'], r['Receiver UPI ID'],
+                                   r['Amount'], r['Timestamp']) for r in rows]
+    # A transaction that isn't stored yet counts once too
+    unsaved = velocity.features_at('NEW', 'a@upi', 'x@upi', 5, timestamp)
+    day = [r for r in rows if r['Sender UPI ID'] == 'a@upi' and r['Timestamp'] > timestamp - timedelta(days=1)]
+    assert unsaved['SenderCount24h'] == len(day) + 1
+
+    df = pd.DataFrame(rows)
+    df['Timestamp'] = df['Timestamp'].dt.strftime("%d-%m-%Y %H:%M")
+    add_velocity_features(df)
+    pd.testing.assert_frame_equal(pd.DataFrame(online)[VELOCITY_COLUMNS], df[VELOCITY_COLUMNS])